@@ -0,0 +1,96 @@
+"""
+Async Convex client
+Awaitable wrapper around ConvexDataClient for use in async route handlers.
+The Convex Python SDK is synchronous, so every call is offloaded to a
+bounded thread pool instead of blocking the event loop.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from api.convex_client import ConvexDataClient, convex_client
+
+# Default number of Convex calls allowed in flight per worker
+DEFAULT_MAX_WORKERS = 16
+
+
+class AsyncConvexDataClient:
+    def __init__(self, client: ConvexDataClient, max_workers: Optional[int] = None):
+        """Wrap a ConvexDataClient with a bounded thread pool"""
+        self.client = client
+        self.max_workers = max_workers or int(os.environ.get("CONVEX_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="convex")
+
+    @property
+    def data_version(self) -> str:
+        """Token that changes whenever the data being served changes"""
+        return self.client.data_version
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking client call in the thread pool, keeping context variables"""
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def get_turtles(self) -> List[Dict[str, Any]]:
+        """Get all turtles"""
+        return await self._run(self.client.get_turtles)
+
+    async def get_turtle(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a specific turtle by name"""
+        return await self._run(self.client.get_turtle, name)
+
+    async def get_villains(self) -> List[Dict[str, Any]]:
+        """Get all villains"""
+        return await self._run(self.client.get_villains)
+
+    async def get_villain(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a specific villain by name"""
+        return await self._run(self.client.get_villain, name)
+
+    async def get_episodes(self, season: Optional[int] = None, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get episodes with optional filtering and pagination"""
+        return await self._run(self.client.get_episodes, season=season, limit=limit, offset=offset)
+
+    async def get_episodes_page(self, season: Optional[int] = None, limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get one page of episodes using cursor pagination"""
+        return await self._run(self.client.get_episodes_page, season=season, limit=limit, cursor=cursor)
+
+    async def get_episode(self, episode_id: int) -> Optional[Dict[str, Any]]:
+        """Get a specific episode by ID"""
+        return await self._run(self.client.get_episode, episode_id)
+
+    async def get_episodes_by_ids(self, episode_ids: List[int]) -> List[Optional[Dict[str, Any]]]:
+        """Get several episodes in one batched query, aligned with episode_ids"""
+        return await self._run(self.client.get_episodes_by_ids, episode_ids)
+
+    async def get_quotes(self, character: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get all quotes, optionally filtered by character"""
+        return await self._run(self.client.get_quotes, character=character)
+
+    async def get_random_quote(self) -> Optional[Dict[str, Any]]:
+        """Get a random quote"""
+        return await self._run(self.client.get_random_quote)
+
+    async def get_weapons(self) -> List[Dict[str, Any]]:
+        """Get all weapons"""
+        return await self._run(self.client.get_weapons)
+
+    async def get_collection(self, collection: str) -> List[Dict[str, Any]]:
+        """Every record of a collection (episodes are fetched a page at a time)"""
+        return await self._run(self.client.load_collection, collection)
+
+    async def collection_digest(self, collection: str, source: Optional[str] = None) -> Optional[str]:
+        """Digest of a collection's content, or None if unknown"""
+        return await self._run(self.client.collection_digest, collection, source)
+
+    async def collection_size(self, collection: str, source: Optional[str] = None) -> Optional[int]:
+        """Number of records in a collection, if known without reading them all"""
+        return await self._run(self.client.collection_size, collection, source)
+
+# Global instance
+async_convex_client = AsyncConvexDataClient(convex_client)
@@ -0,0 +1,211 @@
+"""
+In-process query cache
+Read-through TTL + LRU cache used in front of Convex queries.
+Entries have a soft TTL (fresh), then a stale window during which they are
+served while being revalidated, and are kept a while longer still so they
+can be served if Convex fails (stale-if-error).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Default time-to-live (seconds) for cached query results
+DEFAULT_TTL = 300.0
+
+# Default maximum number of cached query results
+DEFAULT_MAX_ENTRIES = 256
+
+# Default seconds past the TTL a result is served while it is refreshed
+DEFAULT_STALE_TTL = 3600.0
+
+# Default seconds past the TTL a result is kept to serve when Convex fails
+DEFAULT_STALE_IF_ERROR = 86400.0
+
+# Entry states returned by QueryCache.lookup
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+MISS = "miss"
+
+_MISSING = object()
+
+
+def make_key(query_name: str, args: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+    """Build a cache key from a query name and its arguments"""
+    return (query_name, json.dumps(args or {}, sort_keys=True, default=str))
+
+
+def _fingerprint(value: Any) -> str:
+    """Short content hash of a query result"""
+    encoded = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def collection_of(query_name: str) -> str:
+    """Return the collection a Convex query belongs to ("episodes:getAll" -> "episodes")"""
+    return query_name.split(":", 1)[0]
+
+
+class QueryCache:
+    """Thread-safe TTL cache with LRU eviction and hit/miss/eviction counters"""
+
+    def __init__(
+        self,
+        default_ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttls: Optional[Dict[str, float]] = None,
+        stale_ttl: float = 0.0,
+        stale_if_error: float = 0.0,
+    ):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.ttls = dict(ttls or {})
+        self.stale_ttl = stale_ttl
+        self.stale_if_error = max(stale_if_error, stale_ttl)
+        # key -> [fresh until, stale until, kept until, value, expiry counted]
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()
+        # Content fingerprint of each cached entry, used to detect data changes
+        self._fingerprints: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+        # Bumped when a cached key is stored with different content, or on invalidate
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+        self.stale_on_error = 0
+
+    @classmethod
+    def from_env(cls) -> "QueryCache":
+        """
+        Build a cache configured from environment variables:
+        CONVEX_CACHE_TTL, CONVEX_CACHE_MAX_ENTRIES, per-collection
+        CONVEX_CACHE_TTL_<COLLECTION> (e.g. CONVEX_CACHE_TTL_EPISODES=60),
+        CONVEX_CACHE_STALE_TTL and CONVEX_CACHE_STALE_IF_ERROR
+        """
+        prefix = "CONVEX_CACHE_TTL_"
+        ttls = {
+            key[len(prefix):].lower(): float(value)
+            for key, value in os.environ.items()
+            if key.startswith(prefix)
+        }
+        return cls(
+            default_ttl=float(os.environ.get("CONVEX_CACHE_TTL", DEFAULT_TTL)),
+            max_entries=int(os.environ.get("CONVEX_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            ttls=ttls,
+            stale_ttl=float(os.environ.get("CONVEX_CACHE_STALE_TTL", DEFAULT_STALE_TTL)),
+            stale_if_error=float(os.environ.get("CONVEX_CACHE_STALE_IF_ERROR", DEFAULT_STALE_IF_ERROR)),
+        )
+
+    def ttl_for(self, collection: str) -> float:
+        """Get the TTL that applies to a collection"""
+        return self.ttls.get(collection, self.default_ttl)
+
+    def _state(self, key: Hashable, entry: list, now: float) -> str:
+        """State of an entry, dropping it once it is past every window (lock held)"""
+        fresh_until, stale_until, kept_until = entry[0], entry[1], entry[2]
+        if now < fresh_until:
+            return FRESH
+        if not entry[4]:
+            entry[4] = True
+            self.expirations += 1
+        if now >= kept_until:
+            self._forget(key)
+            return MISS
+        return STALE if now < stale_until else EXPIRED
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or default if missing or past its TTL"""
+        state, value = self.lookup(key)
+        return value if state == FRESH else default
+
+    def lookup(self, key: Hashable) -> Tuple[str, Any]:
+        """
+        Get (state, value): FRESH within the TTL, STALE within the stale
+        window (serve, but revalidate), EXPIRED when only usable if Convex
+        fails, or MISS (value None)
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            state = MISS if entry is _MISSING else self._state(key, entry, time.monotonic())
+            if state == MISS:
+                self.misses += 1
+                return MISS, None
+
+            self._entries.move_to_end(key)
+            if state == FRESH:
+                self.hits += 1
+            elif state == STALE:
+                self.stale_hits += 1
+            else:
+                self.misses += 1
+            return state, entry[3]
+
+    def record_stale_on_error(self) -> None:
+        """Count an expired value served because refreshing it failed"""
+        with self._lock:
+            self.stale_on_error += 1
+
+    def _forget(self, key: Hashable) -> None:
+        """Drop an entry and its fingerprint (lock held)"""
+        del self._entries[key]
+        self._fingerprints.pop(key, None)
+
+    def set(self, key: Hashable, value: Any, collection: str = "") -> None:
+        """Store a value, expiring it after the collection's TTL"""
+        ttl = self.ttl_for(collection)
+        if ttl <= 0 or self.max_entries <= 0:
+            # Nothing is kept to compare the next result with, so count it as changed
+            with self._lock:
+                self.generation += 1
+            return
+        fingerprint = _fingerprint(value)
+
+        with self._lock:
+            # A key seen for the first time is new data, not changed data
+            previous = self._fingerprints.get(key)
+            if previous is not None and previous != fingerprint:
+                self.generation += 1
+            self._fingerprints[key] = fingerprint
+
+            now = time.monotonic()
+            self._entries[key] = [now + ttl, now + ttl + self.stale_ttl, now + ttl + self.stale_if_error, value, False]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._forget(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, collection: Optional[str] = None) -> None:
+        """Drop every entry, or only the entries of one collection"""
+        with self._lock:
+            self.generation += 1
+            if collection is None:
+                self._entries.clear()
+                self._fingerprints.clear()
+                return
+            for key in [k for k in self._entries if collection_of(k[0]) == collection]:
+                self._forget(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stale_hits": self.stale_hits,
+            "stale_on_error": self.stale_on_error,
+            "generation": self.generation,
+        }
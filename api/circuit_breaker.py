@@ -0,0 +1,142 @@
+"""
+Circuit breaker for Convex calls
+Closed: calls go through and outcomes are recorded in a rolling window.
+Open: once enough calls in the window failed or were too slow, calls are
+refused immediately (callers serve local or stale data) for open_seconds.
+Half-open: then a few probe calls are let through; a success closes the
+breaker, a failure opens it again.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Defaults, overridable with CONVEX_BREAKER_* environment variables
+DEFAULT_FAILURE_RATE = 0.5
+DEFAULT_MIN_CALLS = 5
+DEFAULT_WINDOW = 20
+DEFAULT_SLOW_CALL_SECONDS = 2.0
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_HALF_OPEN_PROBES = 1
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling Convex while the breaker is open"""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_rate: float = DEFAULT_FAILURE_RATE,
+        min_calls: int = DEFAULT_MIN_CALLS,
+        window: int = DEFAULT_WINDOW,
+        slow_call_seconds: float = DEFAULT_SLOW_CALL_SECONDS,
+        open_seconds: float = DEFAULT_OPEN_SECONDS,
+        half_open_probes: int = DEFAULT_HALF_OPEN_PROBES,
+    ):
+        """Open when failure_rate of the last `window` calls (at least min_calls) failed or were slow"""
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        # Outcome of recent calls: True = failed or slow
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.opened = 0
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """Build a breaker configured from CONVEX_BREAKER_* environment variables"""
+        env = os.environ.get
+        return cls(
+            failure_rate=float(env("CONVEX_BREAKER_FAILURE_RATE", DEFAULT_FAILURE_RATE)),
+            min_calls=int(env("CONVEX_BREAKER_MIN_CALLS", DEFAULT_MIN_CALLS)),
+            window=int(env("CONVEX_BREAKER_WINDOW", DEFAULT_WINDOW)),
+            slow_call_seconds=float(env("CONVEX_BREAKER_SLOW_CALL", DEFAULT_SLOW_CALL_SECONDS)),
+            open_seconds=float(env("CONVEX_BREAKER_OPEN_SECONDS", DEFAULT_OPEN_SECONDS)),
+            half_open_probes=int(env("CONVEX_BREAKER_HALF_OPEN_PROBES", DEFAULT_HALF_OPEN_PROBES)),
+        )
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def _acquire(self) -> bool:
+        """Whether a call may go through now; reserves a probe slot when half-open"""
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self._state = HALF_OPEN
+                self._probes = 0
+            if self._state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.rejected += 1
+                    return False
+                self._probes += 1
+            return True
+
+    def _open(self) -> None:
+        """Trip the breaker (lock held)"""
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.opened += 1
+
+    def _record(self, failed: bool) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes -= 1
+                if failed:
+                    self._open()
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(failed)
+            if len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._open()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run fn() through the breaker; raises CircuitOpenError while open"""
+        if not self._acquire():
+            raise CircuitOpenError("Convex circuit breaker is open")
+
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception:
+            self._record(True)
+            raise
+        self._record(time.monotonic() - started > self.slow_call_seconds)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters"""
+        with self._lock:
+            outcomes = list(self._outcomes)
+            opened_at: Optional[float] = self._opened_at if self._state != CLOSED else None
+        return {
+            "state": self.state,
+            "recent_calls": len(outcomes),
+            "recent_failure_rate": round(sum(outcomes) / len(outcomes), 4) if outcomes else 0.0,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "open_for_seconds": round(time.monotonic() - opened_at, 1) if opened_at is not None else None,
+        }
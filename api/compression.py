@@ -0,0 +1,179 @@
+"""
+Precompressed responses
+Compressed variants are built once per body (or static file) and reused, so
+identical bytes are never compressed twice. Static files are compressed at
+build time (scripts/precompress_static.py writes .br/.gz files next to them);
+a file without an up-to-date prebuilt variant is compressed on first request.
+Encoding is negotiated from Accept-Encoding: brotli when the optional brotli
+package is installed and the client accepts it, else gzip.
+"""
+import gzip
+import mimetypes
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from api.conditional import etag_matches
+
+try:
+    import brotli
+except ImportError:  # optional - gzip only without it
+    brotli = None
+
+# Bodies smaller than this (bytes) aren't worth compressing
+MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 512))
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda data: brotli.compress(data, quality=11)
+
+# File suffix of each encoding's prebuilt static variant
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Preferred order when a client accepts several encodings equally
+PREFERENCE = ("br", "gzip")
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def negotiate(accept_encoding: Optional[str], supported: Optional[Iterable[str]] = None) -> Optional[str]:
+    """
+    Pick the best supported encoding from an Accept-Encoding header, or None
+    for identity; `supported` narrows the choice (default: every compressor)
+    """
+    if not accept_encoding:
+        return None
+
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in PREFERENCE:
+        if encoding not in COMPRESSORS or (supported is not None and encoding not in supported):
+            continue
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def variant_etag(etag: str, encoding: Optional[str]) -> str:
+    """ETag of one encoding of a representation (strong ETags must differ per encoding)"""
+    if not encoding:
+        return etag
+    return etag[:-1] + "-" + encoding + '"' if etag.endswith('"') else f"{etag}-{encoding}"
+
+
+def is_compressible(media_type: Optional[str]) -> bool:
+    return bool(media_type) and media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class VariantCache:
+    """Compressed bytes keyed by (identity key, encoding), built once each"""
+
+    def __init__(self):
+        self._variants: Dict[Tuple, bytes] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, key: Tuple, encoding: str, load: Callable[[], bytes], prebuilt: Optional[Path] = None) -> bytes:
+        """Compressed bytes, read from `prebuilt` if given, else compressed from load()"""
+        variant = self._variants.get((key, encoding))
+        if variant is None:
+            if prebuilt is not None:
+                variant = prebuilt.read_bytes()
+            else:
+                variant = COMPRESSORS[encoding](load())
+                with self._lock:
+                    self.builds += 1
+            with self._lock:
+                self._variants[(key, encoding)] = variant
+        return variant
+
+    def __len__(self) -> int:
+        return len(self._variants)
+
+
+def prebuilt_variant(path: Path, encoding: str, mtime_ns: int) -> Optional[Path]:
+    """The build-time variant of a static file, if there is one at least as new as the file"""
+    variant = path.with_name(path.name + SUFFIXES[encoding])
+    try:
+        return variant if variant.stat().st_mtime_ns >= mtime_ns else None
+    except OSError:
+        return None
+
+
+def precompress_directory(root: Path) -> Iterator[Path]:
+    """Write .br/.gz variants of every compressible file under root; yields each file written"""
+    for path in sorted(Path(root).rglob("*")):
+        if not path.is_file() or path.suffix in SUFFIXES.values():
+            continue
+        if not is_compressible(mimetypes.guess_type(path.name)[0]) or path.stat().st_size < MIN_SIZE:
+            continue
+        data = path.read_bytes()
+        for encoding, compress in COMPRESSORS.items():
+            variant = path.with_name(path.name + SUFFIXES[encoding])
+            variant.write_bytes(compress(data))
+            yield variant
+
+
+def compressed_file_response(request_headers: Headers, response: Response) -> Response:
+    """Swap a 200 FileResponse for its precompressed variant if the client accepts one"""
+    if not isinstance(response, FileResponse) or response.status_code != 200:
+        return response
+    if not is_compressible(response.media_type):
+        return response
+    stat = os.stat(response.path)
+    if stat.st_size < MIN_SIZE:
+        return response
+    if "etag" not in response.headers:
+        response.set_stat_headers(stat)
+
+    response.headers["vary"] = "Accept-Encoding"
+    encoding = negotiate(request_headers.get("accept-encoding"))
+    if encoding is None:
+        return response
+
+    headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+
+    if "etag" in headers:
+        headers["etag"] = variant_etag(headers["etag"], encoding)
+        if etag_matches(request_headers.get("if-none-match"), headers["etag"]):
+            return Response(status_code=304, headers=headers)
+
+    path = Path(response.path)
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    body = static_variants.get(
+        key, encoding, path.read_bytes, prebuilt=prebuilt_variant(path, encoding, stat.st_mtime_ns),
+    )
+    headers["content-encoding"] = encoding
+    return Response(content=body, media_type=response.media_type, headers=headers)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles serving brotli/gzip variants, prebuilt or compressed once per file version"""
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        return compressed_file_response(Headers(scope=scope), response)
+
+
+# Global instance
+static_variants = VariantCache()
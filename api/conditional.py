@@ -0,0 +1,113 @@
+"""
+Conditional GET support
+Strong content-hash ETags and If-None-Match handling for /api/v1
+"""
+import hashlib
+from typing import Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Response headers kept on a 304 (RFC 9110 section 15.4.5)
+NOT_MODIFIED_HEADERS = {
+    b"cache-control", b"cdn-cache-control", b"vercel-cdn-cache-control",
+    b"content-location", b"date", b"etag", b"expires", b"vary",
+}
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from a response body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified_headers(headers: Iterable[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Headers of a full response that a 304 should repeat"""
+    return [(k, v) for k, v in headers if k.lower() in NOT_MODIFIED_HEADERS]
+
+
+class ETagMiddleware:
+    """
+    Add a body-hash ETag to GET responses under a path prefix that don't set
+    one, and turn them into a 304 when If-None-Match matches. Routes serving
+    pre-serialized bodies (api.response_cache) set their own ETag and answer
+    304s before querying Convex; this covers everything else.
+    Streaming responses (more than one body chunk) and no-store responses
+    (e.g. random quotes, which differ on every call) pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str = "/api/v1"):
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = None
+        for key, value in scope["headers"]:
+            if key == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                if message["status"] != 200 or any(
+                    k.lower() == b"etag" or (k.lower() == b"cache-control" and b"no-store" in v.lower())
+                    for k, v in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                # Streaming body - don't buffer it
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            etag = make_etag(body)
+            headers = list(start.get("headers", [])) + [(b"etag", etag.encode("latin-1"))]
+            if etag_matches(if_none_match, etag):
+                await send({"type": "http.response.start", "status": 304, "headers": not_modified_headers(headers)})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({**start, "headers": headers})
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -2,60 +2,221 @@
 Convex client for Python
 Handles connection to Convex backend and provides data access
 """
+import base64
+import hashlib
+import itertools
+import json
 import os
-from typing import Any, Optional, List, Dict
-from convex import ConvexClient
+import sys
+import threading
+from functools import cached_property
+from typing import Any, Callable, Iterator, Mapping, Optional, List, Dict
 from dotenv import load_dotenv
+from api.cache import QueryCache, make_key, collection_of, FRESH, STALE, EXPIRED
+from api.data.dataset import get_dataset, normalize
+from api.quote_pool import RandomQuotePool, DEFAULT_REFRESH_INTERVAL
+from api.singleflight import SingleFlight
+from api.circuit_breaker import CircuitBreaker, OPEN
+from api.deadline import HedgedCaller, own_deadline, remaining
+from api.fallback import fell_back, record_fallback
+from api.ingest import MODELS, validate_record
 
 # Load environment variables
 load_dotenv(".env.local")
 
+
+# Episodes fetched per Convex call when walking the whole table
+EXPORT_PAGE_SIZE = 100
+
+# Budget (seconds) for each page of an export, which may outlast any one request budget
+EXPORT_PAGE_BUDGET = 5.0
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded or doesn't match the query"""
+
+
+def encode_cursor(kind: str, position: Any, season: Optional[int] = None) -> str:
+    """Build an opaque cursor from a Convex cursor ("convex") or a local offset ("offset")"""
+    payload = json.dumps([kind, position, season], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, season: Optional[int] = None) -> tuple:
+    """Decode an opaque cursor into (kind, position), checking it belongs to the same season filter"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, position, cursor_season = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+    if kind not in ("convex", "offset") or cursor_season != season:
+        raise InvalidCursor("Cursor does not match this query")
+    return kind, position
+
 class ConvexDataClient:
-    def __init__(self):
+    def __init__(self, cache: Optional[QueryCache] = None):
         """Initialize Convex client with URL from environment"""
+        # Read-through cache in front of every Convex query
+        self.cache = cache if cache is not None else QueryCache.from_env()
+        # Concurrent misses for the same query share one Convex call
+        self.flights = SingleFlight()
+        # Fails fast to local data while Convex is down or slow
+        self.breaker = CircuitBreaker.from_env()
+        # Bounds each call by the request's deadline and hedges slow ones
+        self.caller = HedgedCaller.from_env()
+        # Keys being revalidated in the background (stale-while-revalidate)
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.refreshes = 0
+        self.refresh_errors = 0
+        # In-process pool for random quotes, refreshed in the background
+        self.quote_pool = RandomQuotePool(
+            self._load_quote_pool,
+            refresh_interval=float(os.environ.get("QUOTE_POOL_REFRESH", DEFAULT_REFRESH_INTERVAL)),
+        )
         self.convex_url = os.environ.get('CONVEX_URL')
         if self.convex_url:
             self.convex_url = self.convex_url.strip()  # Remove any whitespace
-        self._fallback_data = None
+        # The Convex connection and the local dataset are set up on first use
+        # (see _connected and _fallback_data), so importing the app stays cheap
+    
+    @cached_property
+    def _connected(self) -> bool:
+        """Connect to Convex on first use; False when no URL is set or the connection fails"""
+        if not self.convex_url:
+            return False
+        try:
+            from convex import ConvexClient
+            self.client = ConvexClient(self.convex_url)
+            return True
+        except Exception as e:
+            print(f"Failed to connect to Convex: {e}")
+            return False
+    
+    @cached_property
+    def _fallback_data(self):
+        """Local dataset used when Convex is unavailable, loaded on first use"""
+        # Always available, so failed or refused Convex calls can be answered locally
+        return get_dataset()
+    
+    def _load_fallback_data(self):
+        """(Re)load the local dataset used when Convex is unavailable"""
+        # Shared, prebuilt dataset with lookup indexes
+        self._fallback_data = get_dataset()
+    
+    @property
+    def data_version(self) -> str:
+        """Token that changes whenever the data being served changes"""
+        if self.collection_source() == "convex":
+            return f"convex-{self.cache.generation}"
+        return self.local_version
+    
+    @property
+    def local_version(self) -> str:
+        """Version of the local dataset used when Convex is unavailable"""
+        if self._fallback_data:
+            return f"local-{self._fallback_data.version}"
+        return "empty"
+    
+    @property
+    def served_version(self) -> str:
+        """
+        Version of the data the current request was actually answered with:
+        the local dataset's if any of it fell back to local data, even while
+        Convex is otherwise up (see api.fallback)
+        """
+        return self.local_version if fell_back() else self.data_version
+    
+    def version_ttl(self, collection: str) -> Optional[float]:
+        """Seconds a collection's data version holds without re-querying (None: until restart)"""
+        return self.cache.ttl_for(collection) if self._connected else None
+    
+    def _query(self, name: str, args: Optional[Dict[str, Any]] = None, cached: bool = True) -> Any:
+        """
+        Run a Convex query through the read-through cache, coalescing concurrent misses.
+        Stale results are served at once and refreshed in the background; expired
+        ones are only served if Convex fails.
+        """
+        def call() -> Any:
+            result = self.caller.call(lambda: self.client.query(name, args) if args else self.client.query(name))
+            return self._ingest(name, result)
         
-        if self.convex_url:
+        if not cached:
+            return self.breaker.call(call)
+        
+        key = make_key(name, args)
+        state, value = self.cache.lookup(key)
+        if state == FRESH:
+            return value
+        
+        def fetch() -> Any:
+            result = self.breaker.call(call)
+            self.cache.set(key, result, collection=collection_of(name))
+            return result
+        
+        if state == STALE:
+            self._refresh_in_background(key, fetch)
+            return value
+        
+        try:
+            return self.flights.do(key, fetch, timeout=remaining())
+        except Exception as e:
+            if state != EXPIRED:
+                raise
+            print(f"Serving stale {name} after Convex error: {e}", file=sys.stderr)
+            self.cache.record_stale_on_error()
+            return value
+    
+    def _refresh_in_background(self, key: Any, fetch: Callable[[], Any]) -> None:
+        """Start one background refresh per key unless one is running"""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def refresh() -> None:
+            failed = False
             try:
-                self.client = ConvexClient(self.convex_url)
-                self._connected = True
+                self.flights.do(key, fetch)
             except Exception as e:
-                print(f"Failed to connect to Convex: {e}")
-                self._connected = False
-                self._load_fallback_data()
-        else:
-            self._connected = False
-            self._load_fallback_data()
+                # Keep serving the stale value; the next stale read retries
+                failed = True
+                print(f"Error refreshing {key[0]} in background: {e}", file=sys.stderr)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+                    self.refreshes += not failed
+                    self.refresh_errors += failed
+        
+        threading.Thread(target=refresh, name="convex-refresh", daemon=True).start()
     
-    def _load_fallback_data(self):
-        """Load fallback data when Convex is not available"""
-        try:
-            # Import the existing data as fallback
-            from api.data.tmnt_data import TURTLES, VILLAINS, WEAPONS, QUOTES, EPISODES
-            self._fallback_data = {
-                'turtles': {k: v.model_dump() for k, v in TURTLES.items()},
-                'villains': {k: v.model_dump() for k, v in VILLAINS.items()},
-                'weapons': [w.model_dump() for w in WEAPONS],
-                'quotes': [q.model_dump() for q in QUOTES],
-                'episodes': [e.model_dump() for e in EPISODES]
-            }
-        except ImportError:
-            # If import fails, use empty data
-            self._fallback_data = {
-                'turtles': {},
-                'villains': {},
-                'weapons': [],
-                'quotes': [],
-                'episodes': []
-            }
+    def revalidation_stats(self) -> Dict[str, Any]:
+        """Get background refresh counters"""
+        return {
+            "in_progress": len(self._refreshing),
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+    
+    def _ingest(self, name: str, result: Any) -> Any:
+        """
+        Clean and validate a Convex result once, as it arrives (before it is
+        cached), so records are served from then on without re-validation
+        """
+        model = MODELS.get(collection_of(name))
+        if model is None or not result:
+            return result
+        if isinstance(result, dict) and "page" in result:
+            return {**result, "page": self._ingest(name, result["page"])}
+        if isinstance(result, list):
+            # getByIds keeps None for missing ids, aligned with the ids asked for
+            return [validate_record(model, self._clean_convex_data(r)) if r else None for r in result]
+        return validate_record(model, self._clean_convex_data(result))
     
     def _clean_convex_data(self, data: Any) -> Any:
         """Remove Convex internal fields from data"""
         if isinstance(data, dict):
-            cleaned = {k: v for k, v in data.items() if not k.startswith('_')}
+            cleaned = {k: v for k, v in data.items() if not k.startswith('_') and k != 'content_hash'}
             # Convert episode_id back to id and ensure it's an int
             if 'episode_id' in cleaned:
                 cleaned['id'] = int(cleaned.pop('episode_id'))
@@ -73,57 +234,61 @@ class ConvexDataClient:
         """Get all turtles"""
         if self._connected:
             try:
-                turtles = self.client.query("turtles:getAll")
+                turtles = self._query("turtles:getAll")
                 # Convert Convex format to our API format
-                return [self._clean_convex_data(t) for t in turtles] if turtles else []
+                return list(turtles) if turtles else []
             except Exception as e:
                 print(f"Error querying Convex for turtles: {e}")
         
         # Fall back to local data
+        record_fallback("get_turtles")
         if self._fallback_data:
-            return list(self._fallback_data['turtles'].values())
+            return list(self._fallback_data.turtles.values())
         return []
     
     def get_turtle(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a specific turtle by name"""
         if self._connected:
             try:
-                turtle = self.client.query("turtles:getByName", {"name": name})
-                return self._clean_convex_data(turtle) if turtle else None
+                turtle = self._query("turtles:getByName", {"name": name})
+                return turtle or None
             except Exception as e:
                 print(f"Error querying Convex for turtle {name}: {e}")
         
         # Fall back to local data
+        record_fallback("get_turtle")
         if self._fallback_data:
-            return self._fallback_data['turtles'].get(name)
+            return self._fallback_data.turtles.get(name)
         return None
     
     def get_villains(self) -> List[Dict[str, Any]]:
         """Get all villains"""
         if self._connected:
             try:
-                villains = self.client.query("villains:getAll")
-                return [self._clean_convex_data(v) for v in villains] if villains else []
+                villains = self._query("villains:getAll")
+                return list(villains) if villains else []
             except Exception as e:
                 print(f"Error querying Convex for villains: {e}")
         
         # Fall back to local data
+        record_fallback("get_villains")
         if self._fallback_data:
-            return list(self._fallback_data['villains'].values())
+            return list(self._fallback_data.villains.values())
         return []
     
     def get_villain(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a specific villain by name"""
         if self._connected:
             try:
-                villain = self.client.query("villains:getByName", {"name": name})
-                return self._clean_convex_data(villain) if villain else None
+                villain = self._query("villains:getByName", {"name": name})
+                return villain or None
             except Exception as e:
                 print(f"Error querying Convex for villain {name}: {e}")
         
         # Fall back to local data
+        record_fallback("get_villain")
         if self._fallback_data:
-            return self._fallback_data['villains'].get(name)
+            return self._fallback_data.villains.get(name)
         return None
     
     def get_episodes(self, season: Optional[int] = None, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
@@ -134,39 +299,95 @@ class ConvexDataClient:
                 if season is not None:
                     params["season"] = season
                 
-                episodes = self.client.query("episodes:getAll", params)
-                return [self._clean_convex_data(e) for e in episodes] if episodes else []
+                episodes = self._query("episodes:getAll", params)
+                return list(episodes) if episodes else []
             except Exception as e:
                 print(f"Error querying Convex for episodes: {e}")
         
         # Fall back to local data
+        record_fallback("get_episodes")
         if self._fallback_data:
-            episodes = self._fallback_data['episodes']
-            
-            # Filter by season if provided
-            if season is not None:
-                episodes = [ep for ep in episodes if ep['season'] == season]
-            
-            # Apply pagination
-            return episodes[offset:offset + limit]
+            return list(self._fallback_episodes(season)[offset:offset + limit])
         return []
     
+    def _fallback_episodes(self, season: Optional[int] = None) -> tuple:
+        """Local episodes, filtered by season if provided"""
+        if season is not None:
+            return self._fallback_data.episodes_by_season.get(season, ())
+        return self._fallback_data.episodes
+    
+    def get_episodes_page(self, season: Optional[int] = None, limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of episodes using cursor pagination.
+        Returns {"episodes": [...], "next_cursor": str or None}; raises InvalidCursor for bad cursors.
+        """
+        kind, position = decode_cursor(cursor, season) if cursor else (None, None)
+        
+        if self._connected and kind != "offset":
+            try:
+                params = {"paginationOpts": {"numItems": limit, "cursor": position}}
+                if season is not None:
+                    params["season"] = season
+                
+                result = self._query("episodes:paginate", params)
+                next_cursor = None
+                if not result["isDone"]:
+                    next_cursor = encode_cursor("convex", result["continueCursor"], season)
+                return {
+                    "episodes": list(result["page"]),
+                    "next_cursor": next_cursor,
+                }
+            except Exception as e:
+                print(f"Error querying Convex for episodes page: {e}")
+        
+        if kind == "convex":
+            # A Convex cursor can't be mapped onto local data
+            raise InvalidCursor("Cursor is no longer valid, restart pagination")
+        
+        # Fall back to local data
+        record_fallback("get_episodes_page")
+        if self._fallback_data:
+            offset = int(position or 0)
+            episodes = self._fallback_episodes(season)
+            next_cursor = None
+            if offset + limit < len(episodes):
+                next_cursor = encode_cursor("offset", offset + limit, season)
+            return {"episodes": list(episodes[offset:offset + limit]), "next_cursor": next_cursor}
+        return {"episodes": [], "next_cursor": None}
+    
     def get_episode(self, episode_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific episode by ID"""
         if self._connected:
             try:
-                episode = self.client.query("episodes:getById", {"episode_id": episode_id})
-                return self._clean_convex_data(episode) if episode else None
+                episode = self._query("episodes:getById", {"episode_id": episode_id})
+                return episode or None
             except Exception as e:
                 print(f"Error querying Convex for episode {episode_id}: {e}")
         
         # Fall back to local data
+        record_fallback("get_episode")
         if self._fallback_data:
-            for episode in self._fallback_data['episodes']:
-                if episode['id'] == episode_id:
-                    return episode
+            return self._fallback_data.episodes_by_id.get(episode_id)
         return None
     
+    def get_episodes_by_ids(self, episode_ids: List[int]) -> List[Optional[Dict[str, Any]]]:
+        """Get several episodes in one batched query, aligned with episode_ids (None if missing)"""
+        if not episode_ids:
+            return []
+        if self._connected:
+            try:
+                episodes = self._query("episodes:getByIds", {"episode_ids": list(episode_ids)})
+                return [e or None for e in episodes]
+            except Exception as e:
+                print(f"Error querying Convex for episodes {episode_ids}: {e}")
+        
+        # Fall back to local data
+        record_fallback("get_episodes_by_ids")
+        if self._fallback_data:
+            by_id = self._fallback_data.episodes_by_id
+            return [by_id.get(episode_id) for episode_id in episode_ids]
+        return [None] * len(episode_ids)
+    
     def get_quotes(self, character: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all quotes, optionally filtered by character"""
         if self._connected:
@@ -175,49 +396,165 @@ class ConvexDataClient:
                 if character:
                     params["character"] = character
                 
-                quotes = self.client.query("quotes:getAll", params)
-                return [self._clean_convex_data(q) for q in quotes] if quotes else []
+                quotes = self._query("quotes:getAll", params)
+                return list(quotes) if quotes else []
             except Exception as e:
                 print(f"Error querying Convex for quotes: {e}")
         
         # Fall back to local data
+        record_fallback("get_quotes")
         if self._fallback_data:
-            quotes = self._fallback_data['quotes']
             if character:
-                quotes = [q for q in quotes if q['character'].lower() == character.lower()]
-            return quotes
+                return list(self._fallback_data.quotes_by_character.get(normalize(character), ()))
+            return list(self._fallback_data.quotes)
         return []
     
+    def _load_quote_pool(self) -> List[Dict[str, Any]]:
+        """Fetch every quote from Convex for the random quote pool (bypasses the query cache)"""
+        quotes = self._query("quotes:getAll", cached=False)
+        return list(quotes) if quotes else []
+    
     def get_random_quote(self) -> Optional[Dict[str, Any]]:
         """Get a random quote"""
         if self._connected:
+            try:
+                quote = self.quote_pool.pick()
+                if quote:
+                    return quote
+            except Exception as e:
+                print(f"Error picking from quote pool: {e}")
+            
+            # Pool is empty - ask Convex for a single random quote
             try:
                 import random
                 seed = random.randint(0, 10000)
-                quote = self.client.query("quotes:getRandom", {"seed": seed})
-                return self._clean_convex_data(quote) if quote else None
+                quote = self._query("quotes:getRandom", {"seed": seed}, cached=False)
+                return quote or None
             except Exception as e:
                 print(f"Error querying Convex for random quote: {e}")
         
         # Fall back to local data
-        if self._fallback_data and self._fallback_data['quotes']:
+        record_fallback("get_random_quote")
+        if self._fallback_data and self._fallback_data.quotes:
             import random
-            return random.choice(self._fallback_data['quotes'])
+            return random.choice(self._fallback_data.quotes)
         return None
     
     def get_weapons(self) -> List[Dict[str, Any]]:
         """Get all weapons"""
         if self._connected:
             try:
-                weapons = self.client.query("weapons:getAll")
-                return [self._clean_convex_data(w) for w in weapons] if weapons else []
+                weapons = self._query("weapons:getAll")
+                return list(weapons) if weapons else []
             except Exception as e:
                 print(f"Error querying Convex for weapons: {e}")
         
         # Fall back to local data
+        record_fallback("get_weapons")
         if self._fallback_data:
-            return self._fallback_data['weapons']
+            return list(self._fallback_data.weapons)
         return []
+    
+    def collection_source(self) -> str:
+        """Where whole collections are read from: "convex", or "local" while Convex is unavailable"""
+        return "convex" if self._connected and self.breaker.state != OPEN else "local"
+    
+    def _local_records(self, collection: str) -> List[Dict[str, Any]]:
+        """Every local record of a collection, in listing order"""
+        if not self._fallback_data:
+            return []
+        records = self._fallback_data.collections[collection]
+        return list(records.values()) if isinstance(records, Mapping) else list(records)
+    
+    def iter_collection(
+        self,
+        collection: str,
+        start: int = 0,
+        page_size: int = EXPORT_PAGE_SIZE,
+        page_budget: float = EXPORT_PAGE_BUDGET,
+        source: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Every record of a collection in a stable order, from position start,
+        all read from one source (collection_source() unless given) - a failed
+        Convex call raises rather than falling back to local data part way.
+        Episodes are fetched a page at a time, so walking the whole table never
+        holds all of it, and each fetch gets page_budget seconds of its own
+        rather than the request's.
+        """
+        if (source or self.collection_source()) == "local":
+            yield from itertools.islice(self._local_records(collection), start, None)
+            return
+        
+        if collection != "episodes":
+            with own_deadline(page_budget):
+                records = self._query(f"{collection}:getAll")
+            yield from itertools.islice(records or (), start, None)
+            return
+        
+        after = None
+        if start:
+            # Look up the episode just before start once, then page on from its key,
+            # so resuming never re-reads the earlier records page after page
+            with own_deadline(page_budget):
+                before = self._query("episodes:getAll", {"limit": 1, "offset": start - 1})
+            if not before:
+                return
+            after = before[0]["id"]
+        
+        cursor = None
+        while True:
+            params: Dict[str, Any] = {"paginationOpts": {"numItems": page_size, "cursor": cursor}}
+            if after is not None:
+                params["after"] = after
+            with own_deadline(page_budget):
+                result = self._query("episodes:paginate", params)
+            yield from result["page"]
+            if result["isDone"]:
+                return
+            cursor = result["continueCursor"]
+    
+    def load_collection(self, collection: str) -> List[Dict[str, Any]]:
+        """Every record of a collection, all from Convex or (if that fails) all from local data"""
+        if self.collection_source() == "convex":
+            try:
+                return list(self.iter_collection(collection, source="convex"))
+            except Exception as e:
+                print(f"Error loading {collection} from Convex: {e}", file=sys.stderr)
+        record_fallback("load_collection")
+        return self._local_records(collection)
+    
+    def collection_digest(self, collection: str, source: Optional[str] = None) -> Optional[str]:
+        """
+        Digest of a collection's content in source (collection_source() unless
+        given), the same on every instance serving the same data, or None if it
+        can't be known without reading it all
+        """
+        if (source or self.collection_source()) == "local":
+            return self.local_version if self._fallback_data else None
+        try:
+            hashes = self._query("sync:getHashes", {"table": collection})
+        except Exception as e:
+            # Not the local digest: the records themselves will come from Convex
+            print(f"Error querying Convex for {collection} hashes: {e}", file=sys.stderr)
+            return None
+        # Records written by sync_convex.py carry a content hash; others can't be vouched for
+        if not hashes or not all(h.get("hash") for h in hashes):
+            return None
+        pairs = sorted(f"{h['key']}={h['hash']}" for h in hashes)
+        return hashlib.blake2b("\n".join(pairs).encode(), digest_size=16).hexdigest()
+    
+    def collection_size(self, collection: str, source: Optional[str] = None) -> Optional[int]:
+        """Number of records in a collection, or None if it can't be known without reading them all"""
+        if (source or self.collection_source()) == "local":
+            return len(self._local_records(collection))
+        if collection == "episodes":
+            return None
+        try:
+            return len(self._query(f"{collection}:getAll") or ())
+        except Exception as e:
+            print(f"Error querying Convex for {collection}: {e}", file=sys.stderr)
+            return None
 
 # Global instance
 convex_client = ConvexDataClient()
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Shared in-memory TMNT dataset
+Built once per process from the local data modules and frozen, with
+precomputed indexes so every fallback lookup is a dict hit instead of a scan.
+"""
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from api.ingest import from_model, validate_record
+from api.models import Episode
+
+Record = Dict[str, Any]
+Index = Mapping[Any, Tuple[Record, ...]]
+
+
+def normalize(value: str) -> str:
+    """Normalize a lookup key (character names, wielders, villain names)"""
+    return value.strip().lower()
+
+
+def air_year(episode: Record) -> int:
+    """Get the year an episode aired from its air_date (YYYY-MM-DD), or 0 if unknown"""
+    air_date = episode.get("air_date") or ""
+    return int(air_date[:4]) if air_date[:4].isdigit() else 0
+
+
+def _group(records: Iterable[Record], keys_of) -> Index:
+    """Group records into a read-only index of tuples, keeping record order"""
+    groups: Dict[Any, List[Record]] = {}
+    for record in records:
+        for key in keys_of(record):
+            groups.setdefault(key, []).append(record)
+    return MappingProxyType({key: tuple(items) for key, items in groups.items()})
+
+
+class EpisodeSource:
+    """Episodes grouped by season, loaded one season at a time"""
+
+    def __init__(self, seasons: Iterable[int], load: Callable[[int], Iterable[Record]]):
+        self.seasons = tuple(seasons)
+        self._load = load
+        # Seasons loaded so far
+        self._loaded: Dict[int, Tuple[Record, ...]] = {}
+
+    @classmethod
+    def from_records(cls, episodes: Iterable[Record]) -> "EpisodeSource":
+        """Source over an in-memory list of episodes"""
+        by_season: Dict[int, List[Record]] = {}
+        for episode in episodes:
+            by_season.setdefault(episode["season"], []).append(episode)
+        return cls(sorted(by_season), lambda season: by_season.get(season, ()))
+
+    def season(self, season: int) -> Tuple[Record, ...]:
+        """Get one season's episodes, loading it on first access"""
+        if season not in self.seasons:
+            return ()
+        episodes = self._loaded.get(season)
+        if episodes is None:
+            episodes = self._loaded[season] = tuple(self._load(season))
+        return episodes
+
+
+class SeasonIndex(Mapping):
+    """Read-only season -> episodes mapping that loads seasons on demand"""
+
+    def __init__(self, source: EpisodeSource):
+        self._source = source
+
+    def __getitem__(self, season: int) -> Tuple[Record, ...]:
+        if season not in self._source.seasons:
+            raise KeyError(season)
+        return self._source.season(season)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._source.seasons)
+
+    def __len__(self) -> int:
+        return len(self._source.seasons)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Immutable snapshot of the catalog plus lookup indexes"""
+    turtles: Mapping[str, Record]
+    villains: Mapping[str, Record]
+    weapons: Tuple[Record, ...]
+    quotes: Tuple[Record, ...]
+    quotes_by_character: Index
+    weapons_by_wielder: Index
+    episode_source: EpisodeSource
+    # Identifies the data contents; changes whenever the source data changes
+    version: str = ""
+
+    @classmethod
+    def build(
+        cls,
+        turtles: Mapping[str, Record],
+        villains: Mapping[str, Record],
+        weapons: Iterable[Record],
+        quotes: Iterable[Record],
+        episodes: Any,
+        version: str = "",
+    ) -> "Dataset":
+        """
+        Build a dataset and its indexes from plain records. Episodes may be
+        a list of records or an EpisodeSource that loads seasons lazily.
+        """
+        weapons = tuple(weapons)
+        quotes = tuple(quotes)
+        if not isinstance(episodes, EpisodeSource):
+            episodes = EpisodeSource.from_records(episodes)
+        return cls(
+            turtles=MappingProxyType(dict(turtles)),
+            villains=MappingProxyType(dict(villains)),
+            weapons=weapons,
+            quotes=quotes,
+            quotes_by_character=_group(quotes, lambda q: [normalize(q["character"])]),
+            weapons_by_wielder=_group(weapons, lambda w: [normalize(w["wielder"])]),
+            episode_source=episodes,
+            version=version,
+        )
+
+    # Episode indexes are built on first use so startup never loads
+    # the season modules; season lookups only load that one season.
+
+    @cached_property
+    def episodes_by_season(self) -> Index:
+        return SeasonIndex(self.episode_source)
+
+    @cached_property
+    def episodes(self) -> Tuple[Record, ...]:
+        return tuple(e for season in self.episode_source.seasons for e in self.episode_source.season(season))
+
+    @cached_property
+    def episodes_by_id(self) -> Mapping[int, Record]:
+        return MappingProxyType({e["id"]: e for e in self.episodes})
+
+    @cached_property
+    def episodes_by_villain(self) -> Index:
+        return _group(self.episodes, lambda e: {normalize(v) for v in e.get("villains_featured") or []})
+
+    @cached_property
+    def episodes_by_year(self) -> Index:
+        return _group(self.episodes, lambda e: [air_year(e)])
+
+    @classmethod
+    def empty(cls) -> "Dataset":
+        """Dataset with no records, used when the data modules are unavailable"""
+        return cls.build({}, {}, [], [], [])
+
+    @cached_property
+    def collections(self) -> Mapping[str, Any]:
+        """
+        Collections keyed by name, in the shape the Edge Config document uses.
+        Each is read when looked up, so episodes only load if asked for.
+        """
+        return Collections(self)
+
+
+class Collections(Mapping):
+    """Read-only name -> collection view of a Dataset, resolved on lookup"""
+
+    NAMES = ("turtles", "villains", "weapons", "quotes", "episodes")
+
+    def __init__(self, dataset: Dataset):
+        self._dataset = dataset
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.NAMES:
+            raise KeyError(name)
+        return getattr(self._dataset, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.NAMES)
+
+    def __len__(self) -> int:
+        return len(self.NAMES)
+
+
+def _episode_catalog() -> Any:
+    """Full season catalog, falling back to the short tmnt_data episode list"""
+    try:
+        from api.data.episodes import SEASONS, get_season
+        # Season modules hold plain dicts - validate each season as it loads
+        return EpisodeSource(SEASONS, lambda season: [validate_record(Episode, e) for e in get_season(season)])
+    except ImportError:
+        from api.data.tmnt_data import EPISODES
+        return [from_model(e) for e in EPISODES]
+
+
+def _source_paths() -> List[Path]:
+    """The data module sources and the models they are validated against"""
+    data_dir = Path(__file__).parent
+    sources = sorted([data_dir / "tmnt_data.py", *(data_dir / "episodes").glob("*.py")])
+    return [path for path in [*sources, data_dir.parent / "models.py"] if path.exists()]
+
+
+def source_version() -> str:
+    """
+    Hash of the data module sources and the models they are validated
+    against, stable across processes (doesn't import them)
+    """
+    digest = hashlib.sha256()
+    for path in _source_paths():
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def source_stats() -> List[List[Any]]:
+    """[name, size, mtime_ns] of each data source - a stat-only check for changes"""
+    stats = []
+    for path in _source_paths():
+        stat = path.stat()
+        stats.append([path.name, stat.st_size, stat.st_mtime_ns])
+    return stats
+
+
+def dataset_from_modules() -> Dataset:
+    """Build the dataset by importing the data modules"""
+    try:
+        from api.data.tmnt_data import TURTLES, VILLAINS, WEAPONS, QUOTES
+        episodes = _episode_catalog()
+    except ImportError:
+        # Data modules are excluded from some deployments
+        return Dataset.empty()
+
+    # Records are validated here, once, and trusted from then on
+    return Dataset.build(
+        turtles={k: from_model(v) for k, v in TURTLES.items()},
+        villains={k: from_model(v) for k, v in VILLAINS.items()},
+        weapons=[from_model(w) for w in WEAPONS],
+        quotes=[from_model(q) for q in QUOTES],
+        episodes=episodes,
+        version=source_version(),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_dataset() -> Dataset:
+    """
+    Get the process-wide dataset, building it on first use: from the
+    memory-mapped snapshot when one matches the data modules, else by
+    importing them
+    """
+    from api.data.snapshot import load_snapshot
+    has_sources = (Path(__file__).parent / "tmnt_data.py").exists()
+    snapshot = load_snapshot(check_sources=has_sources)
+    if snapshot is not None:
+        return snapshot.dataset()
+    return dataset_from_modules()
@@ -1,37 +1,20 @@
 """
 TMNT 1987 Series Episodes Collection
 Total: 193 episodes across 10 seasons (1987-1996)
+
+Season modules are imported lazily: SEASON<n>_EPISODES and ALL_EPISODES
+resolve on first access, and get_episodes_by_season() only imports the
+requested season.
 """
 
-from .season1 import SEASON1_EPISODES
-from .season2 import SEASON2_EPISODES
-from .season3 import SEASON3_EPISODES
-from .season4 import SEASON4_EPISODES
-from .season5 import SEASON5_EPISODES
-from .season6 import SEASON6_EPISODES
-from .season7 import SEASON7_EPISODES
-from .season8 import SEASON8_EPISODES
-from .season9 import SEASON9_EPISODES
-from .season10 import SEASON10_EPISODES
-
-# Combine all episodes
-ALL_EPISODES = (
-    SEASON1_EPISODES +
-    SEASON2_EPISODES +
-    SEASON3_EPISODES +
-    SEASON4_EPISODES +
-    SEASON5_EPISODES +
-    SEASON6_EPISODES +
-    SEASON7_EPISODES +
-    SEASON8_EPISODES +
-    SEASON9_EPISODES +
-    SEASON10_EPISODES
-)
+import importlib
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 # Export season lists and combined list
 __all__ = [
     'SEASON1_EPISODES',
-    'SEASON2_EPISODES', 
+    'SEASON2_EPISODES',
     'SEASON3_EPISODES',
     'SEASON4_EPISODES',
     'SEASON5_EPISODES',
@@ -57,38 +40,68 @@ SEASON_INFO = {
     10: {"episodes": 8, "year": 1996, "description": "Final season - Series conclusion"}
 }
 
+SEASONS = tuple(SEASON_INFO)
+
+
+def _load_season(season_number: int) -> List[Dict[str, Any]]:
+    """Import a season module and return its raw episode list"""
+    module = importlib.import_module(f".season{season_number}", __name__)
+    return getattr(module, f"SEASON{season_number}_EPISODES")
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve SEASON<n>_EPISODES and ALL_EPISODES on first access"""
+    if name == "ALL_EPISODES":
+        return [episode for season in SEASONS for episode in _load_season(season)]
+    if name.startswith("SEASON") and name.endswith("_EPISODES"):
+        number = name[len("SEASON"):-len("_EPISODES")]
+        if number.isdigit() and int(number) in SEASON_INFO:
+            return _load_season(int(number))
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def normalize_episode(episode: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a season-module episode to the API shape (episode_id -> id)"""
+    normalized = {k: v for k, v in episode.items() if k != "episode_id"}
+    normalized["id"] = int(episode["episode_id"])
+    return normalized
+
+
+@lru_cache(maxsize=None)
+def get_season(season_number: int) -> Tuple[Dict[str, Any], ...]:
+    """Get one season's episodes in the API shape, importing only that season"""
+    if season_number not in SEASON_INFO:
+        return ()
+    return tuple(normalize_episode(e) for e in _load_season(season_number))
+
+
+@lru_cache(maxsize=1)
+def _indexes() -> Dict[str, Dict[Any, List[Dict[str, Any]]]]:
+    """Build villain and year indexes over the raw episodes, once"""
+    by_villain: Dict[str, List[Dict[str, Any]]] = {}
+    by_year: Dict[str, List[Dict[str, Any]]] = {}
+    for season in SEASONS:
+        for episode in _load_season(season):
+            for villain in episode.get("villains_featured", []):
+                by_villain.setdefault(villain, []).append(episode)
+            by_year.setdefault(episode["air_date"][:4], []).append(episode)
+    return {"villain": by_villain, "year": by_year}
+
+
 def get_episodes_by_season(season_number):
     """Get all episodes for a specific season"""
-    season_map = {
-        1: SEASON1_EPISODES,
-        2: SEASON2_EPISODES,
-        3: SEASON3_EPISODES,
-        4: SEASON4_EPISODES,
-        5: SEASON5_EPISODES,
-        6: SEASON6_EPISODES,
-        7: SEASON7_EPISODES,
-        8: SEASON8_EPISODES,
-        9: SEASON9_EPISODES,
-        10: SEASON10_EPISODES
-    }
-    return season_map.get(season_number, [])
+    if season_number not in SEASON_INFO:
+        return []
+    return _load_season(season_number)
 
 def get_total_episode_count():
     """Get total number of episodes in the series"""
-    return len(ALL_EPISODES)
+    return sum(len(_load_season(season)) for season in SEASONS)
 
 def get_episodes_by_villain(villain_name):
     """Get all episodes featuring a specific villain"""
-    episodes = []
-    for episode in ALL_EPISODES:
-        if villain_name in episode.get("villains_featured", []):
-            episodes.append(episode)
-    return episodes
+    return list(_indexes()["villain"].get(villain_name, []))
 
 def get_episodes_by_year(year):
     """Get all episodes that aired in a specific year"""
-    episodes = []
-    for episode in ALL_EPISODES:
-        if episode["air_date"].startswith(str(year)):
-            episodes.append(episode)
-    return episodes
\ No newline at end of file
+    return list(_indexes()["year"].get(str(year), []))
@@ -0,0 +1,201 @@
+"""
+Binary catalog snapshot
+The whole catalog compiled at build time (scripts/build_snapshot.py) into
+one file that the server memory-maps instead of executing the data modules.
+Records are decoded on access, so startup cost doesn't grow with the
+catalog, and worker processes share the mapped pages. Only validated
+records are written, so decoded records are trusted as they are.
+
+Opening a snapshot only reads its header and index: the checksum is verified
+when the file is built (or on request), and whether the data modules changed
+since is checked by stat()ing them, hashing them only if the stats differ.
+
+Layout (integers little-endian):
+    header   magic, format version, index length, sha256 of everything after the header
+    index    JSON: data version, source file stats, and per collection its first slot, count and keys
+    table    one (start, end) uint64 pair per record, offsets into the records area
+    records  each record as compact JSON
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from api.data.dataset import Dataset, EpisodeSource, Record, source_stats, source_version
+from api.ingest import MODELS, TrustedRecord
+
+MAGIC = b"TMNTSNAP"
+FORMAT_VERSION = 1
+
+# magic, format version, index length, sha256
+HEADER = struct.Struct("<8sII32s")
+SLOT = struct.Struct("<QQ")
+
+# Default location, next to the data modules it is built from
+DEFAULT_PATH = Path(__file__).parent / "catalog.snapshot"
+
+COLLECTIONS = ("turtles", "villains", "weapons", "quotes", "episodes")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is truncated, corrupt or from another format version"""
+
+
+def snapshot_path() -> Path:
+    """Snapshot location, overridable with DATA_SNAPSHOT"""
+    return Path(os.environ.get("DATA_SNAPSHOT") or DEFAULT_PATH)
+
+
+def write_snapshot(dataset: Dataset, path: Path) -> int:
+    """Compile a dataset into a snapshot file (written atomically); returns its size"""
+    collections: Dict[str, Tuple[List[str], Iterable[Record]]] = {
+        "turtles": (list(dataset.turtles), dataset.turtles.values()),
+        "villains": (list(dataset.villains), dataset.villains.values()),
+        "weapons": ([], dataset.weapons),
+        "quotes": ([], dataset.quotes),
+        "episodes": ([], dataset.episodes),
+    }
+
+    records = bytearray()
+    slots = []
+    index: Dict[str, Any] = {
+        "data_version": dataset.version, "sources": source_stats(), "collections": {}, "seasons": {},
+    }
+    for name, (keys, items) in collections.items():
+        first = len(slots)
+        for record in items:
+            if not isinstance(record, TrustedRecord) or record.model is not MODELS[name]:
+                raise SnapshotError(f"Refusing to write a {name} record that failed validation: {record!r:.200}")
+            encoded = json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode()
+            slots.append((len(records), len(records) + len(encoded)))
+            records += encoded
+        index["collections"][name] = {"first": first, "count": len(slots) - first, "keys": keys}
+
+    # Episodes are stored in season order, so each season is a contiguous run of slots
+    first = index["collections"]["episodes"]["first"]
+    for season in dataset.episode_source.seasons:
+        count = len(dataset.episode_source.season(season))
+        index["seasons"][str(season)] = [first, count]
+        first += count
+
+    body = json.dumps(index, separators=(",", ":")).encode()
+    body += b"".join(SLOT.pack(start, end) for start, end in slots)
+    body += records
+    index_length = len(body) - len(slots) * SLOT.size - len(records)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, index_length, hashlib.sha256(body).digest())
+
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(header + body)
+    os.replace(tmp, path)
+    return HEADER.size + len(body)
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot; records are decoded when first read. Only the
+    header and index are read when it is opened - pass verify=True (or call
+    verify()) to check the whole file against its checksum.
+    """
+
+    def __init__(self, path: Path, verify: bool = False):
+        self.path = Path(path)
+        with open(path, "rb") as f:
+            # An empty file can't be mapped at all
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise SnapshotError(f"{path} is truncated")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length, self._checksum = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not a catalog snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{path} has format version {version}, expected {FORMAT_VERSION}")
+        if verify:
+            self.verify()
+
+        index_end = HEADER.size + index_length
+        try:
+            index = json.loads(self._map[HEADER.size:index_end])
+            self.data_version: str = index["data_version"]
+            self.sources: List[List[Any]] = index.get("sources", [])
+            self.collections: Dict[str, Dict[str, Any]] = index["collections"]
+            self.seasons: Dict[int, Tuple[int, int]] = {int(s): tuple(run) for s, run in index["seasons"].items()}
+            slots = sum(self.collections[name]["count"] for name in COLLECTIONS)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # Unparseable JSON, or an index cut short or missing fields
+            raise SnapshotError(f"{path} has a corrupt index") from e
+        self._table = index_end
+        self._records = index_end + SLOT.size * slots
+        if self._records > len(self._map):
+            raise SnapshotError(f"{path} is truncated")
+        # Records are written in slot order, so the last one ends the file
+        end = SLOT.unpack_from(self._map, self._table + (slots - 1) * SLOT.size)[1] if slots else 0
+        if self._records + end != len(self._map):
+            raise SnapshotError(f"{path} is truncated")
+
+    def verify(self) -> None:
+        """Check the whole file against its checksum (reads every page)"""
+        if hashlib.sha256(memoryview(self._map)[HEADER.size:]).digest() != self._checksum:
+            raise SnapshotError(f"{self.path} failed its checksum")
+
+    def is_current(self) -> bool:
+        """Whether the data modules are unchanged since the snapshot was built"""
+        return self.sources == source_stats() or self.data_version == source_version()
+
+    def _decode(self, slot: int, collection: str) -> Record:
+        start, end = SLOT.unpack_from(self._map, self._table + slot * SLOT.size)
+        return TrustedRecord(MODELS[collection], json.loads(self._map[self._records + start:self._records + end]))
+
+    def records(self, collection: str) -> List[Record]:
+        """Decode every record of a collection"""
+        info = self.collections[collection]
+        return [self._decode(slot, collection) for slot in range(info["first"], info["first"] + info["count"])]
+
+    def record(self, collection: str, position: int) -> Record:
+        """Decode one record by its position in the collection"""
+        info = self.collections[collection]
+        if not 0 <= position < info["count"]:
+            raise IndexError(position)
+        return self._decode(info["first"] + position, collection)
+
+    def season(self, season: int) -> List[Record]:
+        """Decode one season's episodes"""
+        first, count = self.seasons.get(season, (0, 0))
+        return [self._decode(slot, "episodes") for slot in range(first, first + count)]
+
+    def dataset(self) -> Dataset:
+        """
+        Dataset backed by this snapshot. The small collections are decoded
+        now (their indexes need every record); episodes one season at a time.
+        """
+        return Dataset.build(
+            turtles=dict(zip(self.collections["turtles"]["keys"], self.records("turtles"))),
+            villains=dict(zip(self.collections["villains"]["keys"], self.records("villains"))),
+            weapons=self.records("weapons"),
+            quotes=self.records("quotes"),
+            episodes=EpisodeSource(sorted(self.seasons), self.season),
+            version=self.data_version,
+        )
+
+
+def load_snapshot(check_sources: bool = True) -> Optional[Snapshot]:
+    """
+    Open the snapshot if one was built, or None. With check_sources, a
+    snapshot built before the data modules last changed is ignored.
+    """
+    path = snapshot_path()
+    if not path.exists():
+        return None
+    try:
+        snapshot = Snapshot(path)
+    except (OSError, SnapshotError) as e:
+        print(f"Ignoring data snapshot: {e}", file=sys.stderr)
+        return None
+    if check_sources and not snapshot.is_current():
+        print(f"Ignoring stale data snapshot {path}, rebuild it with scripts/build_snapshot.py", file=sys.stderr)
+        return None
+    return snapshot
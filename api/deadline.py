@@ -0,0 +1,206 @@
+"""
+Per-request deadlines
+Each request carries a deadline in a context variable (copied into the
+worker threads that run Convex calls). Convex calls wait at most for the
+remaining budget and are then abandoned, so callers can serve stale or
+local data well before the platform's maxDuration. Calls made outside a
+request (background refreshes) get a budget of their own. Slow calls can be
+hedged: once a call has taken longer than a percentile of recent call
+latencies, an identical second call is sent and the first answer wins.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Default per-request budget (seconds); vercel.json allows 10
+DEFAULT_REQUEST_DEADLINE = 8.0
+
+# Default budget (seconds) for calls made without a request deadline
+DEFAULT_CALL_TIMEOUT = DEFAULT_REQUEST_DEADLINE
+
+# Hedge once a call is slower than this percentile of recent calls (0 disables)
+DEFAULT_HEDGE_PERCENTILE = 0.95
+
+# Latency samples needed before hedging starts
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call is abandoned because the request ran out of time"""
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current request's budget, or None if it has none"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def set_deadline(seconds: float) -> contextvars.Token:
+    """Limit the current context to `seconds` from now (never extends an existing deadline)"""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    return _deadline.set(deadline)
+
+
+@contextmanager
+def own_deadline(seconds: float) -> Iterator[None]:
+    """
+    Run a block with a budget of its own, replacing the request's - for work
+    that may outlast any single request budget, such as streaming an export
+    """
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def deadline_budget(seconds: float) -> Callable[[], Any]:
+    """
+    FastAPI dependency giving a route its own (shorter) budget:
+    @router.get("/path", dependencies=[Depends(deadline_budget(2.0))])
+    """
+    async def apply_budget() -> None:
+        set_deadline(seconds)
+    return apply_budget
+
+
+class DeadlineMiddleware:
+    """Start every HTTP request with the default budget"""
+
+    def __init__(self, app: ASGIApp, seconds: float = DEFAULT_REQUEST_DEADLINE):
+        self.app = app
+        self.seconds = seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = set_deadline(self.seconds)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(token)
+
+
+class HedgedCaller:
+    """Runs blocking calls within the current deadline, hedging slow ones"""
+
+    def __init__(
+        self,
+        hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+        max_workers: int = 16,
+        default_timeout: float = DEFAULT_CALL_TIMEOUT,
+    ):
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        # Budget for calls outside a request, so a hung call can't block forever (0: none)
+        self.default_timeout = default_timeout
+        self._latencies: Deque[float] = deque(maxlen=200)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="convex-call")
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+
+    @classmethod
+    def from_env(cls) -> "HedgedCaller":
+        return cls(
+            hedge_percentile=float(os.environ.get("CONVEX_HEDGE_PERCENTILE", DEFAULT_HEDGE_PERCENTILE)),
+            min_samples=int(os.environ.get("CONVEX_HEDGE_MIN_SAMPLES", DEFAULT_HEDGE_MIN_SAMPLES)),
+            max_workers=int(os.environ.get("CONVEX_MAX_WORKERS", 16)),
+            default_timeout=float(os.environ.get("CONVEX_CALL_TIMEOUT", DEFAULT_CALL_TIMEOUT)),
+        )
+
+    def hedge_delay(self) -> Optional[float]:
+        """Latency after which a second call is sent, or None if not hedging yet"""
+        if not self.hedge_percentile or len(self._latencies) < self.min_samples:
+            return None
+        samples = sorted(self._latencies)
+        return samples[min(len(samples) - 1, int(len(samples) * self.hedge_percentile))]
+
+    def _record(self, started: float) -> None:
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+
+    def _timeout(self) -> DeadlineExceeded:
+        with self._lock:
+            self.deadline_exceeded += 1
+        return DeadlineExceeded("Request deadline exceeded waiting for Convex")
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Call fn() within the remaining budget; raises DeadlineExceeded when it runs out"""
+        budget = remaining()
+        if budget is None and self.default_timeout > 0:
+            token = set_deadline(self.default_timeout)
+            try:
+                return self.call(fn)
+            finally:
+                _deadline.reset(token)
+
+        with self._lock:
+            self.calls += 1
+        hedge_after = self.hedge_delay()
+        started = time.monotonic()
+
+        if budget is None and hedge_after is None:
+            result = fn()
+            self._record(started)
+            return result
+        if budget is not None and budget <= 0:
+            raise self._timeout()
+
+        first = self._pool.submit(fn)
+        pending = {first}
+        if hedge_after is not None and (budget is None or hedge_after < budget):
+            done, _ = wait(pending, timeout=hedge_after)
+            if not done:
+                with self._lock:
+                    self.hedged += 1
+                pending.add(self._pool.submit(fn))
+
+        error: Optional[BaseException] = None
+        while pending:
+            left = remaining()
+            if left is not None and left <= 0:
+                break
+            done, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    self._record(started)
+                    if future is not first:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+
+        if error is not None and not pending:
+            raise error
+        # Abandon whatever is still running; its result is discarded
+        raise self._timeout()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get call, hedging and deadline counters"""
+        delay = self.hedge_delay()
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "deadline_exceeded": self.deadline_exceeded,
+            "hedge_after_ms": round(delay * 1000, 1) if delay is not None else None,
+        }
@@ -1,91 +1,182 @@
 """
 Edge Config client for Python
 Since Vercel Edge Config SDK is for JavaScript, we'll use HTTP API
+
+The whole Edge Config document is held as one parsed snapshot in memory.
+Lookups are memory reads; the snapshot is refreshed over a pooled
+keep-alive connection once it is older than EDGE_CONFIG_TTL seconds,
+using If-None-Match so an unchanged document costs a 304 and no parsing.
 """
 import os
 import json
-from typing import Any, Optional
-import urllib.request
-import urllib.error
+import sys
+import threading
+import time
+import http.client
+from functools import cached_property
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+from api.data.dataset import get_dataset
+
+# Seconds a snapshot is served before it is revalidated
+DEFAULT_TTL = 60.0
+
+# Seconds allowed for one Edge Config request
+DEFAULT_TIMEOUT = 2.0
+
+_MISSING = object()
+
 
 class EdgeConfigClient:
-    def __init__(self):
+    def __init__(self, ttl: Optional[float] = None, timeout: Optional[float] = None):
         # Edge Config connection string format:
         # https://edge-config.vercel.com/<config-id>?token=<token>
-        self.edge_config_url = os.environ.get('EDGE_CONFIG')
-        self._cache = {}
-        # Always load fallback data as cache
-        self._load_fallback_data()
-        if not self.edge_config_url:
-            self.edge_config_url = None
-    
+        self.edge_config_url = os.environ.get('EDGE_CONFIG') or None
+        self.ttl = ttl if ttl is not None else float(os.environ.get('EDGE_CONFIG_TTL', DEFAULT_TTL))
+        self.timeout = timeout if timeout is not None else float(os.environ.get('EDGE_CONFIG_TIMEOUT', DEFAULT_TIMEOUT))
+        # Fallback data (_cache) is read from the local dataset on first use
+
+        # (parsed document, per-key views), swapped atomically on refresh
+        self._state: Optional[tuple] = None
+        self._etag: Optional[str] = None
+        self._fetched_at = 0.0
+        self._attempted_at: Optional[float] = None
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self.fetches = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    @cached_property
+    def _cache(self) -> Mapping[str, Any]:
+        """Local collections used when Edge Config is not available, read per lookup"""
+        # Shared dataset (see api.data.dataset); episodes only load if asked for
+        return get_dataset().collections
+
     def _load_fallback_data(self):
-        """Load fallback data when Edge Config is not available"""
+        """(Re)load the fallback data used when Edge Config is not available"""
+        self._cache = get_dataset().collections
+
+    def _connect(self) -> http.client.HTTPConnection:
+        """Get the pooled keep-alive connection, opening it if needed"""
+        if self._connection is None:
+            parts = urlsplit(self.edge_config_url)
+            connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            self._connection = connection_class(parts.netloc, timeout=self.timeout)
+        return self._connection
+
+    def _fetch(self) -> None:
+        """Revalidate the snapshot; keeps the old snapshot on any error"""
+        parts = urlsplit(self.edge_config_url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {"Connection": "keep-alive"}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+
         try:
-            # Import the existing data as fallback
-            from api.data.tmnt_data import TURTLES, VILLAINS, WEAPONS, QUOTES, EPISODES
-            self._cache = {
-                'turtles': {k: v.model_dump() for k, v in TURTLES.items()},
-                'villains': {k: v.model_dump() for k, v in VILLAINS.items()},
-                'weapons': [w.model_dump() for w in WEAPONS],
-                'quotes': [q.model_dump() for q in QUOTES],
-                'episodes': [e.model_dump() for e in EPISODES]
-            }
-        except ImportError:
-            # If import fails, use empty cache
-            self._cache = {
-                'turtles': {},
-                'villains': {},
-                'weapons': [],
-                'quotes': [],
-                'episodes': []
-            }
-    
+            with self._lock:
+                connection = self._connect()
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                except Exception:
+                    # Drop a broken keep-alive connection so the next fetch reconnects
+                    connection.close()
+                    self._connection = None
+                    raise
+
+            if response.status == 304:
+                self.not_modified += 1
+            elif response.status == 200:
+                snapshot = json.loads(body)
+                self._state = (snapshot if isinstance(snapshot, dict) else {}, {})
+                self._etag = response.getheader("ETag")
+                self.fetches += 1
+            else:
+                raise RuntimeError(f"Edge Config returned HTTP {response.status}")
+            self._fetched_at = time.monotonic()
+        except Exception as e:
+            self.errors += 1
+            print(f"Error refreshing Edge Config: {e}", file=sys.stderr)
+        finally:
+            # Failed attempts also wait a full TTL before retrying
+            self._attempted_at = time.monotonic()
+            self._refreshing = False
+
+    def _refresh_in_background(self) -> None:
+        """Start one timed background revalidation unless one is running"""
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._fetch, name="edge-config-refresh", daemon=True).start()
+
+    def _current_state(self) -> Optional[tuple]:
+        """Get (snapshot, views), loading on first use and refreshing once stale"""
+        now = time.monotonic()
+        if self._attempted_at is not None and now - self._attempted_at <= self.ttl:
+            return self._state
+        if self._state is None:
+            with self._refresh_lock:
+                self._refreshing = True
+            self._fetch()
+        else:
+            self._refresh_in_background()
+        return self._state
+
+    def _view(self, snapshot: Dict[str, Any], key: str) -> Optional[Any]:
+        """Resolve one key from a snapshot"""
+        # If the data has an 'items' key, look inside it
+        if 'items' in snapshot and isinstance(snapshot['items'], dict):
+            edge_data = snapshot['items'].get(key)
+            # If Edge Config has old PNG URLs, use our cached SVG data
+            if key in ['turtles', 'villains'] and isinstance(edge_data, dict) and edge_data:
+                first_item = next(iter(edge_data.values()), {})
+                if isinstance(first_item, dict) and first_item.get('image_url', '').endswith('.png'):
+                    return self._cache.get(key)
+            return edge_data
+        # Otherwise, check at the root level
+        return snapshot.get(key)
+
     def get(self, key: str) -> Optional[Any]:
         """Get a value from Edge Config"""
         if not self.edge_config_url:
             return self._cache.get(key)
-        
-        try:
-            # First, get all data from Edge Config
-            all_data = self.get_all()
-            
-            # Check if data is in the expected structure
-            if isinstance(all_data, dict):
-                # If the data has an 'items' key, look inside it
-                if 'items' in all_data and isinstance(all_data['items'], dict):
-                    edge_data = all_data['items'].get(key)
-                    # If Edge Config has old PNG URLs, use our cached SVG data
-                    if key in ['turtles', 'villains'] and edge_data:
-                        # Check if it's using old PNG URLs
-                        if isinstance(edge_data, dict):
-                            first_item = next(iter(edge_data.values()), {})
-                            if isinstance(first_item, dict) and first_item.get('image_url', '').endswith('.png'):
-                                return self._cache.get(key)
-                    return edge_data
-                # Otherwise, check at the root level
-                return all_data.get(key)
-            
-            return None
-        except Exception:
-            # Fall back to cached data on any error
+
+        state = self._current_state()
+        if state is None:
+            # Fall back to cached data until a snapshot loads
             return self._cache.get(key)
-    
-    def get_all(self) -> dict:
+
+        snapshot, views = state
+        value = views.get(key, _MISSING)
+        if value is _MISSING:
+            value = views[key] = self._view(snapshot, key)
+        return value
+
+    def get_all(self) -> Mapping[str, Any]:
         """Get all values from Edge Config"""
         if not self.edge_config_url:
             return self._cache
-        
-        try:
-            # Get all items from Edge Config
-            req = urllib.request.Request(self.edge_config_url)
-            
-            with urllib.request.urlopen(req) as response:
-                data = json.loads(response.read().decode())
-                return data
-        except Exception:
-            # Fall back to cached data on any error
-            return self._cache
+
+        state = self._current_state()
+        return state[0] if state is not None else self._cache
+
+    def stats(self) -> Dict[str, Any]:
+        """Get snapshot age and fetch counters"""
+        return {
+            "configured": bool(self.edge_config_url),
+            "age_seconds": round(time.monotonic() - self._fetched_at, 1) if self._state is not None else None,
+            "etag": self._etag,
+            "fetches": self.fetches,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+        }
 
 # Global instance
-edge_config = EdgeConfigClient()
\ No newline at end of file
+edge_config = EdgeConfigClient()
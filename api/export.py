@@ -0,0 +1,112 @@
+"""
+Bulk export
+Whole collections streamed as NDJSON or CSV. Records are pulled from the
+client one at a time (episodes a page at a time), encoded and flushed in
+fixed-size chunks, so memory stays flat whatever the catalog size. A
+download can be resumed from a record offset with `Range: records=<n>-`;
+the client skips ahead to it rather than reading the records before it.
+"""
+import csv
+import io
+import re
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Type
+
+import orjson
+from pydantic import BaseModel
+
+# Bytes buffered before a chunk is sent
+CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+_RANGE = re.compile(r"^\s*records\s*=\s*(\d+)\s*-\s*(\d*)\s*$")
+
+
+class RangeNotSatisfiable(ValueError):
+    """Raised for a records range that can't be served"""
+
+
+def parse_range(header: Optional[str]) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Parse `Range: records=<first>-[<last>]` (inclusive, 0-based) into
+    (first, last or None). Other range units are ignored (None), as
+    RFC 9110 allows; a malformed records range raises RangeNotSatisfiable.
+    """
+    if not header or not header.strip().startswith("records"):
+        return None
+    match = _RANGE.match(header)
+    if not match:
+        raise RangeNotSatisfiable(f"Unsupported range: {header}")
+    first, last = int(match.group(1)), int(match.group(2)) if match.group(2) else None
+    if last is not None and last < first:
+        raise RangeNotSatisfiable(f"Unsupported range: {header}")
+    return first, last
+
+
+def content_range(first: int, last: Optional[int], total: Optional[int]) -> str:
+    """Content-Range for a records range; * where the last record or the total isn't known"""
+    if last is None and total is not None:
+        last = total - 1
+    return f"records {first}-{'*' if last is None else last}/{'*' if total is None else total}"
+
+
+def _row(model: Type[BaseModel], record: Dict[str, Any]) -> Dict[str, Any]:
+    """A record reduced to the model's fields, in model order"""
+    return {name: record.get(name) for name in model.model_fields}
+
+
+def ndjson_lines(model: Type[BaseModel], records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """One JSON document per line"""
+    for record in records:
+        yield orjson.dumps(_row(model, record)) + b"\n"
+
+
+def csv_lines(model: Type[BaseModel], records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """A header row, then one row per record; list and object fields are JSON-encoded"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\r\n")
+
+    def line(values: Iterable[Any]) -> bytes:
+        writer.writerow(values)
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    yield line(model.model_fields)
+    for record in records:
+        yield line(
+            orjson.dumps(value).decode() if isinstance(value, (list, dict)) else ("" if value is None else value)
+            for value in _row(model, record).values()
+        )
+
+
+ENCODERS = {"ndjson": ndjson_lines, "csv": csv_lines}
+
+
+def chunked(lines: Iterable[bytes], size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Group lines into chunks of about `size` bytes"""
+    pending = []
+    pending_size = 0
+    for line in lines:
+        pending.append(line)
+        pending_size += len(line)
+        if pending_size >= size:
+            yield b"".join(pending)
+            pending, pending_size = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a stream, flushing after every chunk so clients can decode as it arrives"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
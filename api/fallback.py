@@ -0,0 +1,53 @@
+"""
+Fallback tracking
+A Convex call can fail while the circuit breaker stays closed, and be
+answered from the local dataset. Such an answer must not be cached under
+Convex's data version, or it would keep being served after Convex recovers.
+Each request collects the fallbacks it made in a context variable (copied
+into the worker threads that run Convex calls), so whatever caches the
+response can tell which source it really came from.
+"""
+import contextvars
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_fallbacks: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar("fallbacks", default=None)
+
+
+def record_fallback(name: str) -> None:
+    """Note that `name` was answered from local data (no-op outside tracking)"""
+    fallbacks = _fallbacks.get()
+    if fallbacks is not None:
+        fallbacks.append(name)
+
+
+def fell_back() -> bool:
+    """Whether anything in the current context was answered from local data"""
+    return bool(_fallbacks.get())
+
+
+@contextmanager
+def track_fallbacks() -> Iterator[List[str]]:
+    """Collect the fallbacks made within a block; yields the list they are added to"""
+    fallbacks: List[str] = []
+    token = _fallbacks.set(fallbacks)
+    try:
+        yield fallbacks
+    finally:
+        _fallbacks.reset(token)
+
+
+class FallbackMiddleware:
+    """Track the fallbacks made while handling each HTTP request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with track_fallbacks():
+            await self.app(scope, receive, send)
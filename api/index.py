@@ -1,13 +1,21 @@
 # This is the entry point for Vercel
 # Import the FastAPI app from main.py
-from fastapi import FastAPI, Response
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from api.routes.turtles_cached import router as turtles_router
 from api.routes.villains_cached import router as villains_router
 from api.routes.episodes_cached import router as episodes_router
+from api.routes.search_cached import router as search_router
+from api.routes.export_cached import router as export_router
+from api.routes.seasons_cached import router as seasons_router
 from api.convex_client import convex_client
+from api.async_convex_client import async_convex_client
+from api.response_cache import response_cache
+from api.conditional import ETagMiddleware
+from api.compression import PrecompressedStaticFiles, compressed_file_response
+from api.deadline import DEFAULT_REQUEST_DEADLINE, DeadlineMiddleware
+from api.fallback import FallbackMiddleware
 import json
 import os
 from pathlib import Path
@@ -16,9 +24,20 @@ from pathlib import Path
 app = FastAPI(
     title="TMNT API",
     description="API for Teenage Mutant Ninja Turtles information - Powered by Convex",
-    version="3.0.0"
+    version="3.0.0",
+    # orjson renders what FastAPI's response_model serialization produces
+    default_response_class=ORJSONResponse,
 )
 
+# ETag / If-None-Match for every GET under /api/v1 (inside CORS, so 304s keep CORS headers)
+app.add_middleware(ETagMiddleware, prefix="/api/v1")
+
+# Notes which answers fell back to local data, so they aren't cached as Convex's
+app.add_middleware(FallbackMiddleware)
+
+# Per-request time budget passed down into Convex calls (vercel.json maxDuration is 10s)
+app.add_middleware(DeadlineMiddleware, seconds=float(os.environ.get("REQUEST_DEADLINE", DEFAULT_REQUEST_DEADLINE)))
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -26,12 +45,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Missing-Ids", "ETag", "Content-Range"],
 )
 
 # Include routers with caching
 app.include_router(turtles_router, prefix="/api/v1", tags=["turtles"])
 app.include_router(villains_router, prefix="/api/v1", tags=["villains"])
 app.include_router(episodes_router, prefix="/api/v1", tags=["episodes"])
+app.include_router(search_router, prefix="/api/v1", tags=["search"])
+app.include_router(seasons_router, prefix="/api/v1", tags=["seasons"])
+app.include_router(export_router, prefix="/api/v1", tags=["export"])
 
 
 @app.get("/api")
@@ -52,8 +75,11 @@ async def api_root(response: Response):
             "turtles": "/api/v1/turtles",
             "villains": "/api/v1/villains",
             "episodes": "/api/v1/episodes",
+            "seasons": "/api/v1/seasons",
             "quotes": "/api/v1/quotes/random",
             "weapons": "/api/v1/weapons",
+            "search": "/api/v1/search?q=shredder",
+            "export": "/api/v1/export/episodes?format=ndjson",
             "docs": "/docs"
         }
     }
@@ -67,11 +93,13 @@ async def health_check(response: Response):
     
     # Check Convex connection
     convex_status = "connected" if convex_client._connected else "fallback"
+    breaker = convex_client.breaker.stats()
     
     return {
-        "status": "healthy",
+        "status": "healthy" if breaker["state"] == "closed" else "degraded",
         "service": "TMNT API",
         "convex": convex_status,
+        "circuit_breaker": breaker,
         "version": "3.0.0"
     }
 
@@ -96,21 +124,21 @@ async def debug_endpoint(response: Response):
     error = None
     quotes_error = None
     try:
-        turtles = convex_client.get_turtles()
+        turtles = await async_convex_client.get_turtles()
         turtles_data = f"Loaded {len(turtles)} turtles" if turtles else "No turtles data"
         
-        villains = convex_client.get_villains()
+        villains = await async_convex_client.get_villains()
         villains_data = f"Loaded {len(villains)} villains" if villains else "No villains data"
         
-        episodes = convex_client.get_episodes()
+        episodes = await async_convex_client.get_episodes()
         episodes_count = f"Loaded {len(episodes)} episodes" if episodes else "No episodes data"
         
-        quotes = convex_client.get_quotes()
+        quotes = await async_convex_client.get_quotes()
         quotes_data = f"Loaded {len(quotes)} quotes" if quotes else "No quotes data"
         
         # Try to get a random quote
         try:
-            random_quote = convex_client.get_random_quote()
+            random_quote = await async_convex_client.get_random_quote()
             random_quote_data = f"Random quote: {random_quote}" if random_quote else "No random quote"
         except Exception as e:
             quotes_error = f"Random quote error: {type(e).__name__}: {str(e)}"
@@ -132,6 +160,13 @@ async def debug_endpoint(response: Response):
         "random_quote_data": random_quote_data,
         "error": error,
         "quotes_error": quotes_error,
+        "cache": convex_client.cache.stats(),
+        "single_flight": convex_client.flights.stats(),
+        "revalidation": convex_client.revalidation_stats(),
+        "calls": convex_client.caller.stats(),
+        "quote_pool": convex_client.quote_pool.stats(),
+        "response_cache": response_cache.stats(),
+        "data_version": convex_client.data_version,
         "python_version": sys.version
     }
 
@@ -141,23 +176,23 @@ async def debug_endpoint(response: Response):
 base_dir = Path(__file__).parent.parent
 public_dir = base_dir / "public"
 
-# Mount static files for CSS, JS, images
-app.mount("/css", StaticFiles(directory=public_dir / "css"), name="css")
-app.mount("/js", StaticFiles(directory=public_dir / "js"), name="js")
-app.mount("/images", StaticFiles(directory=public_dir / "images"), name="images")
-app.mount("/pages", StaticFiles(directory=public_dir / "pages"), name="pages")
+# Mount static files for CSS, JS, images (brotli/gzip variants prebuilt at deploy time)
+app.mount("/css", PrecompressedStaticFiles(directory=public_dir / "css"), name="css")
+app.mount("/js", PrecompressedStaticFiles(directory=public_dir / "js"), name="js")
+app.mount("/images", PrecompressedStaticFiles(directory=public_dir / "images"), name="images")
+app.mount("/pages", PrecompressedStaticFiles(directory=public_dir / "pages"), name="pages")
 
 # Serve index.html at root
 @app.get("/")
-async def serve_homepage():
+async def serve_homepage(request: Request):
     """Serve the homepage"""
-    return FileResponse(public_dir / "index.html")
+    return compressed_file_response(request.headers, FileResponse(public_dir / "index.html"))
 
 # Serve favicon
 @app.get("/favicon.svg")
-async def serve_favicon():
+async def serve_favicon(request: Request):
     """Serve the favicon"""
-    return FileResponse(public_dir / "favicon.svg")
+    return compressed_file_response(request.headers, FileResponse(public_dir / "favicon.svg"))
 
 
 
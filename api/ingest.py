@@ -0,0 +1,59 @@
+"""
+Validate-once ingest
+Records are validated against their response model once, as they enter the
+process: Convex results before they are cached, local data when the dataset
+is built (or when the snapshot is compiled). A record that passes is kept as
+a TrustedRecord - a dict in the model's exact shape - and responses made of
+trusted records are encoded directly, without validating them again on every
+request. Records that fail are logged and left as plain dicts, so they are
+still validated (and rejected) when served.
+"""
+import sys
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel, ValidationError
+
+from api.models import Episode, Quote, Turtle, Villain, Weapon
+
+# Response model of each collection's records
+MODELS: Dict[str, Type[BaseModel]] = {
+    "turtles": Turtle,
+    "villains": Villain,
+    "episodes": Episode,
+    "quotes": Quote,
+    "weapons": Weapon,
+}
+
+
+class TrustedRecord(dict):
+    """A record that already passed validation against `model`"""
+    __slots__ = ("model",)
+
+    def __init__(self, model: Type[BaseModel], data: Dict[str, Any]):
+        super().__init__(data)
+        self.model = model
+
+
+def from_model(instance: BaseModel) -> TrustedRecord:
+    """Trusted record for an already-constructed model instance"""
+    return TrustedRecord(type(instance), instance.model_dump())
+
+
+def validate_record(model: Type[BaseModel], record: Any) -> Any:
+    """Validate a record once: a TrustedRecord, or the record unchanged if it is invalid"""
+    if isinstance(record, TrustedRecord) and record.model is model:
+        return record
+    try:
+        return TrustedRecord(model, model.model_validate(record).model_dump())
+    except ValidationError as e:
+        print(f"Invalid {model.__name__} record, it will be validated per request: {e}", file=sys.stderr)
+        return record
+
+
+def is_trusted(model: Type[BaseModel], data: Any) -> bool:
+    """Whether data is a record (or a list/tuple of records) already validated as model"""
+    if isinstance(data, TrustedRecord):
+        return data.model is model
+    if isinstance(data, (list, tuple)):
+        return all(isinstance(item, TrustedRecord) and item.model is model for item in data)
+    return False
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
 
 
 class Turtle(BaseModel):
@@ -43,6 +43,19 @@ class Episode(BaseModel):
     notes: Optional[str] = None
 
 
+# Most episode ids accepted by one multi-get request
+MAX_BATCH_IDS = 200
+
+
+class EpisodeBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class EpisodeBatch(BaseModel):
+    episodes: List[Episode]
+    missing: List[int] = []
+
+
 class Quote(BaseModel):
     id: Optional[int] = None
     text: str
@@ -56,4 +69,46 @@ class Weapon(BaseModel):
     type: str
     wielder: str
     description: str
-    special_moves: List[str] = []
\ No newline at end of file
+    special_moves: List[str] = []
+
+
+class SearchHit(BaseModel):
+    score: float
+    item: Dict[str, Any]
+
+
+class SearchResults(BaseModel):
+    query: str
+    limit: int
+    offset: int
+    # Matches per collection, before pagination
+    totals: Dict[str, int]
+    turtles: List[SearchHit] = []
+    villains: List[SearchHit] = []
+    episodes: List[SearchHit] = []
+    quotes: List[SearchHit] = []
+
+
+class VillainAppearances(BaseModel):
+    name: str
+    episodes: int
+
+
+class CastAppearances(BaseModel):
+    character_name: str
+    voice_actor: str
+    episodes: int
+
+
+class Season(BaseModel):
+    season: int
+    year: Optional[int] = None
+    description: Optional[str] = None
+    episode_count: int
+    first_air_date: Optional[str] = None
+    last_air_date: Optional[str] = None
+    writers: List[str] = []
+    directors: List[str] = []
+    # Most frequent first
+    villains: List[VillainAppearances] = []
+    top_cast: List[CastAppearances] = []
@@ -0,0 +1,76 @@
+"""
+Random quote pool
+Keeps the quotes in process so random picks never leave the process,
+refreshing the pool in a background thread once it gets old.
+"""
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Default seconds before the pool is refreshed in the background
+DEFAULT_REFRESH_INTERVAL = 300.0
+
+
+class RandomQuotePool:
+    def __init__(
+        self,
+        loader: Callable[[], List[Dict[str, Any]]],
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        """Pool filled by calling loader(); refreshed every refresh_interval seconds"""
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self._quotes: tuple = ()
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def _load(self) -> None:
+        """Replace the pool with fresh quotes; keep the old pool on failure"""
+        try:
+            quotes = tuple(self.loader() or ())
+        except Exception as e:
+            self.refresh_errors += 1
+            print(f"Error refreshing quote pool: {e}", file=sys.stderr)
+            return
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+        if quotes:
+            self._quotes = quotes
+            self._loaded_at = time.monotonic()
+            self.refreshes += 1
+
+    def _refresh_in_background(self) -> None:
+        """Start a background refresh unless one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._load, name="quote-pool-refresh", daemon=True).start()
+
+    def pick(self) -> Optional[Dict[str, Any]]:
+        """Pick a random quote, loading the pool on first use"""
+        if not self._quotes:
+            with self._lock:
+                self._refreshing = True
+            self._load()
+        elif time.monotonic() - self._loaded_at > self.refresh_interval:
+            self._refresh_in_background()
+
+        quotes = self._quotes
+        return random.choice(quotes) if quotes else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool size and refresh counters"""
+        return {
+            "size": len(self._quotes),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._quotes else None,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
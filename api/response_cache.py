@@ -0,0 +1,242 @@
+"""
+Pre-serialized response bodies
+Collection endpoints return the same payload until the data changes, so their
+JSON is validated and encoded once per data version and then served as bytes,
+together with a strong ETag computed from those bytes. Compressed variants
+are built on first request and kept with the body.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple, Type, get_args, get_origin
+
+import orjson
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel, TypeAdapter
+
+from api.compression import COMPRESSORS, MIN_SIZE, negotiate, variant_etag
+from api.conditional import etag_matches, make_etag
+from api.convex_client import convex_client
+from api.ingest import is_trusted
+
+# Default maximum number of cached response bodies
+DEFAULT_MAX_ENTRIES = 128
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """Serialized JSON body and the data version it was built from"""
+    body: bytes
+    version: str
+    etag: str
+    # Extra response headers that depend on the data (e.g. X-Next-Cursor)
+    headers: Tuple[Tuple[str, str], ...] = ()
+    # Until when the version can be trusted without re-querying (None: no limit)
+    expires_at: Optional[float] = None
+
+    # Compressed bodies by content-coding, built on demand
+    variants: Dict[str, bytes] = field(default_factory=dict, compare=False, repr=False)
+
+    def is_fresh(self, version: str) -> bool:
+        return self.version == version and (self.expires_at is None or self.expires_at > time.monotonic())
+
+    def encoding_for(self, request: Request) -> Optional[str]:
+        """Content-coding to send this body with, or None for identity"""
+        if len(self.body) < MIN_SIZE:
+            return None
+        return negotiate(request.headers.get("accept-encoding"))
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """The body in a content-coding, compressing it only the first time"""
+        if not encoding:
+            return self.body
+        variant = self.variants.get(encoding)
+        if variant is None:
+            variant = self.variants[encoding] = COMPRESSORS[encoding](self.body)
+        return variant
+
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def _project(record: Mapping[str, Any], fields: Optional[Tuple[str, ...]]) -> Mapping[str, Any]:
+    return {name: record[name] for name in fields} if fields else record
+
+
+def serialize(model: Any, data: Any, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """
+    Validate data against a response model and encode it, as FastAPI's
+    response_model would, keeping only `fields` of each item if given.
+    Records validated at ingest (see api.ingest) are encoded directly.
+    """
+    many = get_origin(model) is list
+    if is_trusted(get_args(model)[0] if many else model, data):
+        return orjson.dumps([_project(record, fields) for record in data] if many else _project(data, fields))
+
+    adapter = _adapters.get(model)
+    if adapter is None:
+        adapter = _adapters[model] = TypeAdapter(model)
+    include = None
+    if fields:
+        include = {"__all__": set(fields)} if many else set(fields)
+    return adapter.dump_json(adapter.validate_python(data), include=include)
+
+
+def parse_fields(raw: Optional[str], model: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """Parse a fields= parameter ("id,title") into the model's field names, in model order"""
+    if not raw:
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in model.model_fields if name in requested) or None
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized bodies, keyed by endpoint and parameters"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key: Hashable, version: str) -> Optional[CachedBody]:
+        """Get a body, or None if missing or built from another data version"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get_fresh(self, key: Hashable, version: str) -> Optional[CachedBody]:
+        """Get a body only if it can be trusted without re-querying its data"""
+        entry = self.get(key, version)
+        return entry if entry is not None and entry.is_fresh(version) else None
+
+    def get_or_build(
+        self,
+        key: Hashable,
+        version: str,
+        build: Callable[[], bytes],
+        headers: Tuple[Tuple[str, str], ...] = (),
+        ttl: Optional[float] = None,
+    ) -> CachedBody:
+        """Get a body for this data version, serializing it with build() if needed"""
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        entry = self.get(key, version)
+        if entry is not None and entry.headers == headers and (
+            entry.expires_at is None or entry.expires_at > time.monotonic()
+        ):
+            return entry
+
+        body = build()
+        built = True
+        if entry is not None and entry.headers == headers and entry.body == body:
+            # Re-queried data is unchanged - keep the entry and its compressed variants
+            entry = replace(entry, expires_at=expires_at)
+        else:
+            entry = CachedBody(body, version, make_etag(body), headers, expires_at)
+
+        with self._lock:
+            self.builds += built
+            if self.max_entries > 0:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "builds": self.builds,
+        }
+
+
+def _send(request: Request, entry: CachedBody, headers: Optional[Mapping[str, str]]) -> Response:
+    """Full response for a cached body, or a 304 if the client already has it"""
+    encoding = entry.encoding_for(request)
+    etag = variant_etag(entry.etag, encoding)
+    response_headers = {**(headers or {}), **dict(entry.headers), "ETag": etag}
+    if len(entry.body) >= MIN_SIZE:
+        response_headers["Vary"] = "Accept-Encoding"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=response_headers)
+    if encoding:
+        response_headers["Content-Encoding"] = encoding
+    return Response(content=entry.encoded(encoding), media_type="application/json", headers=response_headers)
+
+
+def not_modified(
+    request: Request,
+    key: Tuple[Any, ...],
+    headers: Optional[Mapping[str, str]] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Optional[Response]:
+    """
+    Answer a conditional request from the cache before touching Convex:
+    a 304 if If-None-Match matches the fresh cached body for key, else None
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    entry = response_cache.get_fresh(key + (fields,), convex_client.data_version)
+    if entry is None or not etag_matches(if_none_match, variant_etag(entry.etag, entry.encoding_for(request))):
+        return None
+    return _send(request, entry, headers)
+
+
+def json_response(
+    request: Request,
+    key: Tuple[Any, ...],
+    model: Any,
+    data: Any,
+    headers: Optional[Mapping[str, str]] = None,
+    extra_headers: Optional[Mapping[str, str]] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Response:
+    """
+    Build a JSON Response (or 304) from the cached body for key at the current
+    data version - the local dataset's if the data fell back to it (see
+    api.fallback). key[0] names the collection, which sets how long the version
+    can be trusted by not_modified(). Each fields= projection is cached as its
+    own body. Headers set on FastAPI's injected response aren't merged into a
+    returned Response, so callers pass them here.
+    """
+    entry = response_cache.get_or_build(
+        key + (fields,),
+        convex_client.served_version,
+        lambda: serialize(model, data, fields),
+        headers=tuple(sorted((extra_headers or {}).items())),
+        ttl=convex_client.version_ttl(key[0]),
+    )
+    return _send(request, entry, headers)
+
+
+def model_response(model: Any, data: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Uncached JSON Response for data, encoded with serialize() - trusted
+    records skip the validation FastAPI's response_model would repeat
+    """
+    return Response(content=serialize(model, data), media_type="application/json", headers=dict(headers or {}))
+
+
+# Global instance
+response_cache = ResponseCache(int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)))
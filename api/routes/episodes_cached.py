@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Query, HTTPException, Response
-from typing import List, Optional
-from api.models import Episode, Quote, Weapon
-from api.convex_client import convex_client
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from typing import List, Optional, Tuple
+from api.models import Episode, EpisodeBatch, EpisodeBatchRequest, MAX_BATCH_IDS, Quote, Weapon
+from api.async_convex_client import async_convex_client
+from api.convex_client import InvalidCursor
+from api.deadline import deadline_budget
+from api.response_cache import json_response, model_response, not_modified, parse_fields
 import random
 
 router = APIRouter()
@@ -17,65 +20,168 @@ DYNAMIC_CACHE = {
     "CDN-Cache-Control": "max-age=60"
 }
 
+# Sparse fieldsets: ?fields=id,title,season,episode_number,air_date
+FIELDS = Query(None, description="Comma-separated fields to return, e.g. id,title,air_date")
+
 
 @router.get("/episodes", response_model=List[Episode])
 async def get_episodes(
+    request: Request,
     response: Response,
     season: Optional[int] = Query(None, ge=1, le=10),
     limit: Optional[int] = Query(10, ge=1, le=100),
-    offset: Optional[int] = Query(0, ge=0)
+    offset: Optional[int] = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    ids: Optional[str] = Query(None, description=f"Comma-separated episode ids to fetch in one request (max {MAX_BATCH_IDS})"),
+    fields: Optional[str] = FIELDS
 ):
-    """Get episodes with optional filtering and pagination"""
+    """
+    Get episodes with optional filtering and pagination.
+    Pages carry an X-Next-Cursor header; pass it back as `cursor` for the next page.
+    offset/limit is kept for compatibility.
+    With `ids`, returns those episodes in request order instead; ids that don't
+    exist are listed in the X-Missing-Ids header.
+    """
+    projection = parse_fields(fields, Episode)
+    if ids is not None:
+        return await get_episodes_by_ids(request, response, _parse_ids(ids), projection)
+    
     # Use shorter cache for paginated results
     for key, value in DYNAMIC_CACHE.items():
         response.headers[key] = value
     
-    episodes_data = convex_client.get_episodes(season=season, limit=limit, offset=offset)
-    return episodes_data
+    cache_key = ("episodes", season, limit, offset, cursor)
+    cached = not_modified(request, cache_key, response.headers, fields=projection)
+    if cached:
+        return cached
+    
+    if offset and not cursor:
+        episodes_data = await async_convex_client.get_episodes(season=season, limit=limit, offset=offset)
+        return json_response(request, cache_key, List[Episode], episodes_data, response.headers, fields=projection)
+    
+    try:
+        page = await async_convex_client.get_episodes_page(season=season, limit=limit, cursor=cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    extra_headers = {"X-Next-Cursor": page["next_cursor"]} if page["next_cursor"] else None
+    return json_response(
+        request, cache_key, List[Episode], page["episodes"], response.headers, extra_headers, fields=projection
+    )
+
+
+def _parse_ids(raw: str) -> List[int]:
+    """Parse "1,5,19" into unique ids, keeping their order"""
+    try:
+        episode_ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    episode_ids = list(dict.fromkeys(episode_ids))
+    if not episode_ids:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(episode_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    return episode_ids
+
+
+async def _resolve_ids(episode_ids: List[int]) -> Tuple[List[dict], List[int]]:
+    """Fetch episodes in one batch, returning (found in request order, missing ids)"""
+    results = await async_convex_client.get_episodes_by_ids(episode_ids)
+    episodes = [episode for episode in results if episode]
+    missing = [episode_id for episode_id, episode in zip(episode_ids, results) if not episode]
+    return episodes, missing
+
+
+async def get_episodes_by_ids(
+    request: Request,
+    response: Response,
+    episode_ids: List[int],
+    projection: Optional[Tuple[str, ...]] = None,
+) -> Response:
+    """Multi-get behind GET /episodes?ids=..."""
+    for key, value in STATIC_CACHE.items():
+        response.headers[key] = value
+    
+    cache_key = ("episodes", "ids", tuple(episode_ids))
+    cached = not_modified(request, cache_key, response.headers, fields=projection)
+    if cached:
+        return cached
+    
+    episodes, missing = await _resolve_ids(episode_ids)
+    extra_headers = {"X-Missing-Ids": ",".join(map(str, missing))} if missing else None
+    return json_response(request, cache_key, List[Episode], episodes, response.headers, extra_headers, fields=projection)
+
+
+@router.post("/episodes/batch", response_model=EpisodeBatch)
+async def post_episodes_batch(batch: EpisodeBatchRequest):
+    """Get many episodes in one request (for id lists too long for a URL)"""
+    episodes, missing = await _resolve_ids(list(dict.fromkeys(batch.ids)))
+    return {"episodes": episodes, "missing": missing}
 
 
 @router.get("/episodes/{episode_id}", response_model=Episode)
-async def get_episode_by_id(episode_id: int, response: Response):
+async def get_episode_by_id(episode_id: int, request: Request, response: Response, fields: Optional[str] = FIELDS):
     """Get a specific episode by ID"""
+    projection = parse_fields(fields, Episode)
     for key, value in STATIC_CACHE.items():
         response.headers[key] = value
     
-    episode_data = convex_client.get_episode(episode_id)
+    cached = not_modified(request, ("episodes", episode_id), response.headers, fields=projection)
+    if cached:
+        return cached
+    
+    episode_data = await async_convex_client.get_episode(episode_id)
     if not episode_data:
         raise HTTPException(status_code=404, detail=f"Episode {episode_id} not found")
     
-    return episode_data
+    return json_response(request, ("episodes", episode_id), Episode, episode_data, response.headers, fields=projection)
 
 
-@router.get("/quotes/random", response_model=Quote)
+# Random quotes are cheap to answer locally - don't wait long on Convex
+@router.get("/quotes/random", response_model=Quote, dependencies=[Depends(deadline_budget(2.0))])
 async def get_random_quote(response: Response):
     """Get a random TMNT quote - no cache for randomness"""
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
     
-    quote_data = convex_client.get_random_quote()
+    quote_data = await async_convex_client.get_random_quote()
     if not quote_data:
         raise HTTPException(status_code=500, detail="Failed to get random quote")
     
-    return quote_data
+    return model_response(Quote, quote_data, response.headers)
 
 
 @router.get("/quotes", response_model=List[Quote])
-async def get_all_quotes(response: Response, character: Optional[str] = None):
+async def get_all_quotes(
+    request: Request,
+    response: Response,
+    character: Optional[str] = None,
+    fields: Optional[str] = FIELDS
+):
     """Get all quotes, optionally filtered by character"""
+    projection = parse_fields(fields, Quote)
     for key, value in STATIC_CACHE.items():
         response.headers[key] = value
     
-    quotes_data = convex_client.get_quotes(character=character)
-    return quotes_data
+    cached = not_modified(request, ("quotes", character), response.headers, fields=projection)
+    if cached:
+        return cached
+    
+    quotes_data = await async_convex_client.get_quotes(character=character)
+    return json_response(request, ("quotes", character), List[Quote], quotes_data, response.headers, fields=projection)
 
 
 @router.get("/weapons", response_model=List[Weapon])
-async def get_all_weapons(response: Response):
+async def get_all_weapons(request: Request, response: Response, fields: Optional[str] = FIELDS):
     """Get all turtle weapons"""
+    projection = parse_fields(fields, Weapon)
     for key, value in STATIC_CACHE.items():
         response.headers[key] = value
     
-    weapons_data = convex_client.get_weapons()
-    return weapons_data
+    cached = not_modified(request, ("weapons",), response.headers, fields=projection)
+    if cached:
+        return cached
+    
+    weapons_data = await async_convex_client.get_weapons()
+    return json_response(request, ("weapons",), List[Weapon], weapons_data, response.headers, fields=projection)
 
 
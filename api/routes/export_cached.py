@@ -0,0 +1,105 @@
+import itertools
+import sys
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+from api.async_convex_client import async_convex_client
+from api.compression import negotiate, variant_etag
+from api.conditional import etag_matches, make_etag
+from api.convex_client import convex_client
+from api.export import ENCODERS, MEDIA_TYPES, RangeNotSatisfiable, chunked, content_range, gzipped, parse_range
+from api.ingest import MODELS
+
+router = APIRouter()
+
+# Exports only change with the data; the ETag tracks a digest of the content
+CACHE_HEADERS = {
+    "Cache-Control": "public, s-maxage=3600, stale-while-revalidate=86400",
+    "CDN-Cache-Control": "max-age=3600"
+}
+
+
+@router.get("/export/{collection}")
+async def export_collection(
+    collection: str,
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+):
+    """
+    Stream every record of a collection (turtles, villains, episodes, quotes,
+    weapons) as NDJSON or CSV, gzipped if the client accepts it.
+    Resume an interrupted download with `Range: records=<n>-` (0-based,
+    inclusive); the 206 response says which records follow in Content-Range.
+    CSV responses always start with the header row. If fetching records fails
+    before any are sent the response is a 503; after that, the transfer is
+    aborted, so a cut-off export never looks complete.
+    """
+    model = MODELS.get(collection)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Unknown collection: {collection}")
+    try:
+        records = parse_range(request.headers.get("range"))
+    except RangeNotSatisfiable as e:
+        raise HTTPException(status_code=416, detail=str(e))
+
+    encoding = negotiate(request.headers.get("accept-encoding"), supported=("gzip",))
+    headers = {
+        **CACHE_HEADERS,
+        "Vary": "Accept-Encoding, Range",
+        "Accept-Ranges": "records",
+        "Content-Disposition": f'attachment; filename="{collection}.{fmt}"',
+    }
+    # Digest, size and records all come from the same source, so the ETag
+    # can't describe Convex's data while the body is local (or the reverse)
+    source = convex_client.collection_source()
+    digest = await async_convex_client.collection_digest(collection, source)
+    if digest is not None:
+        headers["ETag"] = variant_etag(make_etag(f"export:{collection}:{fmt}:{digest}".encode()), encoding)
+        if records is None and etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    status_code, first, last = 200, 0, None
+    if records is not None:
+        first, last = records
+        total = await async_convex_client.collection_size(collection, source)
+        if total is not None:
+            if first >= total:
+                raise HTTPException(
+                    status_code=416, detail=f"{collection} has {total} records",
+                    headers={"Content-Range": f"records */{total}"},
+                )
+            last = min(last, total - 1) if last is not None else None
+        status_code = 206
+        headers["Content-Range"] = content_range(first, last, total)
+
+    selected = convex_client.iter_collection(collection, start=first, source=source)
+    if last is not None:
+        selected = itertools.islice(selected, last - first + 1)
+    body = chunked(ENCODERS[fmt](model, selected))
+    if encoding:
+        body = gzipped(body)
+        headers["Content-Encoding"] = encoding
+
+    # Chunks are made in the threadpool, so blocking Convex calls don't stall the
+    # loop. The first one is made before the status line is sent.
+    stream = iterate_in_threadpool(body)
+    try:
+        head = await stream.__anext__()
+    except StopAsyncIteration:
+        head = b""
+    except Exception as e:
+        print(f"Export of {collection} failed: {e}", file=sys.stderr)
+        raise HTTPException(status_code=503, detail=f"Could not export {collection}, try again later")
+
+    async def resumed():
+        yield head
+        try:
+            async for chunk in stream:
+                yield chunk
+        except Exception as e:
+            # Re-raised so the server aborts the transfer rather than ending it cleanly
+            print(f"Export of {collection} failed mid-stream: {e}", file=sys.stderr)
+            raise
+
+    return StreamingResponse(resumed(), status_code=status_code, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Optional
+from api.models import SearchResults
+from api.search import SEARCH_FIELDS, get_search_index
+
+router = APIRouter()
+
+# Results only change with the data, but queries are too varied to cache long
+CACHE_HEADERS = {
+    "Cache-Control": "public, s-maxage=300, stale-while-revalidate=3600",
+    "CDN-Cache-Control": "max-age=300"
+}
+
+
+@router.get("/search", response_model=SearchResults)
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200, description='Words, "quoted phrases" and prefix* terms'),
+    types: Optional[str] = Query(None, description="Comma-separated collections to search, e.g. episodes,quotes"),
+    limit: int = Query(10, ge=1, le=50, description="Results per collection"),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Search turtles, villains, episodes and quotes.
+    Each collection's hits are ranked with BM25 and paginated with limit/offset;
+    `totals` gives the number of matches per collection.
+    """
+    for key, value in CACHE_HEADERS.items():
+        response.headers[key] = value
+    
+    selected = None
+    if types:
+        selected = [name.strip() for name in types.split(",") if name.strip()]
+        unknown = set(selected) - set(SEARCH_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown types: {', '.join(sorted(unknown))}")
+    
+    index = await get_search_index()
+    return index.search(q, types=selected, limit=limit, offset=offset)
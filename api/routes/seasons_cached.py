@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from typing import List, Optional
+from api.models import Season
+from api.response_cache import json_response, not_modified, parse_fields
+from api.seasons import get_season_stats
+
+router = APIRouter()
+
+# Aggregates only change with the episode data, so cache them for a day
+CACHE_HEADERS = {
+    "Cache-Control": "public, s-maxage=86400, stale-while-revalidate=604800",
+    "CDN-Cache-Control": "max-age=86400"
+}
+
+# Sparse fieldsets: ?fields=season,year,episode_count
+FIELDS = Query(None, description="Comma-separated fields to return, e.g. season,year,episode_count")
+
+
+@router.get("/seasons", response_model=List[Season])
+async def get_seasons(request: Request, response: Response, fields: Optional[str] = FIELDS):
+    """
+    Per-season statistics: episode count, air date range, writers, directors,
+    villain appearances and most frequent cast
+    """
+    projection = parse_fields(fields, Season)
+    for key, value in CACHE_HEADERS.items():
+        response.headers[key] = value
+
+    cached = not_modified(request, ("episodes", "seasons"), response.headers, fields=projection)
+    if cached:
+        return cached
+
+    stats = await get_season_stats()
+    return json_response(request, ("episodes", "seasons"), List[Season], stats.seasons, response.headers, fields=projection)
+
+
+@router.get("/seasons/{season}", response_model=Season)
+async def get_season(
+    request: Request,
+    response: Response,
+    season: int = Path(..., ge=1),
+    fields: Optional[str] = FIELDS,
+):
+    """Statistics for one season"""
+    projection = parse_fields(fields, Season)
+    for key, value in CACHE_HEADERS.items():
+        response.headers[key] = value
+
+    cached = not_modified(request, ("episodes", "seasons", season), response.headers, fields=projection)
+    if cached:
+        return cached
+
+    stats = await get_season_stats()
+    record = stats.by_number.get(season)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Season {season} not found")
+    return json_response(request, ("episodes", "seasons", season), Season, record, response.headers, fields=projection)
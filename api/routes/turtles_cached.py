@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, Response
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import List, Dict, Optional
 from api.models import Turtle
-from api.convex_client import convex_client
+from api.async_convex_client import async_convex_client
+from api.response_cache import json_response, not_modified, parse_fields
 import json
 import traceback
 import sys
@@ -15,23 +16,33 @@ CACHE_HEADERS = {
     "Vercel-CDN-Cache-Control": "max-age=3600"
 }
 
+# Sparse fieldsets: ?fields=name,color
+FIELDS = Query(None, description="Comma-separated fields to return, e.g. name,color")
+
 
 @router.get("/turtles", response_model=List[Turtle])
-async def get_all_turtles(response: Response):
+async def get_all_turtles(request: Request, response: Response, fields: Optional[str] = FIELDS):
     """Get all ninja turtles from Convex"""
+    projection = parse_fields(fields, Turtle)
     try:
         # Set cache headers
         for key, value in CACHE_HEADERS.items():
             response.headers[key] = value
         
+        # Revalidation of an unchanged body skips Convex entirely
+        cached = not_modified(request, ("turtles",), response.headers, fields=projection)
+        if cached:
+            return cached
+        
         # Get data from Convex
-        turtles_data = convex_client.get_turtles()
+        turtles_data = await async_convex_client.get_turtles()
         if not turtles_data:
             # Log the issue
             print(f"ERROR: No turtles data found in Convex", file=sys.stderr)
             raise HTTPException(status_code=500, detail="Failed to load turtle data")
         
-        return turtles_data
+        # Serialized once per data version
+        return json_response(request, ("turtles",), List[Turtle], turtles_data, response.headers, fields=projection)
     except Exception as e:
         # Log full traceback
         print(f"ERROR in get_all_turtles: {str(e)}", file=sys.stderr)
@@ -42,15 +53,20 @@ async def get_all_turtles(response: Response):
 
 
 @router.get("/turtles/{name}", response_model=Turtle)
-async def get_turtle_by_name(name: str, response: Response):
+async def get_turtle_by_name(name: str, request: Request, response: Response, fields: Optional[str] = FIELDS):
     """Get a specific turtle by name from Convex"""
+    projection = parse_fields(fields, Turtle)
     # Set cache headers
     for key, value in CACHE_HEADERS.items():
         response.headers[key] = value
     
+    cached = not_modified(request, ("turtles", name.lower()), response.headers, fields=projection)
+    if cached:
+        return cached
+    
     # Get data from Convex
-    turtle_data = convex_client.get_turtle(name.lower())
+    turtle_data = await async_convex_client.get_turtle(name.lower())
     if not turtle_data:
         raise HTTPException(status_code=404, detail=f"Turtle '{name}' not found")
     
-    return turtle_data
\ No newline at end of file
+    return json_response(request, ("turtles", name.lower()), Turtle, turtle_data, response.headers, fields=projection)
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, Response
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import List, Optional
 from api.models import Villain
-from api.convex_client import convex_client
+from api.async_convex_client import async_convex_client
+from api.response_cache import json_response, not_modified, parse_fields
 
 router = APIRouter()
 
@@ -12,33 +13,48 @@ CACHE_HEADERS = {
     "Vercel-CDN-Cache-Control": "max-age=3600"
 }
 
+# Sparse fieldsets: ?fields=name,threat_level
+FIELDS = Query(None, description="Comma-separated fields to return, e.g. name,threat_level")
+
 
 @router.get("/villains", response_model=List[Villain])
-async def get_all_villains(response: Response):
+async def get_all_villains(request: Request, response: Response, fields: Optional[str] = FIELDS):
     """Get all TMNT villains from Convex"""
+    projection = parse_fields(fields, Villain)
     # Set cache headers
     for key, value in CACHE_HEADERS.items():
         response.headers[key] = value
     
+    # Revalidation of an unchanged body skips Convex entirely
+    cached = not_modified(request, ("villains",), response.headers, fields=projection)
+    if cached:
+        return cached
+    
     # Get data from Convex
-    villains_data = convex_client.get_villains()
+    villains_data = await async_convex_client.get_villains()
     if not villains_data:
         raise HTTPException(status_code=500, detail="Failed to load villain data")
     
-    return villains_data
+    # Serialized once per data version
+    return json_response(request, ("villains",), List[Villain], villains_data, response.headers, fields=projection)
 
 
 @router.get("/villains/{name}", response_model=Villain)
-async def get_villain_by_name(name: str, response: Response):
+async def get_villain_by_name(name: str, request: Request, response: Response, fields: Optional[str] = FIELDS):
     """Get a specific villain by name from Convex"""
+    projection = parse_fields(fields, Villain)
     # Set cache headers
     for key, value in CACHE_HEADERS.items():
         response.headers[key] = value
     
-    # Get data from Convex
     villain_name = name.lower().replace(" ", "_")
-    villain_data = convex_client.get_villain(villain_name)
+    cached = not_modified(request, ("villains", villain_name), response.headers, fields=projection)
+    if cached:
+        return cached
+    
+    # Get data from Convex
+    villain_data = await async_convex_client.get_villain(villain_name)
     if not villain_data:
         raise HTTPException(status_code=404, detail=f"Villain '{name}' not found")
     
-    return villain_data
\ No newline at end of file
+    return json_response(request, ("villains", villain_name), Villain, villain_data, response.headers, fields=projection)
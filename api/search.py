@@ -0,0 +1,237 @@
+"""
+Full-text search
+An in-memory inverted index over turtles, villains, episodes and quotes,
+built once per data version. Results are ranked with BM25; "quoted phrases"
+must match as consecutive words and a trailing * matches any word with that
+prefix (e.g. shred*).
+"""
+import asyncio
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from api.async_convex_client import async_convex_client
+from api.versioned import PerVersion
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Gap inserted between fields so phrases don't match across them
+FIELD_GAP = 100
+
+# Searchable text of each collection: (field, weight, extractor)
+FieldSpec = Tuple[str, float, Callable[[Dict[str, Any]], Iterable[str]]]
+
+
+def _value(name: str) -> Callable[[Dict[str, Any]], Iterable[str]]:
+    def extract(record: Dict[str, Any]) -> Iterable[str]:
+        value = record.get(name)
+        if isinstance(value, (list, tuple)):
+            return [str(v) for v in value]
+        return [str(value)] if value else []
+    return extract
+
+
+def _cast_names(record: Dict[str, Any]) -> Iterable[str]:
+    return [
+        f"{member.get('character_name', '')} {member.get('voice_actor', '')}"
+        for member in record.get("cast") or []
+    ]
+
+
+SEARCH_FIELDS: Dict[str, Sequence[FieldSpec]] = {
+    "turtles": (
+        ("name", 3.0, _value("name")),
+        ("full_name", 3.0, _value("full_name")),
+        ("personality", 1.0, _value("personality")),
+        ("catchphrase", 1.0, _value("catchphrase")),
+    ),
+    "villains": (
+        ("name", 3.0, _value("name")),
+        ("real_name", 2.0, _value("real_name")),
+        ("description", 1.0, _value("description")),
+        ("abilities", 1.0, _value("abilities")),
+    ),
+    "episodes": (
+        ("title", 3.0, _value("title")),
+        ("synopsis", 1.0, _value("synopsis")),
+        ("notes", 1.0, _value("notes")),
+        ("writer", 1.0, _value("writer")),
+        ("cast", 1.0, _cast_names),
+    ),
+    "quotes": (
+        ("text", 2.0, _value("text")),
+        ("character", 1.0, _value("character")),
+    ),
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _stem(token: str) -> str:
+    """Very light plural folding so "turtle" finds "Turtles" """
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case words with possessives dropped and plurals folded"""
+    return [_stem(token) for token in _TOKEN.findall(text.lower().replace("'s", ""))]
+
+
+class ParsedQuery:
+    """Terms, phrases and prefixes of a search string"""
+
+    def __init__(self, q: str):
+        self.phrases: List[List[str]] = []
+        self.terms: List[str] = []
+        self.prefixes: List[str] = []
+
+        for phrase in re.findall(r'"([^"]+)"', q):
+            tokens = tokenize(phrase)
+            if len(tokens) > 1:
+                self.phrases.append(tokens)
+            self.terms.extend(tokens)
+
+        for word in re.sub(r'"[^"]*"', " ", q).split():
+            if word.endswith("*"):
+                self.prefixes.extend(_TOKEN.findall(word.lower()))
+            else:
+                self.terms.extend(tokenize(word))
+
+    def __bool__(self) -> bool:
+        return bool(self.terms or self.prefixes)
+
+
+class InvertedIndex:
+    """BM25 index over one collection, with term positions for phrase matching"""
+
+    def __init__(self, records: Sequence[Dict[str, Any]], fields: Sequence[FieldSpec]):
+        self.records = list(records)
+        # term -> {doc: weighted term frequency}
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        # term -> {doc: positions}
+        self.positions: Dict[str, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self.lengths: List[float] = []
+
+        for doc, record in enumerate(self.records):
+            position = 0
+            length = 0.0
+            for _, weight, extract in fields:
+                for text in extract(record):
+                    for token in tokenize(text):
+                        self.postings[token][doc] = self.postings[token].get(doc, 0.0) + weight
+                        self.positions[token][doc].append(position)
+                        position += 1
+                        length += weight
+                    position += FIELD_GAP
+            self.lengths.append(length)
+
+        self.postings = dict(self.postings)
+        self.positions = {term: dict(docs) for term, docs in self.positions.items()}
+        self.vocabulary = sorted(self.postings)
+        avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        # BM25 length normalization per document, fixed once the index is built
+        self.norms = [K1 * (1 - B + B * length / avg_length) if avg_length else K1 for length in self.lengths]
+        self.idf = {term: self._idf(term) for term in self.vocabulary}
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """Every indexed term starting with prefix"""
+        start = bisect_left(self.vocabulary, prefix)
+        terms = []
+        for term in self.vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _idf(self, term: str) -> float:
+        n = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.records) - n + 0.5) / (n + 0.5))
+
+    def _has_phrase(self, doc: int, phrase: List[str]) -> bool:
+        starts = self.positions.get(phrase[0], {}).get(doc)
+        if not starts:
+            return False
+        following = [set(self.positions.get(term, {}).get(doc, ())) for term in phrase[1:]]
+        return any(
+            all(start + offset in positions for offset, positions in enumerate(following, 1))
+            for start in starts
+        )
+
+    def search(self, query: ParsedQuery) -> List[Tuple[float, int]]:
+        """(score, doc) pairs for matching documents, best first"""
+        terms = set(query.terms)
+        for prefix in query.prefixes:
+            terms.update(self.expand_prefix(prefix))
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term in terms:
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf[term]
+            norms = self.norms
+            for doc, tf in docs.items():
+                scores[doc] += idf * tf * (K1 + 1) / (tf + norms[doc])
+
+        if query.phrases:
+            scores = {
+                doc: score for doc, score in scores.items()
+                if all(self._has_phrase(doc, phrase) for phrase in query.phrases)
+            }
+        return sorted(((score, doc) for doc, score in scores.items()), key=lambda hit: (-hit[0], hit[1]))
+
+
+class SearchIndex:
+    """One InvertedIndex per collection, built from a single data version"""
+
+    def __init__(self, collections: Dict[str, Sequence[Dict[str, Any]]]):
+        self.indexes = {
+            name: InvertedIndex(collections.get(name, ()), fields)
+            for name, fields in SEARCH_FIELDS.items()
+        }
+
+    def search(
+        self,
+        q: str,
+        types: Optional[Sequence[str]] = None,
+        limit: int = 10,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Ranked hits per collection, each paginated with limit/offset"""
+        query = ParsedQuery(q)
+        results: Dict[str, Any] = {"query": q, "limit": limit, "offset": offset, "totals": {}}
+        for name, index in self.indexes.items():
+            hits = index.search(query) if query and (not types or name in types) else []
+            results["totals"][name] = len(hits)
+            results[name] = [
+                {"score": round(score, 4), "item": index.records[doc]}
+                for score, doc in hits[offset:offset + limit]
+            ]
+        return results
+
+
+async def _build_index() -> SearchIndex:
+    turtles, villains, episodes, quotes = await asyncio.gather(
+        async_convex_client.get_turtles(),
+        async_convex_client.get_villains(),
+        async_convex_client.get_collection("episodes"),
+        async_convex_client.get_quotes(),
+    )
+    return SearchIndex({"turtles": turtles, "villains": villains, "episodes": episodes, "quotes": quotes})
+
+
+# Global instance
+search_index = PerVersion(_build_index)
+
+
+async def get_search_index() -> SearchIndex:
+    """The index for the current data version, building it if the data changed"""
+    return await search_index.get()
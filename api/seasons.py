@@ -0,0 +1,82 @@
+"""
+Season aggregates
+Per-season statistics (episode count, air date range, writers, directors,
+villain appearances and the most frequent cast) computed from the episode
+list once per data version and then served from memory.
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from api.async_convex_client import async_convex_client
+from api.ingest import TrustedRecord, from_model
+from api.models import Season
+from api.versioned import PerVersion
+
+# Cast members listed per season
+TOP_CAST = 10
+
+
+def _season_info() -> Mapping[int, Dict[str, Any]]:
+    """Year and description per season, if the season modules are deployed"""
+    try:
+        from api.data.episodes import SEASON_INFO
+    except ImportError:
+        return {}
+    return SEASON_INFO
+
+
+def _most_common(counter: Counter) -> List[tuple]:
+    """(key, count) pairs, most frequent first, ties in key order"""
+    return sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+
+
+def summarize(season: int, episodes: List[Dict[str, Any]], info: Optional[Dict[str, Any]] = None) -> TrustedRecord:
+    """Aggregate one season's episodes into a Season record"""
+    info = info or {}
+    air_dates = sorted(e["air_date"] for e in episodes if e.get("air_date"))
+    # Appearances count once per episode
+    villains: Counter = Counter()
+    cast: Counter = Counter()
+    for e in episodes:
+        villains.update(set(e.get("villains_featured") or ()))
+        cast.update({(m["character_name"], m["voice_actor"]) for m in e.get("cast") or ()})
+    return from_model(Season(
+        season=season,
+        year=info.get("year"),
+        description=info.get("description"),
+        episode_count=len(episodes),
+        first_air_date=air_dates[0] if air_dates else None,
+        last_air_date=air_dates[-1] if air_dates else None,
+        writers=sorted({e["writer"] for e in episodes if e.get("writer")}),
+        directors=sorted({e["director"] for e in episodes if e.get("director")}),
+        villains=[{"name": name, "episodes": count} for name, count in _most_common(villains)],
+        top_cast=[
+            {"character_name": character, "voice_actor": actor, "episodes": count}
+            for (character, actor), count in _most_common(cast)[:TOP_CAST]
+        ],
+    ))
+
+
+class SeasonStats:
+    """Every season's aggregates, computed from a single data version"""
+
+    def __init__(self, episodes: Iterable[Dict[str, Any]]):
+        info = _season_info()
+        by_season: Dict[int, List[Dict[str, Any]]] = {season: [] for season in info}
+        for episode in episodes:
+            by_season.setdefault(episode["season"], []).append(episode)
+        self.seasons = [summarize(season, by_season[season], info.get(season)) for season in sorted(by_season)]
+        self.by_number = {record["season"]: record for record in self.seasons}
+
+
+async def _build_stats() -> SeasonStats:
+    return SeasonStats(await async_convex_client.get_collection("episodes"))
+
+
+# Global instance
+season_stats = PerVersion(_build_stats)
+
+
+async def get_season_stats() -> SeasonStats:
+    """The aggregates for the current data version, recomputing them if the data changed"""
+    return await season_stats.get()
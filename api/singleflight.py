@@ -0,0 +1,70 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight call and all
+receive its result (or its exception), so a burst of identical cache misses
+sends one query to Convex instead of one per request.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe call coalescing keyed by any hashable value"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        # Calls that actually ran
+        self.executions = 0
+        # Calls that waited for another caller's result instead of running
+        self.collapsed = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run fn() for key, or wait for the identical call already in flight
+        (raising TimeoutError if it doesn't finish within timeout seconds)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.collapsed += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(None if timeout is None else max(timeout, 0)):
+                raise TimeoutError("Timed out waiting for an in-flight call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get coalescing counters"""
+        total = self.executions + self.collapsed
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+            "collapse_rate": round(self.collapsed / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,69 @@
+"""
+Per-version derived data
+Values computed from the data (the search index, season aggregates) are
+built once per data version and served from memory until it changes, or
+until the version itself can no longer be trusted without re-querying.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Generic, Optional, Tuple, TypeVar
+
+from api.convex_client import convex_client
+from api.fallback import record_fallback, track_fallbacks
+
+T = TypeVar("T")
+
+
+class PerVersion(Generic[T]):
+    """Holds the value build() returns, rebuilding it when the data version changes"""
+
+    def __init__(self, build: Callable[[], Awaitable[T]], collection: str = "episodes"):
+        """collection: whose cache TTL bounds how long a version is trusted"""
+        self.build = build
+        self.collection = collection
+        self._value: Optional[T] = None
+        self._version: Optional[str] = None
+        self._expires_at: Optional[float] = None
+        # The build in progress, shared by every caller waiting for it
+        self._building: Optional[asyncio.Future] = None
+        self.builds = 0
+
+    def is_fresh(self) -> bool:
+        """Whether the held value was built from the current data version"""
+        return (
+            self._value is not None
+            and self._version == convex_client.data_version
+            and (self._expires_at is None or self._expires_at > time.monotonic())
+        )
+
+    async def _rebuild(self) -> Tuple[T, bool]:
+        """Build the value; returns it and whether any of it came from local fallback data"""
+        try:
+            with track_fallbacks() as fallbacks:
+                value = await self.build()
+                # Stamp with the version read after loading, so loading itself can't leave it
+                # stale - and with the local version if loading fell back to local data
+                version = convex_client.served_version
+            ttl = convex_client.version_ttl(self.collection)
+            self._value, self._version = value, version
+            self._expires_at = time.monotonic() + ttl if ttl is not None else None
+            self.builds += 1
+            return value, bool(fallbacks)
+        finally:
+            if self._building is asyncio.current_task():
+                self._building = None
+
+    async def get(self) -> T:
+        """The value for the current data version, building it if the data changed"""
+        if self.is_fresh():
+            return self._value
+        # Concurrent callers share one build instead of each running their own
+        building = self._building
+        if building is None or building.get_loop() is not asyncio.get_running_loop():
+            building = self._building = asyncio.ensure_future(self._rebuild())
+        # Shielded, so one cancelled request doesn't cancel the build the others wait on
+        value, fell_back = await asyncio.shield(building)
+        if fell_back:
+            # So the caller doesn't cache its response under Convex's version either
+            record_fallback(self.build.__name__)
+        return value
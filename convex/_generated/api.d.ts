@@ -13,9 +13,11 @@ import type {
   FilterApi,
   FunctionReference,
 } from "convex/server";
+import type * as bulk from "../bulk.js";
 import type * as episodes from "../episodes.js";
 import type * as mutations from "../mutations.js";
 import type * as quotes from "../quotes.js";
+import type * as sync from "../sync.js";
 import type * as turtles from "../turtles.js";
 import type * as villains from "../villains.js";
 import type * as weapons from "../weapons.js";
@@ -29,9 +31,11 @@ import type * as weapons from "../weapons.js";
  * ```
  */
 declare const fullApi: ApiFromModules<{
+  bulk: typeof bulk;
   episodes: typeof episodes;
   mutations: typeof mutations;
   quotes: typeof quotes;
+  sync: typeof sync;
   turtles: typeof turtles;
   villains: typeof villains;
   weapons: typeof weapons;
@@ -0,0 +1,179 @@
+import { mutation } from "./_generated/server";
+import { v } from "convex/values";
+
+// Batch mutations used by the Python loaders (scripts/bulk_load.py and
+// scripts/sync_convex.py).
+// Each takes an array of records and upserts them on their natural key,
+// so a batch can be retried safely.
+
+const castMember = v.object({
+  character_name: v.string(),
+  voice_actor: v.string(),
+  role: v.string(),
+});
+
+const turtleFields = {
+  name: v.string(),
+  full_name: v.string(),
+  color: v.string(),
+  weapon: v.string(),
+  personality: v.string(),
+  favorite_pizza: v.string(),
+  catchphrase: v.string(),
+  image_url: v.string(),
+  content_hash: v.optional(v.string()),
+};
+
+const villainFields = {
+  name: v.string(),
+  real_name: v.optional(v.string()),
+  description: v.string(),
+  abilities: v.array(v.string()),
+  first_appearance: v.string(),
+  threat_level: v.string(),
+  image_url: v.string(),
+  content_hash: v.optional(v.string()),
+};
+
+const episodeFields = {
+  episode_id: v.number(),
+  title: v.string(),
+  season: v.number(),
+  episode_number: v.number(),
+  air_date: v.string(),
+  synopsis: v.string(),
+  villains_featured: v.optional(v.array(v.string())),
+  cast: v.optional(v.array(castMember)),
+  writer: v.optional(v.string()),
+  director: v.optional(v.string()),
+  notes: v.optional(v.string()),
+  content_hash: v.optional(v.string()),
+};
+
+const quoteFields = {
+  text: v.string(),
+  character: v.string(),
+  episode: v.optional(v.string()),
+  context: v.optional(v.string()),
+  content_hash: v.optional(v.string()),
+};
+
+const weaponFields = {
+  name: v.string(),
+  type: v.string(),
+  wielder: v.string(),
+  description: v.string(),
+  special_moves: v.array(v.string()),
+  content_hash: v.optional(v.string()),
+};
+
+// Insert or replace each record, matching existing rows on `key` via `index`.
+// Replacing (rather than patching) drops fields removed from the source data;
+// `keep` lists server-maintained fields to carry over from the existing row.
+async function upsertMany(ctx, table, index, key, records, { onInsert, keep = [] } = {}) {
+  let inserted = 0;
+  let updated = 0;
+
+  for (const record of records) {
+    const existing = await ctx.db
+      .query(table)
+      .withIndex(index, (q) => q.eq(key, record[key]))
+      .first();
+
+    if (existing) {
+      const kept = {};
+      for (const field of keep) {
+        if (existing[field] !== undefined) kept[field] = existing[field];
+      }
+      await ctx.db.replace(existing._id, { ...record, ...kept });
+      updated++;
+    } else {
+      await ctx.db.insert(table, onInsert ? await onInsert(record) : record);
+      inserted++;
+    }
+  }
+
+  return { inserted, updated };
+}
+
+export const upsertTurtles = mutation({
+  args: { records: v.array(v.object(turtleFields)) },
+  handler: async (ctx, args) =>
+    upsertMany(ctx, "turtles", "by_name", "name", args.records),
+});
+
+export const upsertVillains = mutation({
+  args: { records: v.array(v.object(villainFields)) },
+  handler: async (ctx, args) =>
+    upsertMany(ctx, "villains", "by_name", "name", args.records),
+});
+
+export const upsertEpisodes = mutation({
+  args: { records: v.array(v.object(episodeFields)) },
+  handler: async (ctx, args) =>
+    upsertMany(ctx, "episodes", "by_episode_id", "episode_id", args.records),
+});
+
+export const upsertWeapons = mutation({
+  args: { records: v.array(v.object(weaponFields)) },
+  handler: async (ctx, args) =>
+    upsertMany(ctx, "weapons", "by_name", "name", args.records),
+});
+
+export const upsertQuotes = mutation({
+  args: { records: v.array(v.object(quoteFields)) },
+  handler: async (ctx, args) => {
+    // New quotes get the next ordinal so random picks stay O(1)
+    const counter = await ctx.db
+      .query("counters")
+      .withIndex("by_name", (q) => q.eq("name", "quotes"))
+      .first();
+    let count = counter ? counter.value : 0;
+
+    const result = await upsertMany(ctx, "quotes", "by_text", "text", args.records, {
+      onInsert: (record) => ({ ...record, ordinal: count++ }),
+      keep: ["ordinal"],
+    });
+
+    if (counter) {
+      await ctx.db.patch(counter._id, { value: count });
+    } else {
+      await ctx.db.insert("counters", { name: "quotes", value: count });
+    }
+    return result;
+  },
+});
+
+// Patch cast and production fields on existing episodes
+export const patchEpisodes = mutation({
+  args: {
+    records: v.array(v.object({
+      episode_id: v.number(),
+      cast: v.optional(v.array(castMember)),
+      writer: v.optional(v.string()),
+      director: v.optional(v.string()),
+      notes: v.optional(v.string()),
+      villains_featured: v.optional(v.array(v.string())),
+    })),
+  },
+  handler: async (ctx, args) => {
+    let updated = 0;
+    const missing = [];
+
+    for (const { episode_id, ...updates } of args.records) {
+      const episode = await ctx.db
+        .query("episodes")
+        .withIndex("by_episode_id", (q) => q.eq("episode_id", episode_id))
+        .first();
+
+      if (episode) {
+        await ctx.db.patch(episode._id, updates);
+        updated++;
+      } else {
+        missing.push(episode_id);
+      }
+    }
+
+    return { updated, missing };
+  },
+});
@@ -1,7 +1,26 @@
 import { query, mutation } from "./_generated/server";
+import { paginationOptsValidator } from "convex/server";
 import { v } from "convex/values";
 
-// Get episodes with optional filtering and pagination
+// Episodes in listing order: by episode_id, or by episode number within a
+// season. Shared by getAll and paginate so both return the same order.
+// `after` starts the unfiltered listing past that episode_id.
+function orderedEpisodes(ctx, season, after) {
+  if (season !== undefined) {
+    return ctx.db
+      .query("episodes")
+      .withIndex("by_season_and_number", (q) => q.eq("season", season));
+  }
+  if (after !== undefined) {
+    return ctx.db
+      .query("episodes")
+      .withIndex("by_episode_id", (q) => q.gt("episode_id", after));
+  }
+  return ctx.db.query("episodes").withIndex("by_episode_id");
+}
+
+// Get episodes with optional filtering and offset/limit pagination
+// (compatibility path - prefer `paginate`)
 export const getAll = query({
   args: {
     season: v.optional(v.number()),
@@ -12,20 +31,28 @@ export const getAll = query({
     const limit = args.limit || 10;
     const offset = args.offset || 0;
     
-    let episodesQuery = ctx.db.query("episodes");
+    const episodesQuery = orderedEpisodes(ctx, args.season);
     
-    // Filter by season if provided
-    if (args.season !== undefined) {
-      episodesQuery = episodesQuery.withIndex("by_season", (q) => 
-        q.eq("season", args.season)
-      );
-    }
+    // Read only as far as the requested page instead of the whole table
+    const episodes = await episodesQuery.take(offset + limit);
     
-    // Get all episodes and apply pagination
-    const allEpisodes = await episodesQuery.collect();
-    const paginatedEpisodes = allEpisodes.slice(offset, offset + limit);
+    return episodes.slice(offset);
+  },
+});
+
+// Get one page of episodes with cursor pagination, in the same order as getAll.
+// Pass `after` (an episode_id) to resume a full listing past a known episode.
+export const paginate = query({
+  args: {
+    season: v.optional(v.number()),
+    after: v.optional(v.number()),
+    paginationOpts: paginationOptsValidator,
+  },
+  handler: async (ctx, args) => {
+    const episodesQuery = orderedEpisodes(ctx, args.season, args.after);
     
-    return paginatedEpisodes;
+    // Returns { page, isDone, continueCursor }
+    return await episodesQuery.paginate(args.paginationOpts);
   },
 });
 
@@ -46,6 +73,21 @@ export const getById = query({
   },
 });
 
+// Get several episodes in one round trip, in request order (null for missing ids)
+export const getByIds = query({
+  args: { episode_ids: v.array(v.number()) },
+  handler: async (ctx, args) => {
+    return await Promise.all(
+      args.episode_ids.map((episode_id) =>
+        ctx.db
+          .query("episodes")
+          .withIndex("by_episode_id", (q) => q.eq("episode_id", episode_id))
+          .first()
+      )
+    );
+  },
+});
+
 // Add a new episode
 export const addEpisode = mutation({
   args: {
@@ -62,13 +62,27 @@ export const createQuote = mutation({
   },
   handler: async (ctx, args) => {
     // Convert null to undefined for optional fields
+    // Give the quote the next ordinal and bump the cached count
+    const counter = await ctx.db
+      .query("counters")
+      .withIndex("by_name", (q) => q.eq("name", "quotes"))
+      .first();
+    const ordinal = counter ? counter.value : 0;
+    
     const quoteData = {
       text: args.text,
       character: args.character,
       episode: args.episode || undefined,
       context: args.context || undefined,
+      ordinal,
     };
     const quoteId = await ctx.db.insert("quotes", quoteData);
+    
+    if (counter) {
+      await ctx.db.patch(counter._id, { value: ordinal + 1 });
+    } else {
+      await ctx.db.insert("counters", { name: "quotes", value: 1 });
+    }
     return quoteId;
   },
 });
@@ -92,7 +106,7 @@ export const createWeapon = mutation({
 export const clearAllData = mutation({
   handler: async (ctx) => {
     // Delete all records from each table
-    const tables = ["turtles", "villains", "episodes", "quotes", "weapons"];
+    const tables = ["turtles", "villains", "episodes", "quotes", "weapons", "counters"];
     
     for (const table of tables) {
       const records = await ctx.db.query(table).collect();
@@ -1,4 +1,4 @@
-import { query } from "./_generated/server";
+import { query, mutation } from "./_generated/server";
 import { v } from "convex/values";
 
 // Get all quotes
@@ -18,21 +18,57 @@ export const getAll = query({
   },
 });
 
-// Get a random quote
+// Get a random quote with a counter read plus one indexed point read
 export const getRandom = query({
   args: {
     seed: v.optional(v.number()),
   },
   handler: async (ctx, args) => {
-    const quotes = await ctx.db.query("quotes").collect();
+    const counter = await ctx.db
+      .query("counters")
+      .withIndex("by_name", (q) => q.eq("name", "quotes"))
+      .first();
     
-    if (quotes.length === 0) {
+    if (!counter || counter.value === 0) {
       throw new Error("No quotes available");
     }
     
     // Use seed if provided, otherwise use random
     const seed = args.seed || Math.floor(Math.random() * 10000);
-    const randomIndex = seed % quotes.length;
-    return quotes[randomIndex];
+    const ordinal = seed % counter.value;
+    
+    // Take the first quote at or after the ordinal so gaps left by
+    // deletes still resolve, wrapping around to the start
+    const quote = await ctx.db
+      .query("quotes")
+      .withIndex("by_ordinal", (q) => q.gte("ordinal", ordinal))
+      .first();
+    
+    return quote ?? await ctx.db.query("quotes").withIndex("by_ordinal").first();
+  },
+});
+
+// Number existing quotes and reset the quote counter
+// (run once after deploying, or after bulk changes to the quotes table)
+export const backfillOrdinals = mutation({
+  handler: async (ctx) => {
+    const quotes = await ctx.db.query("quotes").collect();
+    
+    for (let i = 0; i < quotes.length; i++) {
+      await ctx.db.patch(quotes[i]._id, { ordinal: i });
+    }
+    
+    const counter = await ctx.db
+      .query("counters")
+      .withIndex("by_name", (q) => q.eq("name", "quotes"))
+      .first();
+    
+    if (counter) {
+      await ctx.db.patch(counter._id, { value: quotes.length });
+    } else {
+      await ctx.db.insert("counters", { name: "quotes", value: quotes.length });
+    }
+    
+    return { count: quotes.length };
   },
-});
\ No newline at end of file
+});
@@ -11,6 +11,8 @@ export default defineSchema({
     favorite_pizza: v.string(),
     catchphrase: v.string(),
     image_url: v.string(),
+    // Hash of the record contents, maintained by scripts/sync_convex.py
+    content_hash: v.optional(v.string()),
   }).index("by_name", ["name"]),
 
   villains: defineTable({
@@ -21,6 +23,7 @@ export default defineSchema({
     first_appearance: v.string(),
     threat_level: v.string(),
     image_url: v.string(),
+    content_hash: v.optional(v.string()),
   }).index("by_name", ["name"]),
 
   episodes: defineTable({
@@ -39,16 +42,24 @@ export default defineSchema({
     writer: v.optional(v.string()),
     director: v.optional(v.string()),
     notes: v.optional(v.string()),
+    content_hash: v.optional(v.string()),
   })
     .index("by_episode_id", ["episode_id"])
-    .index("by_season", ["season"]),
+    .index("by_season", ["season"])
+    .index("by_season_and_number", ["season", "episode_number"]),
 
   quotes: defineTable({
     text: v.string(),
     character: v.string(),
     episode: v.optional(v.string()),
     context: v.optional(v.string()),
-  }).index("by_character", ["character"]),
+    // Dense 0-based position used for O(1) random picks
+    ordinal: v.optional(v.number()),
+    content_hash: v.optional(v.string()),
+  })
+    .index("by_character", ["character"])
+    .index("by_text", ["text"])
+    .index("by_ordinal", ["ordinal"]),
 
   weapons: defineTable({
     name: v.string(),
@@ -56,5 +67,14 @@ export default defineSchema({
     wielder: v.string(),
     description: v.string(),
     special_moves: v.array(v.string()),
-  }).index("by_wielder", ["wielder"]),
+    content_hash: v.optional(v.string()),
+  })
+    .index("by_wielder", ["wielder"])
+    .index("by_name", ["name"]),
+
+  // Cached row counts, e.g. { name: "quotes", value: 8 }
+  counters: defineTable({
+    name: v.string(),
+    value: v.number(),
+  }).index("by_name", ["name"]),
 });
\ No newline at end of file
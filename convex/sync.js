@@ -0,0 +1,58 @@
+import { query, mutation } from "./_generated/server";
+import { v } from "convex/values";
+
+// Helpers for scripts/sync_convex.py, which diffs api/data against Convex
+// and only writes what changed.
+
+const syncedTable = v.union(
+  v.literal("turtles"),
+  v.literal("villains"),
+  v.literal("episodes"),
+  v.literal("quotes"),
+  v.literal("weapons"),
+);
+
+// Natural key of each synced table
+const KEYS = {
+  turtles: "name",
+  villains: "name",
+  episodes: "episode_id",
+  quotes: "text",
+  weapons: "name",
+};
+
+// Get the natural key and content hash of every record in a table
+export const getHashes = query({
+  args: { table: syncedTable },
+  handler: async (ctx, args) => {
+    const key = KEYS[args.table];
+    const records = await ctx.db.query(args.table).collect();
+
+    return records.map((record) => ({
+      id: record._id,
+      key: record[key],
+      hash: record.content_hash ?? null,
+    }));
+  },
+});
+
+// Delete records that no longer exist in the source data
+export const deleteRecords = mutation({
+  args: {
+    table: syncedTable,
+    records: v.array(v.string()),
+  },
+  handler: async (ctx, args) => {
+    let deleted = 0;
+
+    for (const id of args.records) {
+      const documentId = ctx.db.normalizeId(args.table, id);
+      if (documentId) {
+        await ctx.db.delete(documentId);
+        deleted++;
+      }
+    }
+
+    return { deleted };
+  },
+});
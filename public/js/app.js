@@ -403,11 +403,14 @@ document.addEventListener('DOMContentLoaded', () => {
 // Episodes page functionality
 let currentView = 'table'; // Default view
 
+const EPISODE_LIST_FIELDS = 'id,title,season,episode_number,air_date,synopsis,villains_featured';
+
 async function loadEpisodes(season = null, offset = 0) {
     const container = document.getElementById('episodesContainer');
     if (!container) return;
 
-    let endpoint = `/episodes?limit=${itemsPerPage}&offset=${offset}`;
+    // List views don't show cast or production credits - fetch only what they render
+    let endpoint = `/episodes?limit=${itemsPerPage}&offset=${offset}&fields=${EPISODE_LIST_FIELDS}`;
     if (season) {
         endpoint += `&season=${season}`;
     }
@@ -13,6 +13,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from convex import ConvexClient
 from dotenv import load_dotenv
+from scripts.bulk_load import add_loader_arguments, loader_from_args, episode_records
 
 # Import all episodes from the organized season files
 from api.data.episodes import ALL_EPISODES, SEASON_INFO, get_total_episode_count
@@ -66,8 +67,8 @@ export const addEpisode = mutation({
     print("\nTo enable adding episodes, add this mutation to convex/episodes.js:")
     print(mutation_code)
 
-def add_all_episodes(dry_run=True, episodes_to_process=None):
-    """Add all TMNT episodes to the database"""
+def add_all_episodes(dry_run=True, episodes_to_process=None, loader_args=None):
+    """Add all TMNT episodes to the database in batched upserts"""
     # Get Convex URL from environment
     convex_url = os.getenv('CONVEX_URL')
     if not convex_url:
@@ -78,6 +79,7 @@ def add_all_episodes(dry_run=True, episodes_to_process=None):
     
     # Connect to Convex
     client = ConvexClient(convex_url)
+    loader = loader_from_args(client, loader_args)
     
     # Use provided episodes or default to ALL_EPISODES
     episodes = episodes_to_process if episodes_to_process is not None else ALL_EPISODES
@@ -85,6 +87,7 @@ def add_all_episodes(dry_run=True, episodes_to_process=None):
     print(f"Connected to Convex")
     print(f"Mode: {'DRY RUN' if dry_run else 'LIVE UPDATE'}")
     print(f"Total episodes to process: {len(episodes)}")
+    print(f"Batch size {loader.batch_size}, concurrency {loader.concurrency}, retries {loader.max_retries}")
     print("-" * 60)
     
     # Show season breakdown
@@ -93,72 +96,21 @@ def add_all_episodes(dry_run=True, episodes_to_process=None):
         print(f"  Season {season_num}: {info['episodes']} episodes ({info['year']}) - {info['description']}")
     print("-" * 60)
     
-    # Process each episode
-    success_count = 0
-    error_count = 0
-    skipped_count = 0
-    
     for episode in episodes:
-        try:
-            episode_id = episode['episode_id']
-            print(f"\nProcessing Episode {episode_id}: {episode['title']} (S{episode['season']}E{episode['episode_number']})")
-            
-            if not dry_run:
-                # Check if episode exists
-                try:
-                    existing = client.query("episodes:getById", {"episode_id": episode_id})
-                    if existing:
-                        print(f"  → Episode already exists, skipping")
-                        skipped_count += 1
-                        continue
-                except Exception as e:
-                    # Episode doesn't exist, which is what we want
-                    pass
-                
-                # Add the episode - make sure we're only sending the fields we need
-                episode_data = {
-                    "episode_id": episode["episode_id"],
-                    "title": episode["title"],
-                    "season": episode["season"],
-                    "episode_number": episode["episode_number"],
-                    "air_date": episode["air_date"],
-                    "synopsis": episode["synopsis"]
-                }
-                
-                # Add optional fields if they exist
-                if "cast" in episode and episode["cast"]:
-                    episode_data["cast"] = episode["cast"]
-                if "writer" in episode and episode["writer"]:
-                    episode_data["writer"] = episode["writer"]
-                if "director" in episode and episode["director"]:
-                    episode_data["director"] = episode["director"]
-                if "notes" in episode and episode["notes"]:
-                    episode_data["notes"] = episode["notes"]
-                if "villains_featured" in episode and episode["villains_featured"]:
-                    episode_data["villains_featured"] = episode["villains_featured"]
-                
-                result = client.mutation("episodes:addEpisode", episode_data)
-                print(f"  ✓ Added successfully")
-                success_count += 1
-            else:
-                print(f"  - Would add (dry run)")
-                success_count += 1
-                
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            error_count += 1
+        print(f"  Episode {episode['episode_id']}: {episode['title']} (S{episode['season']}E{episode['episode_number']})")
+    
+    if dry_run:
+        print("\nThis was a DRY RUN. To perform actual updates, run this script with --live flag")
+        return
+    
+    # Upserts make re-runs safe, so no per-episode existence check is needed
+    report = loader.load("bulk:upsertEpisodes", episode_records(episodes), label="episodes")
     
     print("\n" + "=" * 60)
     print(f"Summary:")
-    print(f"  Total episodes: {len(episodes)}")
-    print(f"  Success: {success_count}")
-    print(f"  Errors: {error_count}")
-    print(f"  Skipped: {skipped_count}")
-    
-    if dry_run:
-        print("\nThis was a DRY RUN. To perform actual updates:")
-        print("1. Create the addEpisode mutation in Convex")
-        print("2. Run this script with --live flag")
+    print(report.summary())
+    for error in report.errors:
+        print(f"  ✗ Error: {error}")
 
 if __name__ == "__main__":
     import argparse
@@ -168,6 +120,7 @@ if __name__ == "__main__":
     parser.add_argument('--show-mutation', action='store_true', help='Show the Convex mutation code')
     parser.add_argument('--season', type=int, help='Add episodes from a specific season only')
     parser.add_argument('--list-seasons', action='store_true', help='List all seasons with episode counts')
+    add_loader_arguments(parser)
     
     args = parser.parse_args()
     
@@ -186,8 +139,8 @@ if __name__ == "__main__":
             season_episodes = get_episodes_by_season(args.season)
             if season_episodes:
                 print(f"\nProcessing Season {args.season} only ({len(season_episodes)} episodes)")
-                add_all_episodes(dry_run=not args.live, episodes_to_process=season_episodes)
+                add_all_episodes(dry_run=not args.live, episodes_to_process=season_episodes, loader_args=args)
             else:
                 print(f"Season {args.season} not found!")
         else:
-            add_all_episodes(dry_run=not args.live)
\ No newline at end of file
+            add_all_episodes(dry_run=not args.live, loader_args=args)
\ No newline at end of file
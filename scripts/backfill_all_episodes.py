@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from convex import ConvexClient
 from dotenv import load_dotenv
+from scripts.bulk_load import add_loader_arguments, loader_from_args
 
 # Load environment variables
 load_dotenv()
@@ -333,7 +334,7 @@ export const updateEpisode = mutation({
     print("\nTo enable updates, add this mutation to convex/episodes.js:")
     print(mutation_code)
 
-def backfill_episodes(dry_run=True):
+def backfill_episodes(dry_run=True, loader_args=None):
     """Backfill all episodes with cast and production data"""
     # Use production URL
     convex_url = "https://useful-ptarmigan-757.convex.cloud"
@@ -341,53 +342,43 @@ def backfill_episodes(dry_run=True):
     
     # Connect to Convex
     client = ConvexClient(convex_url)
+    loader = loader_from_args(client, loader_args)
     
     print(f"Connected to Convex")
     print(f"Mode: {'DRY RUN' if dry_run else 'LIVE UPDATE'}")
     print("-" * 60)
     
-    # Process each episode
-    success_count = 0
-    error_count = 0
-    
     for episode_id, data in EPISODE_DATA.items():
-        try:
-            print(f"\nProcessing Episode {episode_id}: {data['title']}")
-            print(f"  Cast members: {len(data['cast'])}")
-            print(f"  Writer: {data.get('writer', 'Unknown')}")
-            print(f"  Director: {data.get('director', 'Unknown')}")
-            print(f"  Villains: {', '.join(data.get('villains_featured', []))}")
-            
-            if not dry_run:
-                # Perform the actual update
-                result = client.mutation("episodes:updateEpisode", {
-                    "episode_id": episode_id,
-                    "cast": data["cast"],
-                    "writer": data.get("writer"),
-                    "director": data.get("director"),
-                    "notes": data.get("notes"),
-                    "villains_featured": data.get("villains_featured", [])
-                })
-                print(f"  ✓ Updated successfully")
-                success_count += 1
-            else:
-                print(f"  - Would update (dry run)")
-                success_count += 1
-                
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            error_count += 1
+        print(f"\nEpisode {episode_id}: {data['title']}")
+        print(f"  Cast members: {len(data['cast'])}")
+        print(f"  Writer: {data.get('writer', 'Unknown')}")
+        print(f"  Director: {data.get('director', 'Unknown')}")
+        print(f"  Villains: {', '.join(data.get('villains_featured', []))}")
+    
+    if dry_run:
+        print("\nThis was a DRY RUN. To perform actual updates, run this script with --live flag")
+        return
+    
+    # Patch every episode through batched bulk:patchEpisodes mutations
+    records = [
+        {
+            "episode_id": episode_id,
+            "cast": data["cast"],
+            "writer": data.get("writer"),
+            "director": data.get("director"),
+            "notes": data.get("notes"),
+            "villains_featured": data.get("villains_featured", []),
+        }
+        for episode_id, data in EPISODE_DATA.items()
+    ]
+    records = [{k: v for k, v in record.items() if v is not None} for record in records]
+    report = loader.load("bulk:patchEpisodes", records, label="episodes")
     
     print("\n" + "=" * 60)
     print(f"Summary:")
-    print(f"  Total episodes: {len(EPISODE_DATA)}")
-    print(f"  Success: {success_count}")
-    print(f"  Errors: {error_count}")
-    
-    if dry_run:
-        print("\nThis was a DRY RUN. To perform actual updates:")
-        print("1. Create the updateEpisode mutation in Convex")
-        print("2. Run this script with --live flag")
+    print(report.summary())
+    for error in report.errors:
+        print(f"  ✗ Error: {error}")
 
 if __name__ == "__main__":
     import argparse
@@ -395,10 +386,11 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Backfill episode data')
     parser.add_argument('--live', action='store_true', help='Perform actual updates (default is dry run)')
     parser.add_argument('--show-mutation', action='store_true', help='Show the Convex mutation code')
+    add_loader_arguments(parser)
     
     args = parser.parse_args()
     
     if args.show_mutation:
         create_update_mutation()
     else:
-        backfill_episodes(dry_run=not args.live)
\ No newline at end of file
+        backfill_episodes(dry_run=not args.live, loader_args=args)
\ No newline at end of file
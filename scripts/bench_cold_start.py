@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark
+Starts a fresh interpreter per run, imports the app and sends one request
+straight to the ASGI app, timing process start to the first body byte.
+Reports the median split into interpreter start, app import and first
+request, and exits with status 1 if the median exceeds --max-ms.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Runs in the child: import the app, then serve one GET until the first body chunk
+CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from api.index import app
+imported = time.perf_counter()
+
+async def first_byte(path):
+    query = path.partition("?")[2].encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path.partition("?")[0], "raw_path": path.encode(),
+        "query_string": query, "root_path": "", "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 1), "server": ("localhost", 80),
+    }
+    done = asyncio.Event()
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+        elif message["type"] == "http.response.body" and not done.is_set():
+            done.set()
+
+    task = asyncio.ensure_future(app(scope, receive, send))
+    await done.wait()
+    await task
+    return status[0]
+
+status = asyncio.run(first_byte(sys.argv[1]))
+served = time.perf_counter()
+print(json.dumps({"status": status, "import_ms": (imported - started) * 1000, "request_ms": (served - imported) * 1000}))
+"""
+
+
+def run_once(path: str) -> dict:
+    """One cold start; returns its timings in milliseconds"""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", CHILD, path], cwd=ROOT, capture_output=True, text=True)
+    total_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        sys.exit(f"Cold start failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["total_ms"] = total_ms
+    timings["interpreter_ms"] = total_ms - timings["import_ms"] - timings["request_ms"]
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold start to first byte")
+    parser.add_argument("--path", default="/api/v1/turtles", help="Request path (default: /api/v1/turtles)")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh processes to start")
+    parser.add_argument("--max-ms", type=float, help="Fail if the median total exceeds this")
+    args = parser.parse_args()
+
+    runs = [run_once(args.path) for _ in range(args.runs)]
+    if any(run["status"] != 200 for run in runs):
+        print(f"Unexpected status: {[run['status'] for run in runs]}")
+        return 1
+
+    print(f"Cold start to first byte for GET {args.path} ({args.runs} runs, median):")
+    for name in ("interpreter_ms", "import_ms", "request_ms", "total_ms"):
+        values = [run[name] for run in runs]
+        print(f"  {name[:-3]:<12} {statistics.median(values):8.1f} ms  (min {min(values):.1f}, max {max(values):.1f})")
+
+    median = statistics.median(run["total_ms"] for run in runs)
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"Median {median:.1f} ms exceeds {args.max_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+JSON serialization benchmark
+Encodes each endpoint's payload (from the local dataset) the ways the API
+can render it and reports time per encode and throughput:
+    stdlib    jsonable_encoder + json.dumps (FastAPI's JSONResponse)
+    orjson    response_model serialization + orjson (the app's default response class)
+    prebuilt  pydantic-core dump_json, used for bodies kept in the response cache
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from api.convex_client import convex_client
+from api.models import Episode, Quote, SearchResults, Turtle, Villain, Weapon
+from api.response_cache import serialize
+from api.search import SearchIndex
+
+
+def payloads() -> Dict[str, Tuple[Any, Any]]:
+    """Endpoint -> (response model, data) as served in fallback mode"""
+    episodes = list(convex_client.iter_collection("episodes"))
+    index = SearchIndex({
+        "turtles": convex_client.get_turtles(),
+        "villains": convex_client.get_villains(),
+        "episodes": episodes,
+        "quotes": convex_client.get_quotes(),
+    })
+    return {
+        "/turtles": (List[Turtle], convex_client.get_turtles()),
+        "/villains": (List[Villain], convex_client.get_villains()),
+        "/weapons": (List[Weapon], convex_client.get_weapons()),
+        "/quotes": (List[Quote], convex_client.get_quotes()),
+        "/episodes?limit=100": (List[Episode], episodes[:100]),
+        "/episodes/{id}": (Episode, episodes[0]),
+        "/search?q=shredder&limit=50": (SearchResults, index.search("shredder", limit=50)),
+    }
+
+
+def encoders(model: Any) -> Dict[str, Callable[[Any], bytes]]:
+    adapter = TypeAdapter(model)
+
+    def stdlib(data: Any) -> bytes:
+        return JSONResponse(jsonable_encoder(adapter.validate_python(data))).body
+
+    def orjson(data: Any) -> bytes:
+        return ORJSONResponse(adapter.dump_python(adapter.validate_python(data), mode="json")).body
+
+    def prebuilt(data: Any) -> bytes:
+        return serialize(model, data)
+
+    return {"stdlib": stdlib, "orjson": orjson, "prebuilt": prebuilt}
+
+
+def timeit(encode: Callable[[Any], bytes], data: Any, seconds: float) -> Tuple[float, int]:
+    """Mean seconds per encode over roughly `seconds` of repeats, and the body size"""
+    size = len(encode(data))
+    runs = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        for _ in range(10):
+            encode(data)
+        runs += 10
+    return (time.perf_counter() - started) / runs, size
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare JSON encoders on each endpoint's payload")
+    parser.add_argument("--seconds", type=float, default=0.5, help="Time spent per endpoint and encoder")
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<30} {'encoder':<9} {'size':>9} {'per encode':>12} {'throughput':>12} {'speedup':>8}")
+    for endpoint, (model, data) in payloads().items():
+        baseline = None
+        for name, encode in encoders(model).items():
+            per_encode, size = timeit(encode, data, args.seconds)
+            baseline = baseline or per_encode
+            print(f"{endpoint:<30} {name:<9} {size / 1024:7.1f}KB {per_encode * 1e6:10.1f}us "
+                  f"{size / per_encode / 1e6:8.1f}MB/s {baseline / per_encode:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
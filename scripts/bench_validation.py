@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Validate-once benchmark
+Requests/sec on the episodes and quotes routes with records trusted from
+ingest (current behavior) versus validated against the response model on
+every build (the previous behavior). The response cache is disabled so
+every request serializes its body, which is what a cache miss - a new data
+version, page, id list or projection - costs.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+import api.response_cache
+from api.index import app
+from api.response_cache import response_cache
+
+ROUTES = (
+    "/api/v1/episodes?limit=100&offset=1",
+    "/api/v1/episodes?limit=100&offset=1&fields=id,title,air_date",
+    "/api/v1/episodes/1",
+    "/api/v1/episodes?ids=1,2,3,4,5,6,7,8,9,10",
+    "/api/v1/quotes",
+    "/api/v1/quotes/random",
+)
+
+
+def requests_per_second(client: TestClient, path: str, seconds: float) -> float:
+    assert client.get(path).status_code == 200
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        client.get(path)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Requests/sec with and without the trusted fast path")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time spent per route and mode")
+    args = parser.parse_args()
+
+    # Identity encoding, so compressing each rebuilt body isn't measured
+    client = TestClient(app, headers={"Accept-Encoding": "identity"})
+    response_cache.max_entries = 0
+    trusted = api.response_cache.is_trusted
+
+    print(f"{'route':<62} {'validated':>10} {'trusted':>10} {'speedup':>8}")
+    for path in ROUTES:
+        api.response_cache.is_trusted = lambda model, data: False
+        validated = requests_per_second(client, path, args.seconds)
+        api.response_cache.is_trusted = trusted
+        fast = requests_per_second(client, path, args.seconds)
+        print(f"{path:<62} {validated:8.0f}/s {fast:8.0f}/s {fast / validated:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
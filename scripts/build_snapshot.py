@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Build the binary catalog snapshot
+Compiles api/data (turtles, villains, weapons, quotes and every season)
+into the memory-mapped file the API loads at startup. Run it before
+deploying and whenever the data modules change; a snapshot that no longer
+matches the data modules is ignored by the server.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from api.data.dataset import dataset_from_modules
+from api.data.snapshot import Snapshot, snapshot_path, write_snapshot
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compile api/data into a binary snapshot")
+    parser.add_argument("--output", type=Path, default=None, help="Snapshot path (default: DATA_SNAPSHOT or api/data/catalog.snapshot)")
+    args = parser.parse_args()
+    output = args.output or snapshot_path()
+
+    started = time.perf_counter()
+    dataset = dataset_from_modules()
+    if not dataset.turtles:
+        print("Data modules not found, nothing to build")
+        return 1
+    size = write_snapshot(dataset, output)
+
+    # Read it back to make sure the file round-trips; the server skips this check
+    snapshot = Snapshot(output, verify=True)
+    counts = {name: info["count"] for name, info in snapshot.collections.items()}
+    print(f"Wrote {output} ({size / 1024:.1f} KiB, data version {snapshot.data_version}) "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+    print("  " + ", ".join(f"{count} {name}" for name, count in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Batched bulk-load pipeline for Convex
+Splits records into chunks, sends them to the bulk:* batch mutations with
+bounded concurrency, retries failed batches with exponential backoff and
+reports throughput. Used by populate_convex.py, add_all_episodes.py and
+backfill_all_episodes.py.
+"""
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+
+@dataclass
+class LoadReport:
+    """Outcome of loading one collection"""
+    label: str
+    records: int = 0
+    batches: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed_records: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Records per second"""
+        return self.records / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        status = "✅" if not self.failed_records else "❌"
+        return (
+            f"  {status} {self.label}: {self.records - self.failed_records}/{self.records} records "
+            f"in {self.batches} batches, {self.seconds:.2f}s "
+            f"({self.throughput:.1f} records/s, {self.retries} retries, "
+            f"{self.inserted} inserted, {self.updated} updated, {self.deleted} deleted)"
+        )
+
+
+def chunked(records: List[Dict[str, Any]], size: int) -> List[List[Dict[str, Any]]]:
+    """Split records into batches of at most size records"""
+    return [records[i:i + size] for i in range(0, len(records), size)]
+
+
+class BulkLoader:
+    def __init__(
+        self,
+        client,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ):
+        """Loader sending batches through a ConvexClient"""
+        self.client = client
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._lock = threading.Lock()
+
+    def _send(self, mutation: str, args: Dict[str, Any], report: LoadReport) -> Any:
+        """Send one batch, retrying with exponential backoff and jitter"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.client.mutation(mutation, args)
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                with self._lock:
+                    report.retries += 1
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def load(
+        self,
+        mutation: str,
+        records: Iterable[Any],
+        label: str = "",
+        extra_args: Optional[Dict[str, Any]] = None,
+    ) -> LoadReport:
+        """
+        Send every record through a batch mutation and report the outcome.
+        Each call gets {"records": batch} plus any extra_args.
+        """
+        records = list(records)
+        batches = chunked(records, self.batch_size)
+        report = LoadReport(label=label or mutation, records=len(records), batches=len(batches))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                executor.submit(self._send, mutation, {**(extra_args or {}), "records": batch}, report): batch
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result() or {}
+                    report.inserted += result.get("inserted", 0)
+                    report.updated += result.get("updated", 0)
+                    report.deleted += result.get("deleted", 0)
+                except Exception as e:
+                    report.failed_records += len(futures[future])
+                    report.errors.append(str(e))
+        report.seconds = time.perf_counter() - start
+        return report
+
+
+def add_loader_arguments(parser) -> None:
+    """Add the shared --batch-size/--concurrency/--retries flags to a script's parser"""
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Records per batch mutation (default {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Batches in flight at once (default {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--retries', type=int, default=DEFAULT_MAX_RETRIES,
+                        help=f'Retries per failed batch (default {DEFAULT_MAX_RETRIES})')
+
+
+def loader_from_args(client, args) -> BulkLoader:
+    """Build a BulkLoader from parsed add_loader_arguments flags (defaults if args is None)"""
+    if args is None:
+        return BulkLoader(client)
+    return BulkLoader(client, batch_size=args.batch_size, concurrency=args.concurrency, max_retries=args.retries)
+
+
+# Record shaping: api/data models -> Convex documents
+
+def _without_none(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop None values (Convex optional fields must be absent, not null)"""
+    return {k: v for k, v in record.items() if v is not None}
+
+
+def turtle_records() -> List[Dict[str, Any]]:
+    from api.data.tmnt_data import TURTLES
+    return [_without_none({**t.model_dump(), "name": name}) for name, t in TURTLES.items()]
+
+
+def villain_records() -> List[Dict[str, Any]]:
+    from api.data.tmnt_data import VILLAINS
+    records = []
+    for name, villain in VILLAINS.items():
+        data = villain.model_dump()
+        # arch_enemy_of is not in the Convex schema
+        data.pop("arch_enemy_of", None)
+        records.append(_without_none({**data, "name": name}))
+    return records
+
+
+EPISODE_FIELDS = (
+    "episode_id", "title", "season", "episode_number", "air_date", "synopsis",
+    "villains_featured", "cast", "writer", "director", "notes",
+)
+
+
+def episode_records(episodes: Iterable[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Season-module episodes (episode_id keyed) in Convex shape; defaults to the full catalog"""
+    if episodes is None:
+        from api.data.episodes import ALL_EPISODES
+        episodes = ALL_EPISODES
+    return [
+        _without_none({k: episode.get(k) for k in EPISODE_FIELDS})
+        for episode in episodes
+    ]
+
+
+def quote_records() -> List[Dict[str, Any]]:
+    from api.data.tmnt_data import QUOTES
+    # id is not in the Convex schema
+    return [_without_none(q.model_dump(exclude={"id"})) for q in QUOTES]
+
+
+def weapon_records() -> List[Dict[str, Any]]:
+    from api.data.tmnt_data import WEAPONS
+    return [w.model_dump() for w in WEAPONS]
@@ -10,86 +10,43 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from convex import ConvexClient
-from api.data.tmnt_data import TURTLES, VILLAINS, EPISODES, QUOTES, WEAPONS
-from typing import Dict, Any
+from scripts.bulk_load import (
+    add_loader_arguments, loader_from_args, turtle_records, villain_records,
+    episode_records, quote_records, weapon_records,
+)
 import argparse
 
 
-def populate_convex(convex_url: str):
-    """Populate Convex with all TMNT data"""
+def populate_convex(convex_url: str, loader_args=None):
+    """Populate Convex with all TMNT data using batched upserts"""
     client = ConvexClient(convex_url)
+    loader = loader_from_args(client, loader_args)
     
     print("🚀 Starting Convex data population...")
     print(f"📡 Connected to: {convex_url}")
+    print(f"📦 Batch size {loader.batch_size}, concurrency {loader.concurrency}, retries {loader.max_retries}")
     
-    # Populate turtles
-    print("\n🐢 Populating turtles...")
-    for name, turtle in TURTLES.items():
-        turtle_data = turtle.model_dump()
-        # Ensure the name field matches the key
-        turtle_data['name'] = name
-        
-        try:
-            client.mutation("mutations:createTurtle", turtle_data)
-            print(f"  ✅ Added turtle: {turtle.full_name}")
-        except Exception as e:
-            print(f"  ❌ Failed to add turtle {name}: {e}")
+    collections = [
+        ("🐢 turtles", "bulk:upsertTurtles", turtle_records),
+        ("👹 villains", "bulk:upsertVillains", villain_records),
+        ("📺 episodes", "bulk:upsertEpisodes", episode_records),
+        ("💬 quotes", "bulk:upsertQuotes", quote_records),
+        ("⚔️ weapons", "bulk:upsertWeapons", weapon_records),
+    ]
     
-    # Populate villains
-    print("\n👹 Populating villains...")
-    for name, villain in VILLAINS.items():
-        villain_data = villain.model_dump()
-        # Ensure the name field matches the key
-        villain_data['name'] = name
-        # Remove arch_enemy_of as it's not in the Convex schema
-        villain_data.pop('arch_enemy_of', None)
-        
-        try:
-            client.mutation("mutations:createVillain", villain_data)
-            print(f"  ✅ Added villain: {villain.name}")
-        except Exception as e:
-            print(f"  ❌ Failed to add villain {name}: {e}")
+    reports = []
+    for label, mutation, records in collections:
+        print(f"\nPopulating {label}...")
+        report = loader.load(mutation, records(), label=label)
+        print(report.summary())
+        for error in report.errors:
+            print(f"    ❌ {error}")
+        reports.append(report)
     
-    # Populate episodes
-    print("\n📺 Populating episodes...")
-    for episode in EPISODES:
-        episode_data = episode.model_dump()
-        # Rename 'id' to 'episode_id' for Convex
-        episode_data['episode_id'] = episode_data.pop('id')
-        # Remove villains_featured as it's not in the Convex schema
-        episode_data.pop('villains_featured', None)
-        
-        try:
-            client.mutation("mutations:createEpisode", episode_data)
-            print(f"  ✅ Added episode: {episode.title}")
-        except Exception as e:
-            print(f"  ❌ Failed to add episode {episode.id}: {e}")
-    
-    # Populate quotes
-    print("\n💬 Populating quotes...")
-    for quote in QUOTES:
-        quote_data = quote.model_dump()
-        # Remove id field as it's not in the Convex schema
-        quote_data.pop('id', None)
-        # Remove None values for optional fields
-        quote_data = {k: v for k, v in quote_data.items() if v is not None}
-        
-        try:
-            client.mutation("mutations:createQuote", quote_data)
-            print(f"  ✅ Added quote from {quote.character}")
-        except Exception as e:
-            print(f"  ❌ Failed to add quote: {e}")
-    
-    # Populate weapons
-    print("\n⚔️ Populating weapons...")
-    for weapon in WEAPONS:
-        try:
-            client.mutation("mutations:createWeapon", weapon.model_dump())
-            print(f"  ✅ Added weapon: {weapon.name}")
-        except Exception as e:
-            print(f"  ❌ Failed to add weapon {weapon.name}: {e}")
-    
-    print("\n✨ Data population complete!")
+    total_records = sum(r.records for r in reports)
+    total_seconds = sum(r.seconds for r in reports)
+    print(f"\n✨ Data population complete! {total_records} records in {total_seconds:.2f}s")
+    return reports
 
 
 def main():
@@ -97,6 +54,7 @@ def main():
     parser.add_argument('--convex-url', type=str, help='Convex deployment URL')
     parser.add_argument('--env-file', type=str, default='.env.local', 
                        help='Path to env file containing CONVEX_URL')
+    add_loader_arguments(parser)
     
     args = parser.parse_args()
     
@@ -118,7 +76,7 @@ def main():
         sys.exit(1)
     
     # Run the function
-    populate_convex(convex_url)
+    populate_convex(convex_url, args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Precompress static files
+Writes brotli (.br) and gzip (.gz) variants next to every compressible file
+in public/, so the API serves them as they are instead of compressing on
+the first request. Run it before deploying; a variant older than its file
+is ignored by the server.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from api.compression import COMPRESSORS, precompress_directory
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write .br/.gz variants of static files")
+    parser.add_argument("--root", type=Path, default=PUBLIC_DIR, help="Directory to precompress (default: public/)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    written = list(precompress_directory(args.root))
+    size = sum(path.stat().st_size for path in written)
+    print(f"Wrote {len(written)} variants ({', '.join(COMPRESSORS)}, {size / 1024:.1f} KiB) under {args.root} "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Startup time budget report
+Imports the app in a fresh interpreter with `python -X importtime` and
+prints where the import time goes: the slowest modules, a per-package
+breakdown and the total, checked against a budget. Exits with status 1
+when the budget is exceeded, so it can gate CI.
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+ROOT = Path(__file__).parent.parent
+
+# Default budget for importing api.index (milliseconds)
+DEFAULT_BUDGET_MS = 1500.0
+
+# Modules that must not be imported at startup (they load on first use)
+DEFERRED_MODULES = ("convex", "api.data.tmnt_data", "api.data.episodes")
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """Parse `-X importtime` output into one timing per module"""
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        # Nesting is shown as two extra spaces of indent per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append(ImportTiming(module, int(self_us), int(cumulative_us), depth))
+    return timings
+
+
+def measure(module: str) -> List[ImportTiming]:
+    """Import module in a fresh interpreter and return its import timings"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def by_package(timings: List[ImportTiming]) -> Dict[str, int]:
+    """Self time per top-level package (api.* modules are kept separate)"""
+    totals: Dict[str, int] = defaultdict(int)
+    for timing in timings:
+        parts = timing.module.split(".")
+        package = ".".join(parts[:2]) if parts[0] == "api" else parts[0]
+        totals[package] += timing.self_us
+    return totals
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report the import-time cost of starting the app")
+    parser.add_argument("--module", default="api.index", help="Module to import (default: api.index)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Fail above this total")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    args = parser.parse_args()
+
+    timings = measure(args.module)
+    total_ms = next(t.cumulative_us for t in timings if t.module == args.module) / 1000
+
+    print(f"Slowest modules (self time) importing {args.module}:")
+    for timing in sorted(timings, key=lambda t: t.self_us, reverse=True)[:args.top]:
+        print(f"  {timing.self_us / 1000:8.1f} ms  {timing.module}")
+
+    print("\nBy package:")
+    packages = sorted(by_package(timings).items(), key=lambda item: item[1], reverse=True)
+    for package, self_us in packages[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+    loaded = {t.module for t in timings}
+    eager = [module for module in DEFERRED_MODULES if module in loaded]
+    if eager:
+        print(f"\nImported at startup but expected on first use: {', '.join(eager)}")
+
+    print(f"\nTotal: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if total_ms > args.budget_ms or eager:
+        print("Startup budget exceeded")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
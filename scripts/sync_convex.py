@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Idempotent diff-based sync from api/data to Convex
+Fetches a content hash per record from Convex, compares it with the local
+data and only upserts records that are new or changed and deletes records
+that were removed. Tables are never emptied, so the API keeps serving data
+throughout, and a re-run with no local changes writes nothing.
+"""
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from convex import ConvexClient
+from scripts.bulk_load import (
+    add_loader_arguments, loader_from_args, turtle_records, villain_records,
+    episode_records, quote_records, weapon_records,
+)
+import argparse
+
+
+@dataclass(frozen=True)
+class SyncedCollection:
+    table: str
+    key: str
+    upsert_mutation: str
+    records: Callable[[], List[Dict[str, Any]]]
+
+
+COLLECTIONS = [
+    SyncedCollection("turtles", "name", "bulk:upsertTurtles", turtle_records),
+    SyncedCollection("villains", "name", "bulk:upsertVillains", villain_records),
+    SyncedCollection("episodes", "episode_id", "bulk:upsertEpisodes", episode_records),
+    SyncedCollection("quotes", "text", "bulk:upsertQuotes", quote_records),
+    SyncedCollection("weapons", "name", "bulk:upsertWeapons", weapon_records),
+]
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Stable hash of a record's contents (key order and content_hash itself ignored)"""
+    payload = {k: v for k, v in record.items() if k != "content_hash"}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+@dataclass
+class SyncPlan:
+    """Changes needed to make one Convex table match the local data"""
+    table: str
+    inserts: List[Dict[str, Any]] = field(default_factory=list)
+    updates: List[Dict[str, Any]] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def upserts(self) -> List[Dict[str, Any]]:
+        return self.inserts + self.updates
+
+    def summary(self) -> str:
+        return (
+            f"  {self.table}: {len(self.inserts)} to insert, {len(self.updates)} to update, "
+            f"{len(self.deletes)} to delete, {self.unchanged} unchanged"
+        )
+
+
+def plan_sync(collection: SyncedCollection, local: List[Dict[str, Any]], remote: List[Dict[str, Any]]) -> SyncPlan:
+    """Diff local records against Convex's (id, key, hash) listing"""
+    plan = SyncPlan(collection.table)
+    remote_by_key = {}
+    for row in remote:
+        if row["key"] in remote_by_key:
+            # Duplicate rows for one key - keep the first, drop the rest
+            plan.deletes.append(row["id"])
+        else:
+            remote_by_key[row["key"]] = row
+
+    for record in local:
+        record = {**record, "content_hash": content_hash(record)}
+        key = record[collection.key]
+        existing = remote_by_key.pop(key, None)
+        if existing is None:
+            plan.inserts.append(record)
+        elif existing["hash"] != record["content_hash"]:
+            plan.updates.append(record)
+        else:
+            plan.unchanged += 1
+
+    # Whatever is left in Convex no longer exists locally
+    plan.deletes.extend(row["id"] for row in remote_by_key.values())
+    return plan
+
+
+def sync_convex(convex_url: str, dry_run: bool = False, loader_args=None) -> List[SyncPlan]:
+    """Sync every collection, writing only the differences"""
+    client = ConvexClient(convex_url)
+    loader = loader_from_args(client, loader_args)
+
+    print(f"🔄 Syncing api/data to {convex_url} ({'DRY RUN' if dry_run else 'LIVE'})")
+    plans = []
+    for collection in COLLECTIONS:
+        remote = client.query("sync:getHashes", {"table": collection.table})
+        plan = plan_sync(collection, collection.records(), remote)
+        plans.append(plan)
+        print(plan.summary())
+
+        if dry_run:
+            continue
+        if plan.upserts:
+            report = loader.load(collection.upsert_mutation, plan.upserts, label=f"{collection.table} upserts")
+            print(report.summary())
+            for error in report.errors:
+                print(f"    ❌ {error}")
+        if plan.deletes:
+            report = loader.load(
+                "sync:deleteRecords", plan.deletes,
+                label=f"{collection.table} deletes", extra_args={"table": collection.table},
+            )
+            print(report.summary())
+            for error in report.errors:
+                print(f"    ❌ {error}")
+
+    changed = sum(len(p.upserts) + len(p.deletes) for p in plans)
+    print(f"\n✨ Sync complete: {changed} changes, {sum(p.unchanged for p in plans)} records unchanged")
+    return plans
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync api/data to Convex, writing only what changed')
+    parser.add_argument('--convex-url', type=str, help='Convex deployment URL')
+    parser.add_argument('--env-file', type=str, default='.env.local',
+                        help='Path to env file containing CONVEX_URL')
+    parser.add_argument('--dry-run', action='store_true', help='Show the planned changes without writing')
+    add_loader_arguments(parser)
+
+    args = parser.parse_args()
+
+    convex_url = args.convex_url
+    if not convex_url and os.path.exists(args.env_file):
+        from dotenv import load_dotenv
+        load_dotenv(args.env_file)
+        convex_url = os.environ.get('CONVEX_URL')
+
+    if not convex_url:
+        print("❌ Error: No Convex URL provided")
+        print("Please provide either:")
+        print("  1. --convex-url flag with your Convex deployment URL")
+        print("  2. CONVEX_URL in your .env.local file")
+        sys.exit(1)
+
+    sync_convex(convex_url, dry_run=args.dry_run, loader_args=args)
+
+
+if __name__ == "__main__":
+    main()
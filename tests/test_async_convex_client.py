@@ -0,0 +1,31 @@
+import asyncio
+import threading
+import time
+
+from api.async_convex_client import AsyncConvexDataClient
+
+
+class SlowClient:
+    """Blocking client that records which thread served each call"""
+
+    def __init__(self):
+        self.threads = set()
+
+    def get_turtles(self):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.1)
+        return [{"name": "leonardo"}]
+
+
+def test_concurrent_calls_do_not_serialize():
+    client = AsyncConvexDataClient(SlowClient(), max_workers=8)
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client.get_turtles() for _ in range(8)))
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+    assert all(r == [{"name": "leonardo"}] for r in results)
+    assert elapsed < 0.5
+    assert threading.get_ident() not in client.client.threads
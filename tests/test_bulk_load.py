@@ -0,0 +1,55 @@
+import threading
+
+from scripts.bulk_load import BulkLoader, chunked, episode_records
+
+
+class FlakyConvex:
+    """Stand-in for ConvexClient that fails the first call for each batch"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.attempts = {}
+        self.received = []
+
+    def mutation(self, name, args):
+        first_id = args["records"][0]["episode_id"]
+        with self.lock:
+            self.attempts[first_id] = self.attempts.get(first_id, 0) + 1
+            if self.attempts[first_id] == 1:
+                raise RuntimeError("transient")
+            self.received += args["records"]
+        return {"inserted": len(args["records"]), "updated": 0}
+
+
+def test_chunked():
+    assert [len(c) for c in chunked(list(range(7)), 3)] == [3, 3, 1]
+
+
+def test_loader_batches_and_retries():
+    client = FlakyConvex()
+    records = episode_records()
+    loader = BulkLoader(client, batch_size=25, concurrency=4, backoff=0)
+    report = loader.load("bulk:upsertEpisodes", records)
+
+    assert report.batches == -(-len(records) // 25)
+    assert report.retries == report.batches
+    assert report.inserted == len(records)
+    assert report.failed_records == 0
+    assert sorted(r["episode_id"] for r in client.received) == sorted(r["episode_id"] for r in records)
+
+
+def test_loader_reports_failed_batches():
+    class DownConvex:
+        def mutation(self, name, args):
+            raise RuntimeError("down")
+
+    report = BulkLoader(DownConvex(), batch_size=2, max_retries=1, backoff=0).load(
+        "bulk:upsertEpisodes", [{"episode_id": i} for i in range(3)]
+    )
+    assert report.failed_records == 3
+    assert len(report.errors) == 2
+
+
+def test_episode_records_drop_nulls():
+    record = episode_records([{"episode_id": 1, "title": "T", "writer": None}])[0]
+    assert record == {"episode_id": 1, "title": "T"}
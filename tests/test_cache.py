@@ -0,0 +1,146 @@
+import time
+
+from api.cache import QueryCache, make_key
+from api.convex_client import ConvexDataClient
+
+
+class FakeConvex:
+    """Stand-in for ConvexClient that counts queries"""
+
+    def __init__(self):
+        self.calls = []
+
+    def query(self, name, args=None):
+        self.calls.append((name, args))
+        if name == "turtles:getAll":
+            return [{"_id": "abc", "name": "leonardo"}]
+        if name == "episodes:getAll":
+            return [{"episode_id": 1.0, "season": 1.0, "episode_number": 1.0}]
+        return None
+
+
+def make_client(cache=None):
+    client = ConvexDataClient(cache=cache or QueryCache())
+    client.client = FakeConvex()
+    client._connected = True
+    return client
+
+
+def test_cache_hit_and_miss_counters():
+    cache = QueryCache()
+    key = make_key("turtles:getAll")
+    assert cache.get(key) is None
+    cache.set(key, ["leo"], collection="turtles")
+    assert cache.get(key) == ["leo"]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_key_ignores_argument_order():
+    assert make_key("episodes:getAll", {"limit": 10, "offset": 0}) == \
+        make_key("episodes:getAll", {"offset": 0, "limit": 10})
+
+
+def test_cache_lru_eviction():
+    cache = QueryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_per_collection_ttl():
+    cache = QueryCache(default_ttl=60, ttls={"episodes": 0.01})
+    cache.set(make_key("episodes:getAll"), [], collection="episodes")
+    cache.set(make_key("turtles:getAll"), [], collection="turtles")
+    time.sleep(0.02)
+    assert cache.get(make_key("episodes:getAll")) is None
+    assert cache.get(make_key("turtles:getAll")) == []
+    assert cache.stats()["expirations"] == 1
+
+
+def test_client_reads_through_cache():
+    client = make_client()
+    assert client.get_turtles() == [{"name": "leonardo"}]
+    assert client.get_turtles() == [{"name": "leonardo"}]
+    assert len(client.client.calls) == 1
+
+
+def test_client_caches_per_arguments():
+    client = make_client()
+    client.get_episodes(season=1)
+    client.get_episodes(season=1)
+    client.get_episodes(season=2)
+    assert len(client.client.calls) == 2
+
+
+def test_lookup_states():
+    cache = QueryCache(default_ttl=0.01, stale_ttl=0.05, stale_if_error=10)
+    cache.set("k", 1)
+    assert cache.lookup("k") == ("fresh", 1)
+    time.sleep(0.02)
+    assert cache.lookup("k") == ("stale", 1)
+    assert cache.get("k") is None
+    time.sleep(0.05)
+    assert cache.lookup("k") == ("expired", 1)
+    assert cache.stats()["expirations"] == 1
+
+
+class SwitchableConvex:
+    """Returns the current value, or raises while down"""
+
+    def __init__(self):
+        self.value = ["v1"]
+        self.down = False
+        self.calls = 0
+
+    def query(self, name, args=None):
+        self.calls += 1
+        if self.down:
+            raise RuntimeError("convex down")
+        return list(self.value)
+
+
+def make_swr_client(**cache_args):
+    client = ConvexDataClient(cache=QueryCache(**cache_args))
+    client.client = SwitchableConvex()
+    client._connected = True
+    return client
+
+
+def wait_for_refresh(client):
+    for _ in range(200):
+        if not client.revalidation_stats()["in_progress"]:
+            return
+        time.sleep(0.005)
+
+
+def test_stale_value_is_served_while_refreshing():
+    client = make_swr_client(default_ttl=0.01, stale_ttl=60)
+    assert client._query("turtles:getAll") == ["v1"]
+    client.client.value = ["v2"]
+    time.sleep(0.02)
+
+    # Served from cache immediately, refreshed behind the scenes
+    assert client._query("turtles:getAll") == ["v1"]
+    wait_for_refresh(client)
+    assert client._query("turtles:getAll") == ["v2"]
+    assert client.revalidation_stats()["refreshes"] == 1
+
+
+def test_expired_value_is_served_only_when_convex_fails():
+    client = make_swr_client(default_ttl=0.01, stale_ttl=0, stale_if_error=60)
+    client._query("turtles:getAll")
+    time.sleep(0.02)
+
+    client.client.down = True
+    assert client._query("turtles:getAll") == ["v1"]
+    assert client.cache.stats()["stale_on_error"] == 1
+
+    client.client.down = False
+    client.client.value = ["v2"]
+    assert client._query("turtles:getAll") == ["v2"]
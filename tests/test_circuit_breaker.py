@@ -0,0 +1,82 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.cache import QueryCache
+from api.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from api.convex_client import ConvexDataClient
+from api.index import app
+
+
+def fail():
+    raise RuntimeError("convex down")
+
+
+def test_opens_on_failure_rate_and_rejects_fast():
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, window=10, open_seconds=60)
+    breaker.call(lambda: 1)
+    breaker.call(lambda: 1)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+    assert breaker.state == OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker(failure_rate=1.0, min_calls=2, slow_call_seconds=0.001)
+    breaker.call(lambda: time.sleep(0.01))
+    breaker.call(lambda: time.sleep(0.01))
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=1, open_seconds=0.01)
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    time.sleep(0.02)
+    assert breaker.state == HALF_OPEN
+
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+
+    time.sleep(0.02)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+class DownConvex:
+    def __init__(self):
+        self.calls = 0
+
+    def query(self, name, args=None):
+        self.calls += 1
+        raise RuntimeError("convex down")
+
+
+def test_open_breaker_serves_local_data_without_calling_convex():
+    client = ConvexDataClient(cache=QueryCache())
+    client.client = DownConvex()
+    client._connected = True
+    client.breaker = CircuitBreaker(failure_rate=0.5, min_calls=2, open_seconds=60)
+
+    for _ in range(5):
+        turtles = client.get_turtles()
+        assert {t["name"] for t in turtles} >= {"leonardo", "raphael"}
+
+    assert client.client.calls == 2
+    assert client.breaker.state == OPEN
+    assert client.data_version.startswith("local-")
+
+
+def test_health_reports_breaker_state():
+    body = TestClient(app).get("/api/health").json()
+    assert body["circuit_breaker"]["state"] == CLOSED
+    assert body["status"] == "healthy"
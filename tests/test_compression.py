@@ -0,0 +1,73 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.compression import PrecompressedStaticFiles, negotiate, precompress_directory, static_variants, variant_etag
+from api.index import app
+
+client = TestClient(app)
+
+
+def test_negotiate_respects_q_values():
+    assert negotiate(None) is None
+    assert negotiate("identity") is None
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("*") in ("br", "gzip")
+
+
+def test_variant_etag_differs_per_encoding():
+    assert variant_etag('"abc"', None) == '"abc"'
+    assert variant_etag('"abc"', "gzip") == '"abc-gzip"'
+
+
+def test_api_body_is_compressed_once():
+    first = client.get("/api/v1/villains", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept-Encoding"
+    assert first.headers["etag"].endswith('-gzip"')
+
+    plain = client.get("/api/v1/villains", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == first.json()
+    assert plain.headers["etag"] != first.headers["etag"]
+
+    revalidated = client.get(
+        "/api/v1/villains",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+
+def test_static_files_are_compressed_once():
+    headers = {"Accept-Encoding": "gzip"}
+    first = client.get("/pages/api-docs.html", headers=headers)
+    builds = static_variants.builds
+    second = client.get("/pages/api-docs.html", headers=headers)
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert int(first.headers["content-length"]) < len(first.content)
+    assert second.content == first.content
+    assert static_variants.builds == builds
+
+
+def test_homepage_is_compressed():
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert b"<html" in response.content.lower()
+
+
+def test_prebuilt_static_variants_are_served_without_compressing(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text("<html>" + "Cowabunga! " * 200 + "</html>")
+    (tmp_path / "tiny.css").write_text("a{}")
+    written = list(precompress_directory(tmp_path))
+    assert {p.name for p in written} >= {"page.html.gz"}
+    assert not any(p.name.startswith("tiny") for p in written)
+
+    mini = FastAPI()
+    mini.mount("/static", PrecompressedStaticFiles(directory=tmp_path), name="static")
+    builds = static_variants.builds
+    response = TestClient(mini).get("/static/page.html", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == page.read_text()
+    assert static_variants.builds == builds
@@ -0,0 +1,76 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.async_convex_client import async_convex_client
+from api.conditional import ETagMiddleware, etag_matches, make_etag
+from api.index import app
+from api.response_cache import response_cache
+
+client = TestClient(app)
+
+
+def test_etag_matching():
+    etag = make_etag(b"[]")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_revalidation_skips_convex(monkeypatch):
+    response_cache.clear()
+    first = client.get("/api/v1/turtles")
+    etag = first.headers["etag"]
+
+    async def fail():
+        raise AssertionError("Convex should not be queried for a matching If-None-Match")
+
+    monkeypatch.setattr(async_convex_client, "get_turtles", fail)
+    second = client.get("/api/v1/turtles", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert second.headers["cache-control"] == first.headers["cache-control"]
+
+
+def test_episode_pages_keep_cursor_on_304():
+    first = client.get("/api/v1/episodes?limit=5")
+    second = client.get("/api/v1/episodes?limit=5", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    assert second.headers["x-next-cursor"] == first.headers["x-next-cursor"]
+
+
+def test_stale_etag_gets_full_body():
+    response = client.get("/api/v1/weapons", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.json()
+
+
+def test_middleware_adds_etag_to_other_gets():
+    response = client.get("/api/v1/search?q=shredder")
+    assert response.headers["etag"] == make_etag(response.content)
+
+
+def test_random_quotes_are_not_conditional():
+    response = client.get("/api/v1/quotes/random")
+    assert "etag" not in response.headers
+    again = client.get("/api/v1/quotes/random", headers={"If-None-Match": "*"})
+    assert again.status_code == 200
+
+
+def test_middleware_answers_304():
+    mini = FastAPI()
+    mini.add_middleware(ETagMiddleware, prefix="/api/v1")
+
+    @mini.get("/api/v1/thing")
+    def thing():
+        return {"ok": True}
+
+    mini_client = TestClient(mini)
+    etag = mini_client.get("/api/v1/thing").headers["etag"]
+    response = mini_client.get("/api/v1/thing", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert "content-type" not in response.headers
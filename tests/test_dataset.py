@@ -0,0 +1,69 @@
+import gc
+import weakref
+
+import pytest
+
+from api.data.dataset import Dataset, EpisodeSource, get_dataset
+
+
+def test_dataset_is_built_once():
+    assert get_dataset() is get_dataset()
+
+
+def test_dataset_indexes():
+    dataset = get_dataset()
+    assert dataset.episodes_by_id[1]["title"] == "Turtle Tracks"
+    assert all(e["season"] == 1 for e in dataset.episodes_by_season[1])
+    assert all("Krang" in e["villains_featured"] for e in dataset.episodes_by_villain["krang"])
+    assert all(e["air_date"].startswith("1987") for e in dataset.episodes_by_year[1987])
+    assert all(q["character"] == "Michelangelo" for q in dataset.quotes_by_character["michelangelo"])
+    assert dataset.weapons_by_wielder["leonardo"][0]["name"] == "Katana"
+
+
+def test_dataset_is_read_only():
+    dataset = get_dataset()
+    with pytest.raises(TypeError):
+        dataset.turtles["splinter"] = {}
+    with pytest.raises(AttributeError):
+        dataset.quotes = ()
+
+
+def test_empty_dataset():
+    dataset = Dataset.empty()
+    assert dataset.episodes == ()
+    assert dataset.episodes_by_id.get(1) is None
+
+
+def test_dataset_serves_full_season_catalog():
+    dataset = get_dataset()
+    assert len(dataset.episodes) > 100
+    assert "episode_id" not in dataset.episodes_by_id[100]
+    assert {e["season"] for e in dataset.episodes} == set(range(1, 11))
+
+
+def test_episode_source_loads_seasons_on_demand():
+    loaded = []
+
+    def load(season):
+        loaded.append(season)
+        return [{"id": season * 100, "season": season}]
+
+    dataset = Dataset.build({}, {}, [], [], EpisodeSource(range(1, 4), load))
+    assert dataset.episodes_by_season[2][0]["id"] == 200
+    assert dataset.episodes_by_season.get(2)[0]["id"] == 200
+    assert dataset.episodes_by_season.get(9, ()) == ()
+    assert loaded == [2]
+
+    # Loaded seasons live on the source, so a dropped dataset is freed with them
+    source = weakref.ref(dataset.episode_source)
+    del dataset
+    gc.collect()
+    assert source() is None
+
+
+def test_episode_package_indexes():
+    from api.data.episodes import get_episodes_by_villain, get_episodes_by_year, get_total_episode_count
+
+    assert all("Krang" in e["villains_featured"] for e in get_episodes_by_villain("Krang"))
+    assert all(e["air_date"].startswith("1989") for e in get_episodes_by_year(1989))
+    assert get_total_episode_count() == len(get_dataset().episodes)
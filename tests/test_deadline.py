@@ -0,0 +1,122 @@
+import contextvars
+import itertools
+import threading
+import time
+
+import pytest
+
+from api.cache import QueryCache
+from api.convex_client import ConvexDataClient
+from api.deadline import DeadlineExceeded, HedgedCaller, remaining, set_deadline
+
+
+def in_context(fn):
+    """Run fn in a fresh copy of the current context so deadlines don't leak between tests"""
+    return contextvars.copy_context().run(fn)
+
+
+def test_set_deadline_never_extends():
+    def check():
+        set_deadline(1.0)
+        set_deadline(60.0)
+        return remaining()
+
+    assert in_context(check) <= 1.0
+    assert remaining() is None
+
+
+def test_slow_call_is_abandoned_at_the_deadline():
+    caller = HedgedCaller()
+    release = threading.Event()
+
+    def check():
+        set_deadline(0.05)
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            caller.call(lambda: release.wait(5))
+        return time.monotonic() - started
+
+    try:
+        assert in_context(check) < 0.5
+    finally:
+        release.set()
+    assert caller.stats()["deadline_exceeded"] == 1
+
+
+def test_slow_call_is_hedged():
+    caller = HedgedCaller(hedge_percentile=0.5, min_samples=3)
+    for _ in range(3):
+        caller.call(lambda: None)
+
+    attempts = itertools.count()
+    release = threading.Event()
+
+    def flaky():
+        # First attempt hangs, the hedge answers at once
+        if next(attempts) == 0:
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    def check():
+        set_deadline(2.0)
+        return caller.call(flaky)
+
+    try:
+        assert in_context(check) == "fast"
+    finally:
+        release.set()
+    assert caller.stats()["hedged"] == 1
+    assert caller.stats()["hedge_wins"] == 1
+
+
+class HangingConvex:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def query(self, name, args=None):
+        self.release.wait(5)
+        return []
+
+
+def test_client_serves_local_data_when_budget_runs_out():
+    client = ConvexDataClient(cache=QueryCache())
+    client.client = HangingConvex()
+    client._connected = True
+
+    def fetch():
+        set_deadline(0.05)
+        return client.get_turtles()
+
+    started = time.monotonic()
+    try:
+        turtles = in_context(fetch)
+    finally:
+        client.client.release.set()
+    assert time.monotonic() - started < 0.5
+    assert any(t["name"] == "leonardo" for t in turtles)
+
+
+def test_background_refresh_has_its_own_budget():
+    client = ConvexDataClient(cache=QueryCache(default_ttl=0.01, stale_ttl=60))
+    client.caller = HedgedCaller(default_timeout=0.05)
+    client.client = HangingConvex()
+    client._connected = True
+    client.client.release.set()
+    client.get_turtles()
+
+    # The entry goes stale and its refresh hangs on Convex
+    client.client.release.clear()
+    time.sleep(0.02)
+    try:
+        client.get_turtles()
+        deadline = time.monotonic() + 2
+        while client.revalidation_stats()["in_progress"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        client.client.release.set()
+
+    assert client.revalidation_stats()["refresh_errors"] == 1
+    assert client.flights.stats()["in_flight"] == 0
+    assert client.caller.stats()["deadline_exceeded"] == 1
+    assert client.breaker.stats()["recent_failure_rate"] > 0
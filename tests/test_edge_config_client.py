@@ -0,0 +1,89 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import api.edge_config_client as edge_config_client
+from api.data.dataset import Dataset, EpisodeSource
+from api.edge_config_client import EdgeConfigClient
+
+DOCUMENT = {"items": {"greeting": "Cowabunga!", "turtles": {"leonardo": {"image_url": "/images/leonardo.png"}}}}
+
+
+class EdgeConfigHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_GET(self):
+        EdgeConfigHandler.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(DOCUMENT).encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def edge_config_url(monkeypatch):
+    EdgeConfigHandler.requests = []
+    server = HTTPServer(("127.0.0.1", 0), EdgeConfigHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/ecfg_test?token=secret"
+    monkeypatch.setenv("EDGE_CONFIG", url)
+    yield url
+    server.shutdown()
+
+
+def test_lookups_read_one_snapshot(edge_config_url):
+    client = EdgeConfigClient(ttl=60)
+    assert client.get("greeting") == "Cowabunga!"
+    assert client.get("greeting") == "Cowabunga!"
+    assert client.get("missing") is None
+    assert EdgeConfigHandler.requests == [("/ecfg_test?token=secret", None)]
+
+
+def test_png_turtles_use_local_data(edge_config_url):
+    client = EdgeConfigClient(ttl=60)
+    assert client.get("turtles")["leonardo"]["image_url"].endswith(".svg")
+
+
+def test_stale_snapshot_revalidates_with_etag(edge_config_url):
+    client = EdgeConfigClient(ttl=0)
+    client.get("greeting")
+    client._fetch()
+    assert EdgeConfigHandler.requests[-1] == ("/ecfg_test?token=secret", '"v1"')
+    assert client.not_modified == 1
+    assert client.get("greeting") == "Cowabunga!"
+
+
+def test_unreachable_edge_config_falls_back(monkeypatch):
+    monkeypatch.setenv("EDGE_CONFIG", "http://127.0.0.1:9/ecfg_test")
+    client = EdgeConfigClient(ttl=60, timeout=0.5)
+    assert client.get("turtles")["leonardo"]["name"] == "leonardo"
+    assert client.errors == 1
+    client.get("turtles")
+    assert client.errors == 1
+
+
+def test_fallback_reads_collections_lazily(monkeypatch):
+    monkeypatch.delenv("EDGE_CONFIG", raising=False)
+    loaded = []
+    source = EpisodeSource([1], lambda season: loaded.append(season) or [{"id": 1, "season": 1}])
+    monkeypatch.setattr(edge_config_client, "get_dataset", lambda: Dataset.build({"leo": {"name": "leo"}}, {}, [], [], source))
+
+    client = EdgeConfigClient()
+    assert client.get("turtles") == {"leo": {"name": "leo"}}
+    assert set(client.get_all()) == {"turtles", "villains", "weapons", "quotes", "episodes"}
+    assert loaded == []
+    assert client.get("episodes")[0]["id"] == 1
+    assert loaded == [1]
@@ -0,0 +1,55 @@
+from fastapi.testclient import TestClient
+
+from api.cache import QueryCache
+from api.convex_client import ConvexDataClient
+from api.index import app
+
+client = TestClient(app)
+
+
+class FakeConvex:
+    def __init__(self):
+        self.calls = []
+
+    def query(self, name, args=None):
+        self.calls.append((name, args))
+        if name == "episodes:getByIds":
+            return [
+                {"_id": "x", "episode_id": float(i), "season": 1.0, "episode_number": float(i)} if i < 100 else None
+                for i in args["episode_ids"]
+            ]
+        return None
+
+
+def test_ids_resolve_in_one_convex_query():
+    data_client = ConvexDataClient(cache=QueryCache())
+    data_client.client = FakeConvex()
+    data_client._connected = True
+
+    results = data_client.get_episodes_by_ids([5, 500, 1])
+
+    assert data_client.client.calls == [("episodes:getByIds", {"episode_ids": [5, 500, 1]})]
+    assert [r and r["id"] for r in results] == [5, None, 1]
+    assert "_id" not in results[0]
+
+
+def test_get_with_ids_keeps_order_and_reports_missing():
+    response = client.get("/api/v1/episodes?ids=19,5,9999,1,5")
+    assert response.status_code == 200
+    assert [e["id"] for e in response.json()] == [19, 5, 1]
+    assert response.headers["x-missing-ids"] == "9999"
+
+
+def test_get_with_bad_ids():
+    assert client.get("/api/v1/episodes?ids=1,x").status_code == 400
+    assert client.get("/api/v1/episodes?ids=,").status_code == 400
+
+
+def test_post_batch():
+    response = client.post("/api/v1/episodes/batch", json={"ids": [3, 2, 7777]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [e["id"] for e in body["episodes"]] == [3, 2]
+    assert body["missing"] == [7777]
+
+    assert client.post("/api/v1/episodes/batch", json={"ids": []}).status_code == 422
@@ -0,0 +1,200 @@
+import contextvars
+import csv
+import gzip
+import io
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.cache import QueryCache
+from api.convex_client import ConvexDataClient, convex_client
+from api.data.dataset import get_dataset
+from api.deadline import set_deadline
+from api.export import RangeNotSatisfiable, chunked, gzipped, parse_range
+from api.index import app
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def test_ndjson_export_streams_every_record():
+    response = TestClient(app).get("/api/v1/export/episodes", headers=IDENTITY)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["accept-ranges"] == "records"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["id"] for e in lines] == [e["id"] for e in get_dataset().episodes]
+
+
+def test_csv_export_has_header_and_json_list_cells():
+    response = TestClient(app).get("/api/v1/export/villains?format=csv", headers=IDENTITY)
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(rows) == len(get_dataset().villains)
+    shredder = next(row for row in rows if row["name"] == "shredder")
+    assert isinstance(json.loads(shredder["abilities"]), list)
+
+
+def test_range_resumes_from_record_offset():
+    client = TestClient(app)
+    ids = [e["id"] for e in get_dataset().episodes]
+    response = client.get("/api/v1/export/episodes", headers={**IDENTITY, "Range": "records=10-19"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"records 10-19/{len(ids)}"
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == ids[10:20]
+
+    tail = client.get("/api/v1/export/episodes", headers={**IDENTITY, "Range": f"records={len(ids) - 2}-"})
+    assert len(tail.text.splitlines()) == 2
+
+    past_end = client.get("/api/v1/export/episodes", headers={"Range": f"records={len(ids)}-"})
+    assert past_end.status_code == 416
+    assert past_end.headers["content-range"] == f"records */{len(ids)}"
+
+
+def test_gzip_export_and_conditional_get():
+    client = TestClient(app)
+    response = client.get("/api/v1/export/quotes", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.text.splitlines()) == len(get_dataset().quotes)
+
+    again = client.get("/api/v1/export/quotes", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+    assert again.status_code == 304
+    assert client.get("/api/v1/export/unknown").status_code == 404
+
+
+def test_stream_is_chunked_and_gzip_decodes_incrementally():
+    lines = (b"%d\n" % i for i in range(1000))
+    chunks = list(chunked(lines, size=256))
+    assert len(chunks) > 10 and all(len(chunk) < 512 for chunk in chunks)
+
+    compressed = list(gzipped(iter(chunks)))
+    assert len(compressed) > 1
+    assert gzip.decompress(b"".join(compressed)) == b"".join(chunks)
+
+
+def test_parse_range():
+    assert parse_range(None) is None
+    assert parse_range("bytes=0-100") is None
+    assert parse_range("records=5-") == (5, None)
+    assert parse_range("records=5-9") == (5, 9)
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("records=9-5")
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("records=-5")
+
+
+class PagingConvex:
+    """
+    Convex stand-in serving 5 episodes (ids 10, 20, ...), two per page, each
+    page taking `delay` seconds; counts the records each query reads
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.pages = []
+        self.reads = 0
+
+    def query(self, name, args=None):
+        time.sleep(self.delay)
+        ids = [10, 20, 30, 40, 50]
+        if name == "sync:getHashes":
+            return [{"id": "x", "key": "leonardo", "hash": "abc"}]
+        if name == "episodes:getAll":
+            end = args["offset"] + args["limit"]
+            self.reads += end
+            return [{"episode_id": float(i), "season": 1.0} for i in ids[args["offset"]:end]]
+        assert name == "episodes:paginate"
+        ids = [i for i in ids if i > args.get("after", 0)]
+        start = int(args["paginationOpts"]["cursor"] or 0)
+        self.pages.append(start)
+        page = [{"episode_id": float(i), "season": 1.0} for i in ids[start:start + 2]]
+        self.reads += len(page)
+        return {"page": page, "isDone": start + 2 >= len(ids), "continueCursor": str(start + 2)}
+
+
+def make_client(delay=0.0):
+    client = ConvexDataClient(cache=QueryCache())
+    client.client = PagingConvex(delay)
+    client._connected = True
+    return client
+
+
+def test_convex_episodes_are_walked_a_page_at_a_time():
+    client = make_client()
+    assert [e["id"] for e in client.iter_collection("episodes", page_size=2)] == [10, 20, 30, 40, 50]
+    assert client.client.pages == [0, 2, 4]
+    assert client.collection_size("episodes") is None
+
+
+def test_range_resumes_by_key_instead_of_rereading_earlier_records():
+    client = make_client()
+    assert [e["id"] for e in client.iter_collection("episodes", start=3, page_size=2)] == [40, 50]
+    # One lookup of the record before the range, then pages past its key
+    assert client.client.reads == 3 + 2
+    assert client.client.pages == [0]
+
+    local = [e["id"] for e in get_dataset().episodes]
+    assert [e["id"] for e in convex_client.iter_collection("episodes", start=len(local) - 2)] == local[-2:]
+
+
+def test_each_export_page_gets_its_own_budget():
+    client = make_client(delay=0.05)
+
+    def walk():
+        # Far less than the whole walk takes
+        set_deadline(0.08)
+        return [e["id"] for e in client.iter_collection("episodes", page_size=2)]
+
+    assert contextvars.copy_context().run(walk) == [10, 20, 30, 40, 50]
+
+
+def test_export_etag_is_a_content_digest():
+    client = make_client()
+    digest = client.collection_digest("turtles")
+    client.cache.generation += 5
+    assert client.collection_digest("turtles") == digest
+
+    client.client.query = lambda name, args=None: [{"id": "x", "key": "leonardo", "hash": None}]
+    client.cache.invalidate()
+    assert client.collection_digest("turtles") is None
+
+
+def test_export_never_mixes_convex_and_local_data():
+    client = make_client()
+    paging = client.client
+
+    def flaky(name, args=None):
+        if name == "sync:getHashes" or args["paginationOpts"]["cursor"]:
+            raise RuntimeError("convex hiccup")
+        return paging.query(name, args)
+
+    client.client.query = flaky
+    # Convex's records can't be vouched for by the local digest
+    assert client.collection_digest("episodes") is None
+    # A page that fails part way aborts the walk rather than continuing from local data
+    with pytest.raises(RuntimeError):
+        list(client.iter_collection("episodes", page_size=2))
+
+    # Whole-collection loads fall back all at once instead
+    assert client.load_collection("episodes") == list(get_dataset().episodes)
+
+
+def test_failed_export_is_not_served_as_complete(monkeypatch):
+    def failing(collection, start=0, source=None):
+        raise RuntimeError("Convex went away")
+        yield
+
+    def failing_later(collection, start=0, source=None):
+        for i in range(2000):
+            yield {"id": i, "text": "x" * 100}
+        raise RuntimeError("Convex went away")
+
+    client = TestClient(app)
+    monkeypatch.setattr(convex_client, "iter_collection", failing)
+    assert client.get("/api/v1/export/quotes", headers=IDENTITY).status_code == 503
+
+    # The status line is already out, so the transfer is aborted (the error reaches the server)
+    monkeypatch.setattr(convex_client, "iter_collection", failing_later)
+    with pytest.raises(Exception):
+        client.get("/api/v1/export/quotes", headers=IDENTITY)
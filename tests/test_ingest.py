@@ -0,0 +1,71 @@
+from typing import List
+
+import pytest
+from pydantic import ValidationError
+
+from api.cache import QueryCache
+from api.convex_client import ConvexDataClient
+from api.data.dataset import get_dataset
+from api.ingest import TrustedRecord, is_trusted, validate_record
+from api.models import Episode, Quote
+from api.response_cache import serialize
+
+RAW_EPISODE = {
+    "_id": "abc", "_creationTime": 1.0, "content_hash": "x", "episode_id": 7.0,
+    "title": "Enter the Fly", "season": 2.0, "episode_number": 3.0, "synopsis": "Baxter Stockman...",
+}
+
+
+class FakeConvex:
+    def query(self, name, args=None):
+        if name == "episodes:getById":
+            return RAW_EPISODE
+        if name == "quotes:getAll":
+            return [{"_id": "q1", "text": "Cowabunga!", "character": "Michelangelo"}, {"_id": "q2", "text": "?"}]
+        return None
+
+
+def make_client():
+    client = ConvexDataClient(cache=QueryCache())
+    client.client = FakeConvex()
+    client._connected = True
+    return client
+
+
+def test_local_dataset_records_are_trusted():
+    dataset = get_dataset()
+    assert is_trusted(Episode, dataset.episodes_by_season[3])
+    assert is_trusted(Quote, dataset.quotes)
+    assert not is_trusted(Episode, dataset.quotes)
+
+
+def test_trusted_fast_path_matches_validated_encoding():
+    episodes = list(get_dataset().episodes)
+    untrusted = [dict(episode) for episode in episodes]
+    assert not is_trusted(Episode, untrusted)
+
+    assert serialize(List[Episode], episodes) == serialize(List[Episode], untrusted)
+    fields = ("id", "title", "air_date")
+    assert serialize(List[Episode], episodes, fields) == serialize(List[Episode], untrusted, fields)
+    assert serialize(Episode, episodes[0], fields) == serialize(Episode, untrusted[0], fields)
+
+
+def test_convex_results_are_cleaned_and_validated_once():
+    client = make_client()
+    episode = client.get_episode(7)
+    assert isinstance(episode, TrustedRecord)
+    assert episode["id"] == 7 and episode["season"] == 2 and episode["cast"] == []
+    assert "_id" not in episode
+
+    # The invalid quote is kept untrusted, so serializing it still validates (and fails)
+    quotes = client.get_quotes()
+    assert isinstance(quotes[0], TrustedRecord)
+    assert not isinstance(quotes[1], TrustedRecord)
+    with pytest.raises(ValidationError):
+        serialize(List[Quote], quotes)
+
+
+def test_validate_record_keeps_trusted_records():
+    record = validate_record(Quote, {"text": "Cowabunga!", "character": "Michelangelo"})
+    assert validate_record(Quote, record) is record
+    assert record == {"id": None, "text": "Cowabunga!", "character": "Michelangelo", "episode": None, "context": None}
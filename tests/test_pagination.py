@@ -0,0 +1,54 @@
+import pytest
+
+from api.cache import QueryCache
+from api.convex_client import ConvexDataClient, InvalidCursor, decode_cursor, encode_cursor
+
+
+class PagingConvex:
+    """Stand-in for ConvexClient serving episodes:paginate"""
+
+    def __init__(self):
+        self.calls = []
+
+    def query(self, name, args=None):
+        self.calls.append((name, args))
+        cursor = args["paginationOpts"]["cursor"]
+        if cursor is None:
+            return {"page": [{"episode_id": 1.0, "season": 1.0}], "isDone": False, "continueCursor": "abc"}
+        return {"page": [{"episode_id": 2.0, "season": 1.0}], "isDone": True, "continueCursor": "def"}
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("offset", 20, season=3)
+    assert decode_cursor(cursor, season=3) == ("offset", 20)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, season=4)
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+def test_fallback_pages_cover_catalog():
+    client = ConvexDataClient(cache=QueryCache())
+    client._connected = False
+    client._load_fallback_data()
+
+    seen, cursor = [], None
+    while True:
+        page = client.get_episodes_page(season=3, limit=10, cursor=cursor)
+        seen += [e["id"] for e in page["episodes"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [e["id"] for e in client._fallback_data.episodes_by_season[3]]
+
+
+def test_convex_pages_use_paginate_query():
+    client = ConvexDataClient(cache=QueryCache())
+    client.client = PagingConvex()
+    client._connected = True
+
+    first = client.get_episodes_page(limit=1)
+    assert first["episodes"] == [{"id": 1, "season": 1}]
+    second = client.get_episodes_page(limit=1, cursor=first["next_cursor"])
+    assert second == {"episodes": [{"id": 2, "season": 1}], "next_cursor": None}
+    assert client.client.calls[1] == ("episodes:paginate", {"paginationOpts": {"numItems": 1, "cursor": "abc"}})
@@ -0,0 +1,38 @@
+import time
+
+from api.quote_pool import RandomQuotePool
+
+QUOTES = [{"text": "Cowabunga!", "character": "Michelangelo"}, {"text": "Does machine!", "character": "Donatello"}]
+
+
+def test_pool_loads_once_and_picks_locally():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return QUOTES
+
+    pool = RandomQuotePool(loader, refresh_interval=60)
+    picks = [pool.pick() for _ in range(20)]
+    assert all(p in QUOTES for p in picks)
+    assert len(calls) == 1
+
+
+def test_pool_refreshes_in_background_and_keeps_quotes_on_error():
+    results = [QUOTES, RuntimeError("convex down")]
+
+    def loader():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    pool = RandomQuotePool(loader, refresh_interval=0)
+    assert pool.pick() in QUOTES
+    assert pool.pick() in QUOTES
+    deadline = time.monotonic() + 1
+    while pool.refresh_errors == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.refresh_errors == 1
+    assert pool.pick() in QUOTES
+    assert pool.stats()["size"] == 2
@@ -0,0 +1,162 @@
+import time
+from typing import List
+
+from fastapi.testclient import TestClient
+
+from api.cache import QueryCache, make_key
+from api.index import app
+from api.models import Turtle
+from api.response_cache import ResponseCache, response_cache, serialize
+
+TURTLES = [{
+    "name": "leonardo", "full_name": "Leonardo", "color": "blue", "weapon": "Katana",
+    "personality": "Leader", "favorite_pizza": "Pepperoni", "catchphrase": "Cowabunga",
+}]
+
+
+def test_body_is_built_once_per_version():
+    cache = ResponseCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return serialize(List[Turtle], TURTLES)
+
+    first = cache.get_or_build(("turtles",), "v1", build)
+    second = cache.get_or_build(("turtles",), "v1", build)
+    assert first is second
+    assert len(builds) == 1
+
+    cache.get_or_build(("turtles",), "v2", build)
+    assert len(builds) == 2
+    assert cache.stats()["builds"] == 2
+
+
+def test_expired_body_is_rebuilt_from_fresh_data():
+    cache = ResponseCache()
+    turtles = [dict(TURTLES[0])]
+    build = lambda: serialize(List[Turtle], turtles)
+
+    first = cache.get_or_build(("turtles",), "v1", build, ttl=0.01)
+    time.sleep(0.02)
+    # Unchanged data keeps the entry (and its ETag)
+    assert cache.get_or_build(("turtles",), "v1", build, ttl=0.01).etag == first.etag
+
+    # Changed data is picked up even though the data version didn't move
+    turtles[0]["color"] = "purple"
+    time.sleep(0.02)
+    rebuilt = cache.get_or_build(("turtles",), "v1", build, ttl=0.01)
+    assert rebuilt.etag != first.etag and b"purple" in rebuilt.body
+
+
+def test_serialize_applies_response_model():
+    body = serialize(List[Turtle], [{**TURTLES[0], "extra": "dropped"}])
+    assert b'"image_url":null' in body
+    assert b"extra" not in body
+
+
+def test_query_cache_generation_tracks_content_changes():
+    cache = QueryCache()
+    key = make_key("turtles:getAll")
+    cache.set(key, TURTLES, collection="turtles")
+    generation = cache.generation
+    cache.set(key, list(TURTLES), collection="turtles")
+    assert cache.generation == generation
+    cache.set(key, [], collection="turtles")
+    assert cache.generation == generation + 1
+
+
+def test_query_cache_generation_ignores_new_and_evicted_keys():
+    cache = QueryCache(max_entries=4)
+    for i in range(1000):
+        cache.set(make_key("turtles:getByName", {"name": f"t{i}"}), {"name": f"t{i}"}, collection="turtles")
+    assert cache.generation == 0
+    assert len(cache) == 4 and len(cache._fingerprints) == 4
+
+    cache.invalidate("turtles")
+    assert cache.generation == 1
+    assert not cache._fingerprints
+
+
+def test_collection_endpoints_serve_cached_bytes():
+    client = TestClient(app)
+    response_cache.clear()
+
+    first = client.get("/api/v1/weapons")
+    builds = response_cache.builds
+    second = client.get("/api/v1/weapons")
+
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert first.headers["cache-control"].startswith("public")
+    assert second.content == first.content
+    assert response_cache.builds == builds
+
+
+def test_fields_projection_is_cached_per_projection():
+    client = TestClient(app)
+    full = client.get("/api/v1/episodes?limit=20")
+    slim = client.get("/api/v1/episodes?limit=20&fields=title,id")
+
+    assert [set(e) for e in slim.json()] == [{"id", "title"}] * 20
+    assert len(slim.content) * 5 < len(full.content)
+    assert slim.headers["etag"] != full.headers["etag"]
+
+    builds = response_cache.builds
+    client.get("/api/v1/episodes?limit=20&fields=id,title")
+    assert response_cache.builds == builds
+
+
+def test_unknown_fields_are_rejected():
+    client = TestClient(app)
+    response = client.get("/api/v1/turtles/leonardo?fields=name,bogus")
+    assert response.status_code == 400
+    assert "bogus" in response.json()["detail"]
+
+
+def test_routes_render_with_orjson():
+    from fastapi.responses import ORJSONResponse
+    from fastapi.routing import APIRoute
+
+    routes = [route for route in app.routes if isinstance(route, APIRoute)]
+    assert routes and all(route.response_class is ORJSONResponse for route in routes)
+
+    response = TestClient(app).get("/api/v1/search?q=shredder")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["totals"]["villains"] >= 1
+
+
+class FlakyConvex:
+    """Fails the first call, then answers with one renamed weapon"""
+
+    def __init__(self, weapon):
+        self.calls = 0
+        self.weapon = weapon
+
+    def query(self, name, args=None):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("convex hiccup")
+        return [{**self.weapon, "name": "Convex Katana"}]
+
+
+def test_fallback_body_is_not_served_once_convex_recovers(monkeypatch):
+    from api.circuit_breaker import CircuitBreaker
+    from api.convex_client import convex_client
+
+    weapon = dict(convex_client._fallback_data.weapons[0])
+    monkeypatch.setattr(convex_client, "client", FlakyConvex(weapon), raising=False)
+    monkeypatch.setattr(convex_client, "_connected", True)
+    monkeypatch.setattr(convex_client, "cache", QueryCache())
+    monkeypatch.setattr(convex_client, "breaker", CircuitBreaker(min_calls=10))
+    response_cache.clear()
+    client = TestClient(app)
+
+    # One failed call falls back to local data without opening the breaker
+    local = client.get("/api/v1/weapons")
+    assert local.json()[0]["name"] == weapon["name"]
+    assert convex_client.data_version.startswith("convex-")
+
+    recovered = client.get("/api/v1/weapons")
+    assert [w["name"] for w in recovered.json()] == ["Convex Katana"]
+    assert recovered.headers["etag"] != local.headers["etag"]
@@ -0,0 +1,86 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from api.index import app
+from api.search import SearchIndex, tokenize
+from api.versioned import PerVersion
+
+client = TestClient(app)
+
+EPISODES = [
+    {"id": 1, "title": "Return of the Technodrome", "synopsis": "Shredder and Krang power up the Technodrome."},
+    {"id": 2, "title": "Pizza Night", "synopsis": "The Turtles order pizza while Krang sulks.",
+     "cast": [{"character_name": "Krang", "voice_actor": "Pat Fraley", "role": "recurring"}]},
+    {"id": 3, "title": "Krang's Return", "synopsis": "Return to the Technodrome, where the return of Krang begins."},
+]
+QUOTES = [{"id": 1, "text": "Cowabunga!", "character": "Michelangelo"}]
+
+
+def make_index():
+    return SearchIndex({"episodes": EPISODES, "quotes": QUOTES})
+
+
+def ids(results):
+    return [hit["item"]["id"] for hit in results["episodes"]]
+
+
+def test_tokenize_folds_case_plurals_and_possessives():
+    assert tokenize("The Turtles' Krang's Technodromes") == ["the", "turtle", "krang", "technodrome"]
+
+
+def test_ranking_prefers_title_matches():
+    results = make_index().search("technodrome")
+    assert ids(results) == [1, 3]
+    assert results["totals"]["episodes"] == 2
+    assert results["episodes"][0]["score"] > results["episodes"][1]["score"]
+
+
+def test_phrase_must_be_consecutive():
+    assert ids(make_index().search('"krang power"')) == [1]
+    assert ids(make_index().search('"power krang"')) == []
+
+
+def test_prefix_and_cast_names():
+    assert ids(make_index().search("techno*")) == [1, 3]
+    assert ids(make_index().search("fraley")) == [2]
+    assert make_index().search("cowa*")["quotes"][0]["item"]["character"] == "Michelangelo"
+
+
+def test_pagination_and_type_filter():
+    index = make_index()
+    assert ids(index.search("krang", limit=1, offset=1)) == [ids(index.search("krang"))[1]]
+    filtered = index.search("krang", types=["quotes"])
+    assert filtered["episodes"] == [] and filtered["totals"]["episodes"] == 0
+
+
+def test_search_endpoint():
+    response = client.get("/api/v1/search", params={"q": "shredder", "types": "episodes,villains", "limit": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["episodes"]) == 5
+    assert body["totals"]["episodes"] > 5
+    assert body["villains"][0]["item"]["name"] == "shredder"
+    assert body["quotes"] == []
+
+    assert client.get("/api/v1/search", params={"q": "x"}).status_code == 422
+    assert client.get("/api/v1/search", params={"q": "krang", "types": "pizzas"}).status_code == 400
+
+
+def test_concurrent_requests_share_one_rebuild():
+    started = []
+
+    async def build():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    holder = PerVersion(build)
+
+    async def burst():
+        return await asyncio.gather(*(holder.get() for _ in range(10)))
+
+    values = asyncio.run(burst())
+    assert len(started) == 1 and holder.builds == 1
+    assert all(value is values[0] for value in values)
+    assert asyncio.run(holder.get()) is values[0]
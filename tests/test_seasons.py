@@ -0,0 +1,68 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from api.async_convex_client import async_convex_client
+from api.data.dataset import get_dataset
+from api.index import app
+from api.seasons import _build_stats, get_season_stats, summarize
+from api.versioned import PerVersion
+
+EPISODES = [
+    {
+        "id": 1, "season": 2, "air_date": "1988-10-08", "writer": "David Wise", "director": "Fred Wolf",
+        "villains_featured": ["Shredder", "Krang"],
+        "cast": [{"character_name": "Leonardo", "voice_actor": "Cam Clarke", "role": "main"}],
+    },
+    {
+        "id": 2, "season": 2, "air_date": "1988-10-01", "writer": "Jack Mendelsohn", "director": "Fred Wolf",
+        "villains_featured": ["Shredder", "Shredder"],
+        "cast": [
+            {"character_name": "Leonardo", "voice_actor": "Cam Clarke", "role": "main"},
+            {"character_name": "Shredder", "voice_actor": "James Avery", "role": "recurring"},
+        ],
+    },
+    {"id": 3, "season": 2, "air_date": None},
+]
+
+
+def test_summarize_aggregates_a_season():
+    season = summarize(2, EPISODES, {"year": 1988, "description": "First full season"})
+    assert season["episode_count"] == 3
+    assert (season["first_air_date"], season["last_air_date"]) == ("1988-10-01", "1988-10-08")
+    assert season["writers"] == ["David Wise", "Jack Mendelsohn"]
+    assert season["directors"] == ["Fred Wolf"]
+    assert season["villains"] == [{"name": "Shredder", "episodes": 2}, {"name": "Krang", "episodes": 1}]
+    assert season["top_cast"][0] == {"character_name": "Leonardo", "voice_actor": "Cam Clarke", "episodes": 2}
+    assert season["year"] == 1988
+
+
+def test_seasons_endpoint_covers_every_episode():
+    client = TestClient(app)
+    response = client.get("/api/v1/seasons")
+    seasons = response.json()
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("public, s-maxage=86400")
+    assert [s["season"] for s in seasons] == list(range(1, 11))
+    assert sum(s["episode_count"] for s in seasons) == len(get_dataset().episodes)
+
+    one = client.get("/api/v1/seasons/3?fields=season,episode_count")
+    assert one.json() == {"season": 3, "episode_count": len(get_dataset().episodes_by_season[3])}
+    assert client.get("/api/v1/seasons/42").status_code == 404
+
+
+def test_aggregates_are_computed_once_per_data_version():
+    first = asyncio.run(get_season_stats())
+    assert asyncio.run(get_season_stats()) is first
+
+
+def test_seasons_include_episodes_past_the_old_load_limit(monkeypatch):
+    episodes = [{"id": i, "season": 1 + i // 600} for i in range(1200)]
+
+    async def get_collection(collection):
+        assert collection == "episodes"
+        return episodes
+
+    monkeypatch.setattr(async_convex_client, "get_collection", get_collection)
+    stats = asyncio.run(PerVersion(_build_stats).get())
+    assert [s["episode_count"] for s in stats.seasons if s["episode_count"]] == [600, 600]
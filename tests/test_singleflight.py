@@ -0,0 +1,73 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.cache import QueryCache
+from api.convex_client import ConvexDataClient
+from api.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flights.do, "key", slow)
+        started.wait(5)
+        followers = [pool.submit(flights.do, "key", slow) for _ in range(7)]
+        while flights.collapsed < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == ["result"] * 8
+    assert len(calls) == 1
+    assert flights.stats()["executions"] == 1
+    assert flights.stats()["collapsed"] == 7
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flights = SingleFlight()
+
+    def fail():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        flights.do("key", fail)
+    assert flights.do("key", lambda: 42) == 42
+
+
+class SlowConvex:
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def query(self, name, args=None):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return [{"name": "leonardo"}]
+
+
+def test_client_coalesces_identical_misses():
+    client = ConvexDataClient(cache=QueryCache())
+    client.client = SlowConvex()
+    client._connected = True
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(lambda _: client.get_turtles(), range(10)))
+
+    assert all(r == [{"name": "leonardo"}] for r in results)
+    assert client.client.calls == 1
+    assert client.flights.collapsed + client.cache.hits == 9
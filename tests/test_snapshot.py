@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from api.data.dataset import dataset_from_modules
+import api.data.snapshot
+from api.data.snapshot import HEADER, Snapshot, SnapshotError, load_snapshot, write_snapshot
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return dataset_from_modules()
+
+
+@pytest.fixture
+def snapshot_file(tmp_path, dataset):
+    path = tmp_path / "catalog.snapshot"
+    write_snapshot(dataset, path)
+    return path
+
+
+def test_snapshot_round_trips_dataset(snapshot_file, dataset):
+    loaded = Snapshot(snapshot_file).dataset()
+    assert loaded.version == dataset.version
+    assert dict(loaded.turtles) == dict(dataset.turtles)
+    assert dict(loaded.villains) == dict(dataset.villains)
+    assert loaded.weapons == dataset.weapons
+    assert loaded.quotes == dataset.quotes
+    assert loaded.episode_source.seasons == dataset.episode_source.seasons
+    assert loaded.episodes == dataset.episodes
+
+
+def test_episodes_are_decoded_per_season(snapshot_file, dataset):
+    snapshot = Snapshot(snapshot_file)
+    assert snapshot.season(3) == list(dataset.episodes_by_season[3])
+    assert snapshot.season(99) == []
+    assert snapshot.record("episodes", 0) == dataset.episodes[0]
+    with pytest.raises(IndexError):
+        snapshot.record("turtles", len(dataset.turtles))
+
+
+def test_corrupt_snapshot_is_rejected(snapshot_file):
+    data = bytearray(snapshot_file.read_bytes())
+    data[-1] ^= 0xFF
+    snapshot_file.write_bytes(bytes(data))
+    # Opening only reads the header and index; the checksum is checked on request
+    snapshot = Snapshot(snapshot_file)
+    with pytest.raises(SnapshotError, match="checksum"):
+        snapshot.verify()
+    with pytest.raises(SnapshotError, match="checksum"):
+        Snapshot(snapshot_file, verify=True)
+
+    snapshot_file.write_bytes(bytes(data[:-10]))
+    with pytest.raises(SnapshotError, match="truncated"):
+        Snapshot(snapshot_file)
+
+    snapshot_file.write_bytes(b"NOTASNAP" + bytes(data[8:HEADER.size]))
+    with pytest.raises(SnapshotError, match="not a catalog snapshot"):
+        Snapshot(snapshot_file)
+
+
+def test_stale_or_missing_snapshot_is_ignored(snapshot_file, dataset, monkeypatch):
+    monkeypatch.setenv("DATA_SNAPSHOT", str(snapshot_file))
+    assert load_snapshot() is not None
+
+    # Touched but unchanged sources are still current; changed ones aren't
+    monkeypatch.setattr(api.data.snapshot, "source_stats", lambda: [])
+    assert load_snapshot() is not None
+    monkeypatch.setattr(api.data.snapshot, "source_version", lambda: "changed")
+    assert load_snapshot() is None
+    assert load_snapshot(check_sources=False) is not None
+
+    monkeypatch.setenv("DATA_SNAPSHOT", str(snapshot_file.with_name("missing.snapshot")))
+    assert load_snapshot() is None
+
+
+def test_empty_or_malformed_snapshot_falls_back(snapshot_file, monkeypatch):
+    monkeypatch.setenv("DATA_SNAPSHOT", str(snapshot_file))
+    data = snapshot_file.read_bytes()
+    magic, version, index_length, checksum = HEADER.unpack_from(data)
+    index = json.loads(data[HEADER.size:HEADER.size + index_length])
+
+    snapshot_file.write_bytes(b"")
+    with pytest.raises(SnapshotError, match="truncated"):
+        Snapshot(snapshot_file)
+    assert load_snapshot() is None
+
+    # Index cut short mid-JSON
+    snapshot_file.write_bytes(data[:HEADER.size + index_length // 2])
+    with pytest.raises(SnapshotError, match="corrupt index"):
+        Snapshot(snapshot_file)
+    assert load_snapshot() is None
+
+    # Well-formed JSON that is missing fields
+    del index["collections"]["episodes"]
+    body = json.dumps(index).encode()
+    snapshot_file.write_bytes(HEADER.pack(magic, version, len(body), checksum) + body)
+    with pytest.raises(SnapshotError, match="corrupt index"):
+        Snapshot(snapshot_file)
+    assert load_snapshot(check_sources=False) is None
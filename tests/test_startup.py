@@ -0,0 +1,39 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from api.cache import QueryCache
+from api.convex_client import ConvexDataClient
+from scripts.startup_report import DEFERRED_MODULES, parse_importtime
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_importing_app_defers_convex_and_data_modules():
+    check = f"import sys, api.index; print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
+def test_client_connects_and_loads_data_on_first_use(monkeypatch):
+    monkeypatch.delenv("CONVEX_URL", raising=False)
+    client = ConvexDataClient(cache=QueryCache())
+    assert "_connected" not in vars(client)
+    assert "_fallback_data" not in vars(client)
+
+    assert client.get_turtle("leonardo")["full_name"] == "Leonardo"
+    assert client._connected is False
+    assert "_fallback_data" in vars(client)
+
+
+def test_parse_importtime():
+    timings = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   api.cache\n"
+        "import time:      3000 |       3120 | api.index\n"
+    )
+    assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+        ("api.cache", 120, 120, 1),
+        ("api.index", 3000, 3120, 0),
+    ]
@@ -0,0 +1,39 @@
+from scripts.sync_convex import COLLECTIONS, content_hash, plan_sync
+
+EPISODES = next(c for c in COLLECTIONS if c.table == "episodes")
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+def test_plan_sync_only_touches_differences():
+    local = [
+        {"episode_id": 1, "title": "Turtle Tracks"},
+        {"episode_id": 2, "title": "Enter: The Shredder (remastered)"},
+        {"episode_id": 3, "title": "A Better Mousetrap"},
+    ]
+    remote = [
+        {"id": "a", "key": 1.0, "hash": content_hash(local[0])},
+        {"id": "b", "key": 2.0, "hash": content_hash({"episode_id": 2, "title": "Enter: The Shredder"})},
+        {"id": "z", "key": 99.0, "hash": "stale"},
+    ]
+    plan = plan_sync(EPISODES, local, remote)
+
+    assert plan.unchanged == 1
+    assert [r["episode_id"] for r in plan.updates] == [2]
+    assert [r["episode_id"] for r in plan.inserts] == [3]
+    assert plan.deletes == ["z"]
+    assert all(r["content_hash"] == content_hash(r) for r in plan.upserts)
+
+
+def test_plan_sync_is_idempotent():
+    local = EPISODES.records()
+    remote = [
+        {"id": str(i), "key": r["episode_id"], "hash": content_hash(r)}
+        for i, r in enumerate(local)
+    ]
+    plan = plan_sync(EPISODES, local, remote)
+    assert plan.upserts == [] and plan.deletes == []
+    assert plan.unchanged == len(local)